@@ -1,19 +1,33 @@
 """
-Completely standalone LiveKit Voice Agent for Cloud Deployment
-No dependencies on app.core.config - all imports are lazy/runtime only
+LiveKit Voice Agent for Cloud Deployment, run as its own process.
+Configuration comes from environment variables, never app.core.config, and
+the database is reached with plain SQL, so the app's settings, models and
+sessions are not imported. load_resources() imports only settings-free
+modules from app/ at runtime (app.voice_agent.prompts, app.data.catalog,
+app.data.profile and app.data.recommend, which needs numpy), keeping embedded
+fallbacks when they fail. redis is imported only when RESPONSE_CACHE is a
+redis:// URL.
 """
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import functools
 import logging
 import os
 import json
 import sys
-from dataclasses import dataclass
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 from livekit.agents import (
     AutoSubscribe,
     JobContext,
+    JobProcess,
     WorkerOptions,
     cli,
 )
@@ -41,6 +55,8 @@ def _ensure_backend_on_syspath() -> None:
 # SYSTEM INSTRUCTION (copied from prompts.py to avoid imports)
 SYSTEM_INSTRUCTION = """You are a helpful AI counsellor assisting students with their study abroad journey. You can:
 - Get user profile information (GPA, test scores, budget, etc.)
+- Search the university catalog (country, field, budget, acceptance rate)
+- Recommend Dream, Target and Safe universities from their profile
 - Add universities to their shortlist
 - Lock universities as final choices
 - Show their current university list
@@ -49,29 +65,434 @@ Be friendly, helpful, and concise in your responses."""
 
 WELCOME_MESSAGE = "Hello! I'm your AI study abroad counsellor. How can I help you today?"
 
-try:
-    _ensure_backend_on_syspath()
-    from app.voice_agent.prompts import SYSTEM_INSTRUCTION as _SYSTEM_INSTRUCTION, WELCOME_MESSAGE as _WELCOME_MESSAGE
+# Filled in by load_resources() (from prewarm, or lazily by the first job)
+catalog = None
+recommendation_engine = None
+profile_from_onboarding = None
+_resources_loaded = False
+
+
+def load_resources() -> dict:
+    """
+    Import the prompts, university catalog and recommendation engine from app/,
+    keeping the embedded fallbacks for anything that fails. Runs once per process.
+    """
+    global SYSTEM_INSTRUCTION, WELCOME_MESSAGE, catalog, recommendation_engine, profile_from_onboarding
+    global _resources_loaded
+    if not _resources_loaded:
+        _ensure_backend_on_syspath()
+        try:
+            from app.voice_agent.prompts import SYSTEM_INSTRUCTION as _SYSTEM_INSTRUCTION, WELCOME_MESSAGE as _WELCOME_MESSAGE
+
+            SYSTEM_INSTRUCTION = _SYSTEM_INSTRUCTION
+            WELCOME_MESSAGE = _WELCOME_MESSAGE
+            logger.info("Loaded prompts from app.voice_agent.prompts")
+        except Exception as e:
+            logger.warning(f"Falling back to embedded prompts. Error loading app.voice_agent.prompts: {e}")
+
+        # The structured catalog replaces the university list that used to be pasted into the prompt
+        try:
+            from app.data.catalog import catalog as _catalog
+
+            catalog = _catalog
+        except Exception as e:
+            logger.warning(f"University catalog unavailable, search_universities disabled: {e}")
+
+        # Deterministic Dream/Target/Safe scoring (needs numpy)
+        try:
+            from app.data.profile import profile_from_onboarding as _profile_from_onboarding
+            from app.data.recommend import engine as _engine
+
+            profile_from_onboarding = _profile_from_onboarding
+            recommendation_engine = _engine
+        except Exception as e:
+            logger.warning(f"Recommendation engine unavailable, recommend_universities disabled: {e}")
+        _resources_loaded = True
+    return {
+        "instructions": SYSTEM_INSTRUCTION,
+        "welcome_message": WELCOME_MESSAGE,
+        "catalog": catalog,
+        "recommendation_engine": recommendation_engine,
+    }
 
-    SYSTEM_INSTRUCTION = _SYSTEM_INSTRUCTION
-    WELCOME_MESSAGE = _WELCOME_MESSAGE
-    logger.info("Loaded prompts from app.voice_agent.prompts")
-except Exception as e:
-    logger.warning(f"Falling back to embedded prompts. Error loading app.voice_agent.prompts: {e}")
 
 # Create database session factory using environment variable
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Tool calls run their SQL on a dedicated executor with one thread per pooled
+# connection, so a slow query never blocks the event loop (and audio streaming)
+DB_POOL_SIZE = int(os.getenv("AGENT_DB_POOL_SIZE", "5"))
+DB_TIMEOUT_SECONDS = float(os.getenv("AGENT_DB_TIMEOUT_SECONDS", "5"))
 if DATABASE_URL:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=DB_TIMEOUT_SECONDS,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        connect_args={"connect_timeout": int(DB_TIMEOUT_SECONDS)} if DATABASE_URL.startswith("postgres") else {},
+    )
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 else:
     logger.warning("DATABASE_URL not set")
     SessionLocal = None
 
+# app.core.changes LISTENs here and forwards to the student's open web tabs
+SELECTION_CHANGES_CHANNEL = "selection_changes"
+
+# The API's response cache (app.core.response_cache). When it is shared (a
+# redis:// URL), the agent drops the student's cached GET /universities/ body
+# after changing their selections; keep the key format in sync
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "none")
+RESPONSE_CACHE_PREFIX = os.getenv("RESPONSE_CACHE_PREFIX", "gg:response:v1")
+if RESPONSE_CACHE not in ("none", "memory"):
+    import redis
+
+    response_cache = redis.Redis.from_url(RESPONSE_CACHE, socket_timeout=DB_TIMEOUT_SECONDS)
+else:
+    response_cache = None
+
+_db_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="agent-db")
+
+# Job start -> first greeting audio; logged per job and flagged when over target
+STARTUP_TARGET_SECONDS = float(os.getenv("AGENT_STARTUP_TARGET_SECONDS", "2.0"))
+# Set to 0 to skip loading the silero VAD in prewarm
+PREWARM_VAD = os.getenv("AGENT_PREWARM_VAD", "1") != "0"
+# Latest samples kept per series for the worker-wide percentiles
+METRICS_WINDOW = int(os.getenv("AGENT_METRICS_WINDOW", "1000"))
+
+
+class DatabaseUnavailable(Exception):
+    """Raised when the database is not configured or a call timed out."""
+
+
+async def run_db(fn, *args):
+    """Run fn(db, *args) with its own session on the DB executor, off the event loop."""
+    if not SessionLocal:
+        record_error("db_unavailable")
+        raise DatabaseUnavailable("Database not configured")
+
+    def _call():
+        db = SessionLocal()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(_db_executor, _call), timeout=DB_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        record_error("db_timeout")
+        raise DatabaseUnavailable(f"Database call {fn.__name__} timed out after {DB_TIMEOUT_SECONDS}s")
+    finally:
+        # Includes the wait for a free executor thread, i.e. pool saturation
+        call = _current_tool_call.get()
+        if call is not None:
+            call.db_seconds += time.perf_counter() - start
+
+
+def warm_db_pool() -> bool:
+    """
+    Open every pooled connection and check it with SELECT 1, so the first tool
+    call of a job doesn't pay for connecting. Returns whether the DB is usable.
+    """
+    if not SessionLocal:
+        return False
+    connections = []
+    try:
+        for _ in range(DB_POOL_SIZE):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.error(f"Database pool failed validation during prewarm: {e}")
+        return False
+    finally:
+        # Back to the pool, still open
+        for connection in connections:
+            connection.close()
+
+
+def load_vad():
+    if not PREWARM_VAD:
+        return None
+    try:
+        from livekit.plugins import silero
+
+        return silero.VAD.load()
+    except Exception as e:
+        logger.warning(f"Silero VAD unavailable, relying on the realtime model's turn detection: {e}")
+        return None
+
+
+def prewarm(proc: JobProcess) -> None:
+    """
+    Runs once in each worker process before it accepts jobs: validates the DB
+    pool and loads prompts, catalog and the VAD model into proc.userdata so a
+    job's first greeting doesn't wait on any of them.
+    """
+    start = time.perf_counter()
+    proc.userdata["db_ready"] = warm_db_pool()
+    db_seconds = time.perf_counter() - start
+    proc.userdata.update(load_resources())
+    proc.userdata["vad"] = load_vad()
+    elapsed = time.perf_counter() - start
+    proc.userdata["prewarm_seconds"] = elapsed
+    logger.info(json.dumps({
+        "metric": "agent_prewarm_seconds",
+        "value": round(elapsed, 4),
+        "db_seconds": round(db_seconds, 4),
+        "db_ready": proc.userdata["db_ready"],
+        "vad": proc.userdata["vad"] is not None,
+    }))
+
+
+class StartupTimer:
+    """Marks the phases between job start and the first greeting audio."""
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.total: Optional[float] = None
+
+    def mark(self, phase: str) -> None:
+        self.phases[phase] = round(time.perf_counter() - self.start, 4)
+
+    def greeted(self, room_name: str) -> dict:
+        """Record the first greeting and log the startup metric (once)."""
+        if self.total is None:
+            self.total = time.perf_counter() - self.start
+            report = {
+                "metric": "agent_startup_seconds",
+                "room": room_name,
+                "value": round(self.total, 4),
+                "target": STARTUP_TARGET_SECONDS,
+                "within_target": self.total <= STARTUP_TARGET_SECONDS,
+                "phases": self.phases,
+            }
+            (logger.info if report["within_target"] else logger.warning)(json.dumps(report))
+        return {"value": self.total, "phases": self.phases}
+
+
+def _summarize(values) -> Optional[dict]:
+    """count/p50/p95/max (seconds) of a series, None if it is empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def rank(q):
+        return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered) + 0.5) - 1))]
+
+    return {
+        "count": len(ordered),
+        "p50": round(rank(50), 4),
+        "p95": round(rank(95), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+@dataclass
+class ToolCall:
+    name: str
+    db_seconds: float = 0.0
+    publish_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+
+# The tool call running in the current task; run_db and publish_update add their time to it
+_current_tool_call: contextvars.ContextVar[Optional[ToolCall]] = contextvars.ContextVar(
+    "current_tool_call", default=None
+)
+
+
+def record_error(kind: str) -> None:
+    """Count an error against the running tool call (no-op outside tools)."""
+    call = _current_tool_call.get()
+    if call is not None:
+        call.errors.append(kind)
+
+
+class SessionMetrics:
+    """
+    Timings for one voice session: per-tool wall time split into DB and
+    publish_data time, participant join -> first agent audio, the gap between
+    the user finishing speaking and the agent starting per turn, and error
+    counts. summary() is logged as JSON when the job shuts down.
+    """
+
+    def __init__(self, room_name: str) -> None:
+        self.room_name = room_name
+        self.user_id: Optional[int] = None
+        self.start = time.perf_counter()
+        self.joined_at: Optional[float] = None
+        self.first_audio_seconds: Optional[float] = None
+        self.user_stopped_at: Optional[float] = None
+        self.response_gaps: List[float] = []
+        self.tools: Dict[str, List[ToolCall]] = {}
+        self.tool_seconds: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def error(self, kind: str) -> None:
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def participant_joined(self) -> None:
+        self.joined_at = time.perf_counter()
+
+    def user_state_changed(self, old_state: str, new_state: str) -> None:
+        if old_state == "speaking" and new_state != "speaking":
+            self.user_stopped_at = time.perf_counter()
+
+    def agent_state_changed(self, new_state: str) -> None:
+        if new_state != "speaking":
+            return
+        now = time.perf_counter()
+        if self.first_audio_seconds is None and self.joined_at is not None:
+            self.first_audio_seconds = now - self.joined_at
+        if self.user_stopped_at is not None:
+            self.response_gaps.append(now - self.user_stopped_at)
+            self.user_stopped_at = None
+
+    def tool_finished(self, call: ToolCall, seconds: float) -> None:
+        self.tools.setdefault(call.name, []).append(call)
+        self.tool_seconds.setdefault(call.name, []).append(seconds)
+        for kind in call.errors:
+            self.error(f"{call.name}:{kind}")
+
+    def summary(self) -> dict:
+        tools = {}
+        for name, calls in self.tools.items():
+            tools[name] = {
+                "calls": len(calls),
+                "errors": sum(1 for call in calls if call.errors),
+                "wall": _summarize(self.tool_seconds[name]),
+                "db_seconds": round(sum(call.db_seconds for call in calls), 4),
+                "publish_seconds": round(sum(call.publish_seconds for call in calls), 4),
+            }
+        return {
+            "metric": "agent_session_summary",
+            "room": self.room_name,
+            "user_id": self.user_id,
+            "duration_seconds": round(time.perf_counter() - self.start, 3),
+            "first_audio_seconds": (
+                round(self.first_audio_seconds, 4) if self.first_audio_seconds is not None else None
+            ),
+            "turns": len(self.response_gaps),
+            "response_gap": _summarize(self.response_gaps),
+            "tools": tools,
+            "errors": self.errors,
+        }
+
+
+class WorkerMetrics:
+    """Running totals across every session this worker process has handled."""
+
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        self.window = window
+        self.sessions = 0
+        self.first_audio: deque = deque(maxlen=window)
+        self.response_gaps: deque = deque(maxlen=window)
+        self.tool_calls: Dict[str, int] = {}
+        self.tool_errors: Dict[str, int] = {}
+        self.tool_seconds: Dict[str, deque] = {}
+        self.tool_db_seconds: Dict[str, float] = {}
+        self.tool_publish_seconds: Dict[str, float] = {}
+        self.errors: Dict[str, int] = {}
+
+    def add(self, session: SessionMetrics) -> None:
+        self.sessions += 1
+        if session.first_audio_seconds is not None:
+            self.first_audio.append(session.first_audio_seconds)
+        self.response_gaps.extend(session.response_gaps)
+        for name, calls in session.tools.items():
+            self.tool_calls[name] = self.tool_calls.get(name, 0) + len(calls)
+            self.tool_errors[name] = self.tool_errors.get(name, 0) + sum(1 for call in calls if call.errors)
+            self.tool_seconds.setdefault(name, deque(maxlen=self.window)).extend(session.tool_seconds[name])
+            self.tool_db_seconds[name] = self.tool_db_seconds.get(name, 0.0) + sum(c.db_seconds for c in calls)
+            self.tool_publish_seconds[name] = (
+                self.tool_publish_seconds.get(name, 0.0) + sum(c.publish_seconds for c in calls)
+            )
+        for kind, count in session.errors.items():
+            self.errors[kind] = self.errors.get(kind, 0) + count
+
+    def summary(self) -> dict:
+        return {
+            "metric": "agent_worker_summary",
+            "pid": os.getpid(),
+            "sessions": self.sessions,
+            "first_audio": _summarize(self.first_audio),
+            "response_gap": _summarize(self.response_gaps),
+            "tools": {
+                name: {
+                    "calls": calls,
+                    "errors": self.tool_errors[name],
+                    "wall": _summarize(self.tool_seconds[name]),
+                    "db_seconds": round(self.tool_db_seconds[name], 4),
+                    "publish_seconds": round(self.tool_publish_seconds[name], 4),
+                }
+                for name, calls in self.tool_calls.items()
+            },
+            "errors": self.errors,
+        }
+
+
+worker_metrics = WorkerMetrics()
+
+
+def timed_tool(fn):
+    """
+    Times a tool method into context.userdata.metrics. Goes under
+    @function_tool(); functools.wraps keeps the signature and docstring the
+    tool schema is built from.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(self, context, *args, **kwargs):
+        call = ToolCall(fn.__name__)
+        token = _current_tool_call.set(call)
+        start = time.perf_counter()
+        try:
+            return await fn(self, context, *args, **kwargs)
+        except Exception:
+            call.errors.append("exception")
+            raise
+        finally:
+            _current_tool_call.reset(token)
+            metrics = getattr(context.userdata, "metrics", None)
+            if metrics is not None:
+                metrics.tool_finished(call, time.perf_counter() - start)
+
+    return wrapper
+
+
+async def publish_update(room, action: str, university_id: str) -> None:
+    """Tell the web client the list changed (timed as the tool's publish_data share)."""
+    start = time.perf_counter()
+    try:
+        await room.local_participant.publish_data(
+            payload=json.dumps({"type": "university_update", "action": action, "id": university_id}),
+            topic="university_update"
+        )
+    finally:
+        call = _current_tool_call.get()
+        if call is not None:
+            call.publish_seconds += time.perf_counter() - start
+
 
 @dataclass
 class UserData:
     user_id: int
+    # Per-session cache, prefetched at session start and kept in sync by the tools
+    profile: Optional[dict] = None
+    universities: Dict[str, str] = field(default_factory=dict)  # university_id -> status
+    # users.selections_version that `universities` was read at; the web and API bump it too
+    selections_version: Optional[int] = None
+    prefetched: bool = False
+    metrics: Optional[SessionMetrics] = None
 
 
 def get_user_profile_from_db(db, user_id: int):
@@ -87,6 +508,7 @@ def get_user_profile_from_db(db, user_id: int):
                     intended_degree,
                     field_of_study,
                     target_intake_year,
+                    preferred_countries,
                     budget_range_per_year,
                     funding_plan,
                     ielts_toefl_status,
@@ -100,7 +522,7 @@ def get_user_profile_from_db(db, user_id: int):
             {"user_id": user_id},
         ).mappings().first()
 
-        return row
+        return dict(row) if row else None
     except Exception as e:
         logger.error(f"Error getting profile: {e}")
         return None
@@ -110,35 +532,91 @@ def update_university_status_in_db(db, user_id: int, university_id: str, status:
     """Update university status without importing app models at module level"""
     try:
         status_value = "shortlisted" if status == "shortlisted" else "locked"
+        params = {"user_id": user_id, "university_id": university_id, "status": status_value}
+        postgres = db.get_bind().dialect.name == "postgresql"
 
-        existing_id = db.execute(
-            text(
-                """
-                SELECT id
-                FROM user_universities
-                WHERE user_id = :user_id AND university_id = :university_id
-                """
-            ),
-            {"user_id": user_id, "university_id": university_id},
-        ).scalar()
-
-        if existing_id is not None:
-            db.execute(
-                text("UPDATE user_universities SET status = :status WHERE id = :id"),
-                {"status": status_value, "id": existing_id},
-            )
-        else:
-            db.execute(
+        # Same writes as crud_university._upsert, so the rollup delta below comes from
+        # the statements themselves: a row the INSERT created had no previous status,
+        # and one it skipped already exists and is locked before it is read and updated.
+        # Atomic on the (user_id, university_id) unique index, so racing writers can't duplicate
+        while True:
+            inserted = db.execute(
                 text(
                     """
                     INSERT INTO user_universities (user_id, university_id, status)
                     VALUES (:user_id, :university_id, :status)
+                    ON CONFLICT (user_id, university_id) DO NOTHING
+                    RETURNING id
                     """
                 ),
-                {"user_id": user_id, "university_id": university_id, "status": status_value},
+                params,
+            ).scalar()
+            if inserted is not None:
+                old_status = None
+                break
+            old_status = db.execute(
+                text(
+                    "SELECT status FROM user_universities WHERE user_id = :user_id AND university_id = :university_id"
+                    + (" FOR UPDATE" if postgres else "")
+                ),
+                params,
+            ).scalar()
+            if old_status is not None:
+                if old_status != status_value:
+                    db.execute(
+                        text(
+                            "UPDATE user_universities SET status = :status "
+                            "WHERE user_id = :user_id AND university_id = :university_id"
+                        ),
+                        params,
+                    )
+                break
+            # Deleted between the two statements; insert it again
+
+        if old_status != status_value:
+            # Same +/- deltas as crud_analytics.record_changes, bucketed by intake year
+            deltas = [(status_value, 1)] + ([(old_status, -1)] if old_status else [])
+            db.execute(
+                text(
+                    """
+                    INSERT INTO university_selection_counts (university_id, status, intake_year, count)
+                    VALUES (
+                        :university_id, :rollup_status,
+                        COALESCE((SELECT target_intake_year FROM user_onboarding WHERE user_id = :user_id), 0),
+                        :delta
+                    )
+                    ON CONFLICT (university_id, status, intake_year)
+                    DO UPDATE SET count = university_selection_counts.count + excluded.count
+                    """
+                ),
+                [{**params, "rollup_status": rollup_status, "delta": delta} for rollup_status, delta in deltas],
+            )
+        # Invalidates the web client's ETag for GET /universities/
+        version = db.execute(
+            text(
+                "UPDATE users SET selections_version = selections_version + 1 "
+                "WHERE id = :user_id RETURNING selections_version"
+            ),
+            {"user_id": user_id},
+        ).scalar()
+        if postgres:
+            # Sent on commit to every API worker streaming this user's selections
+            db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {
+                    "channel": SELECTION_CHANGES_CHANNEL,
+                    "payload": json.dumps({
+                        "type": "selection",
+                        "user_id": user_id,
+                        "version": version,
+                        "source": "agent",
+                        "changes": {university_id: status_value},
+                    }, separators=(",", ":")),
+                },
             )
 
         db.commit()
+        invalidate_cached_universities(user_id)
         return True
     except Exception as e:
         logger.error(f"Error updating status: {e}")
@@ -149,6 +627,16 @@ def update_university_status_in_db(db, user_id: int, university_id: str, status:
         return False
 
 
+def invalidate_cached_universities(user_id: int) -> None:
+    if response_cache is None:
+        return
+    try:
+        response_cache.delete(f"{RESPONSE_CACHE_PREFIX}:{user_id}:universities")
+    except Exception as e:
+        # The API serves the old list until the entry expires
+        logger.warning(f"Error invalidating cached universities: {e}")
+
+
 def get_user_universities_from_db(db, user_id: int):
     """Get user universities without importing app models at module level"""
     try:
@@ -164,47 +652,202 @@ def get_user_universities_from_db(db, user_id: int):
             {"user_id": user_id},
         ).mappings().all()
 
-        return rows
+        return [dict(row) for row in rows]
     except Exception as e:
         logger.error(f"Error getting universities: {e}")
         return []
 
 
+def get_selections_version_from_db(db, user_id: int) -> Optional[int]:
+    """users.selections_version, bumped by every selection write (web, API or agent)."""
+    try:
+        return db.execute(
+            text("SELECT selections_version FROM users WHERE id = :user_id"), {"user_id": user_id}
+        ).scalar() or 0
+    except Exception as e:
+        logger.error(f"Error getting selections version: {e}")
+        return None
+
+
+def load_selections_if_changed(db, user_id: int, known_version: Optional[int]):
+    """
+    (version, universities) when the list changed since known_version, else None.
+    The version is read first, so a write landing in between only causes an extra refetch later.
+    """
+    version = get_selections_version_from_db(db, user_id)
+    if version is not None and version == known_version:
+        return None
+    return version, get_user_universities_from_db(db, user_id)
+
+
+def load_student_context(db, user_id: int):
+    """Profile, selections version and current list in one executor hop (used to prefetch at session start)."""
+    return (get_user_profile_from_db(db, user_id), *load_selections_if_changed(db, user_id, None))
+
+
+def user_id_from_room(room_name: str) -> Optional[int]:
+    """Rooms are named counsellor-{user_id}-{session_id} by the /voice/token endpoint."""
+    parts = room_name.split("-")
+    if len(parts) >= 3 and parts[0] == "counsellor":
+        try:
+            return int(parts[1])
+        except ValueError:
+            return None
+    return None
+
+
+def format_profile(profile: dict) -> str:
+    return f"""
+        - Education Level: {profile.get('current_education_level')}
+        - Major: {profile.get('degree_major')}
+        - GPA: {profile.get('gpa_or_percentage')}
+        - Intended Degree: {profile.get('intended_degree')} in {profile.get('field_of_study')}
+        - Target Intake: {profile.get('target_intake_year')}
+        - Preferred Countries: {profile.get('preferred_countries') or 'Any'}
+        - Budget: {profile.get('budget_range_per_year')} ({profile.get('funding_plan')})
+        - IELTS/TOEFL: {profile.get('ielts_toefl_status')} ({profile.get('ielts_toefl_score') or 'N/A'})
+        - GRE/GMAT: {profile.get('gre_gmat_status')} ({profile.get('gre_gmat_score') or 'N/A'})
+        """
+
+
+def format_universities(universities: Dict[str, str]) -> str:
+    return "\n".join([f"- {university_id} ({status})" for university_id, status in universities.items()])
+
+
+def format_search_results(universities) -> str:
+    return "\n".join(
+        f"- {u.name} (ID: {u.id}), {u.city}, {u.country}: {', '.join(u.fields)}, "
+        f"Fee: ${u.fee_usd:,}/year, Acceptance: {u.acceptance.capitalize()}. {u.description}"
+        for u in universities
+    )
+
+
+def format_recommendations(result, categories) -> str:
+    lines = [f"Profile strength: {result.strength:.2f} (0-1, from GPA and test scores)"]
+    for category in categories:
+        picks = getattr(result, category)
+        lines.append(f"{category.capitalize()}:")
+        if not picks:
+            lines.append("- none within the budget and preferred countries")
+        for pick in picks:
+            u = catalog.get(pick.university_id)
+            notes = [] if pick.within_budget else ["above budget"]
+            lines.append(
+                f"- {u.name} (ID: {u.id}), {u.country}, Fee: ${u.fee_usd:,}/year, "
+                f"Acceptance: {u.acceptance.capitalize()}" + (f" [{', '.join(notes)}]" if notes else "")
+            )
+    return "\n".join(lines)
+
+
+def render_session_instructions(userdata: UserData) -> str:
+    """SYSTEM_INSTRUCTION plus the prefetched profile and list, so the model needn't fetch them."""
+    if not userdata.prefetched:
+        return SYSTEM_INSTRUCTION
+    profile = format_profile(userdata.profile) if userdata.profile else (
+        "        - Not completed yet. Encourage the student to finish onboarding."
+    )
+    universities = format_universities(userdata.universities) or "- None yet"
+    return f"""{SYSTEM_INSTRUCTION}
+**This Student's Profile (already loaded, no need to call get_user_profile):**
+{profile}
+
+**This Student's Current List (already loaded, kept up to date as you shortlist/lock):**
+{universities}
+"""
+
+
 class Assistant(Agent):
-    def __init__(self, room) -> None:
-        super().__init__(instructions=SYSTEM_INSTRUCTION)
+    def __init__(self, room, instructions: Optional[str] = None) -> None:
+        super().__init__(instructions=instructions or SYSTEM_INSTRUCTION)
         self.room = room
 
     @function_tool()
+    @timed_tool
     async def get_user_profile(self, context: RunContext[UserData]) -> str:
         """Get the user's profile information (GPA, scores, budget, etc.)."""
-        user_id = context.userdata.user_id
-        logger.info(f"Fetching profile for user {user_id}")
+        userdata = context.userdata
+        if userdata.prefetched:
+            if not userdata.profile:
+                return "User profile not found. Please ask the user to complete onboarding."
+            return format_profile(userdata.profile)
 
-        if not SessionLocal:
-            return "Database not configured"
+        user_id = userdata.user_id
+        logger.info(f"Fetching profile for user {user_id}")
 
-        db = SessionLocal()
         try:
-            profile = get_user_profile_from_db(db, user_id)
-            if not profile:
-                return "User profile not found. Please ask the user to complete onboarding."
+            profile = await run_db(get_user_profile_from_db, user_id)
+        except DatabaseUnavailable as e:
+            logger.error(f"Error getting profile: {e}")
+            return "Database not available right now."
+        if not profile:
+            return "User profile not found. Please ask the user to complete onboarding."
+
+        userdata.profile = profile
+        return format_profile(profile)
 
-            profile_str = f"""
-        - Education Level: {profile.current_education_level}
-        - Major: {profile.degree_major}
-        - GPA: {profile.gpa_or_percentage}
-        - Intended Degree: {profile.intended_degree} in {profile.field_of_study}
-        - Target Intake: {profile.target_intake_year}
-        - Budget: {profile.budget_range_per_year} ({profile.funding_plan})
-        - IELTS/TOEFL: {profile.ielts_toefl_status} ({profile.ielts_toefl_score or 'N/A'})
-        - GRE/GMAT: {profile.gre_gmat_status} ({profile.gre_gmat_score or 'N/A'})
+    @function_tool()
+    @timed_tool
+    async def search_universities(
+        self,
+        context: RunContext[UserData],
+        country: str = "",
+        field: str = "",
+        max_fee_usd: int = 0,
+        acceptance: str = "",
+        keywords: str = "",
+        limit: int = 5,
+    ) -> str:
+        """Search the university catalog. Leave a filter empty (or 0) to ignore it.
+
+        Args:
+            country: Country to study in, e.g. 'USA', 'UK', 'Canada', 'Australia'.
+            field: Field of study, e.g. 'Computer Science'.
+            max_fee_usd: Maximum yearly tuition in USD.
+            acceptance: Acceptance rate tier: 'low' (dream), 'medium' (target) or 'high' (safe).
+            keywords: Free-text strengths or places, e.g. 'co-op', 'research', 'Toronto'.
+            limit: Maximum number of universities to return.
         """
-            return profile_str
-        finally:
-            db.close()
+        if catalog is None:
+            return "University catalog not available right now."
+        results = catalog.search(
+            country=country or None,
+            field=field or None,
+            max_fee=max_fee_usd or None,
+            acceptance=acceptance or None,
+            query=keywords or None,
+            limit=max(1, min(limit, 20)),
+        )
+        if not results:
+            return "No universities match those filters. Try relaxing one of them."
+        return format_search_results(results)
 
     @function_tool()
+    @timed_tool
+    async def recommend_universities(self, context: RunContext[UserData], category: str = "") -> str:
+        """Get Dream, Target and Safe universities scored from the user's profile (GPA, scores, budget, countries).
+
+        Args:
+            category: Only return 'dream', 'target' or 'safe'; leave empty for all three.
+        """
+        if recommendation_engine is None or catalog is None:
+            return "Recommendations are not available right now."
+        userdata = context.userdata
+        if not userdata.prefetched and not userdata.profile:
+            try:
+                userdata.profile = await run_db(get_user_profile_from_db, userdata.user_id)
+            except DatabaseUnavailable as e:
+                logger.error(f"Error getting profile: {e}")
+                return "Database not available right now."
+        if not userdata.profile:
+            return "User profile not found. Please ask the user to complete onboarding."
+
+        category = category.strip().lower()
+        categories = [category] if category in ("dream", "target", "safe") else ["dream", "target", "safe"]
+        result = recommendation_engine.recommend(profile_from_onboarding(userdata.profile))
+        return format_recommendations(result, categories)
+
+    @function_tool()
+    @timed_tool
     async def add_to_shortlist(self, context: RunContext[UserData], university_id: str) -> str:
         """Add a university to the user's shortlist.
         
@@ -214,26 +857,21 @@ class Assistant(Agent):
         user_id = context.userdata.user_id
         logger.info(f"Shortlisting {university_id} for user {user_id}")
 
-        if not SessionLocal:
-            return "Database not configured"
-
-        db = SessionLocal()
         try:
-            if update_university_status_in_db(db, user_id, university_id, "shortlisted"):
-                await self.room.local_participant.publish_data(
-                    payload=json.dumps({"type": "university_update", "action": "shortlist", "id": university_id}),
-                    topic="university_update"
-                )
+            if await run_db(update_university_status_in_db, user_id, university_id, "shortlisted"):
+                context.userdata.universities[university_id] = "shortlisted"
+                await publish_update(self.room, "shortlist", university_id)
                 return f"Successfully added {university_id} to shortlist."
             else:
+                record_error("write_failed")
                 return "Failed to shortlist university."
         except Exception as e:
             logger.error(f"Error shortlisting: {e}")
+            record_error(type(e).__name__)
             return "Failed to shortlist university."
-        finally:
-            db.close()
 
     @function_tool()
+    @timed_tool
     async def lock_university(self, context: RunContext[UserData], university_id: str) -> str:
         """Lock a university (confirm as final choice).
         
@@ -243,47 +881,59 @@ class Assistant(Agent):
         user_id = context.userdata.user_id
         logger.info(f"Locking {university_id} for user {user_id}")
 
-        if not SessionLocal:
-            return "Database not configured"
-
-        db = SessionLocal()
         try:
-            if update_university_status_in_db(db, user_id, university_id, "locked"):
-                await self.room.local_participant.publish_data(
-                    payload=json.dumps({"type": "university_update", "action": "lock", "id": university_id}),
-                    topic="university_update"
-                )
+            if await run_db(update_university_status_in_db, user_id, university_id, "locked"):
+                context.userdata.universities[university_id] = "locked"
+                await publish_update(self.room, "lock", university_id)
                 return f"Successfully locked {university_id}."
             else:
+                record_error("write_failed")
                 return "Failed to lock university."
         except Exception as e:
             logger.error(f"Error locking: {e}")
+            record_error(type(e).__name__)
             return "Failed to lock university."
-        finally:
-            db.close()
 
     @function_tool()
+    @timed_tool
     async def get_my_list(self, context: RunContext[UserData]) -> str:
         """Get the current list of shortlisted or locked universities."""
-        user_id = context.userdata.user_id
-
-        if not SessionLocal:
-            return "Database not configured"
-
-        db = SessionLocal()
+        userdata = context.userdata
+        # A primary-key version check; the list is only refetched when the student
+        # (or this agent) changed it since it was last read
         try:
-            unis = get_user_universities_from_db(db, user_id)
-            if not unis:
-                return "No universities currently in your list."
+            changed = await run_db(load_selections_if_changed, userdata.user_id, userdata.selections_version)
+        except DatabaseUnavailable as e:
+            logger.error(f"Error getting universities: {e}")
+            if userdata.selections_version is None:
+                return "Database not available right now."
+            # Fall back to the list as last read
+            changed = None
+        if changed is not None:
+            userdata.selections_version, unis = changed
+            userdata.universities = {u["university_id"]: u["status"] for u in unis}
+        if not userdata.universities:
+            return "No universities currently in your list."
 
-            return "\n".join([f"- {u.university_id} ({u.status})" for u in unis])
-        finally:
-            db.close()
+        return format_universities(userdata.universities)
 
 
 async def entrypoint(ctx: JobContext):
+    startup = StartupTimer()
+    metrics = SessionMetrics(ctx.room.name)
+
+    async def log_session_summary():
+        worker_metrics.add(metrics)
+        logger.info(json.dumps(metrics.summary()))
+        logger.info(json.dumps(worker_metrics.summary()))
+
+    ctx.add_shutdown_callback(log_session_summary)
+    # Normally done by prewarm; a job that lands on a cold process loads them here
+    resources = ctx.proc.userdata if "instructions" in ctx.proc.userdata else load_resources()
+
     logger.info(f"connecting to room {ctx.room.name}")
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
+    startup.mark("connected")
 
     ctx.room.on(
         "track_published",
@@ -298,8 +948,18 @@ async def entrypoint(ctx: JobContext):
         ),
     )
 
+    # Start loading the student's profile and list while we wait for them to join
+    room_user_id = user_id_from_room(ctx.room.name)
+    prefetch = (
+        asyncio.ensure_future(run_db(load_student_context, room_user_id))
+        if room_user_id is not None and SessionLocal
+        else None
+    )
+
     # Wait for the first participant to connect
     participant = await ctx.wait_for_participant()
+    startup.mark("participant_joined")
+    metrics.participant_joined()
     logger.info(f"starting voice assistant for participant {participant.identity}")
 
     # Parse user ID from identity
@@ -309,6 +969,25 @@ async def entrypoint(ctx: JobContext):
         logger.warning(f"Could not parse user ID from identity '{participant.identity}'. Using as-is.")
         user_id = 0 
 
+    metrics.user_id = user_id
+    userdata = UserData(user_id=user_id, metrics=metrics)
+    if prefetch is not None and room_user_id != user_id:
+        prefetch.cancel()
+        prefetch = None
+    try:
+        if prefetch is None and SessionLocal:
+            prefetch = asyncio.ensure_future(run_db(load_student_context, user_id))
+        if prefetch is not None:
+            profile, userdata.selections_version, universities = await prefetch
+            userdata.profile = profile
+            userdata.universities = {u["university_id"]: u["status"] for u in universities}
+            userdata.prefetched = True
+    except Exception as e:
+        # Tools fall back to querying the database themselves
+        logger.error(f"Could not prefetch student context: {e}")
+        metrics.error("prefetch_failed")
+    startup.mark("context_loaded")
+
     logger.info(f"Initializing agent session for user_id={user_id} (identity={participant.identity})")
     session = AgentSession(
         llm=google.realtime.RealtimeModel(
@@ -316,32 +995,36 @@ async def entrypoint(ctx: JobContext):
             temperature=0.8,
             language="en-US",
         ),
-        userdata=UserData(user_id=user_id),
+        vad=ctx.proc.userdata.get("vad"),
+        userdata=userdata,
     )
 
-    session.on(
-        "user_state_changed",
-        lambda ev: logger.info(f"user_state_changed {ev.old_state} -> {ev.new_state}"),
-    )
-    session.on(
-        "agent_state_changed",
-        lambda ev: logger.info(f"agent_state_changed {ev.old_state} -> {ev.new_state}"),
-    )
+    def on_agent_state_changed(ev):
+        logger.info(f"agent_state_changed {ev.old_state} -> {ev.new_state}")
+        metrics.agent_state_changed(ev.new_state)
+        if ev.new_state == "speaking":
+            startup.greeted(ctx.room.name)
+
+    def on_user_state_changed(ev):
+        logger.info(f"user_state_changed {ev.old_state} -> {ev.new_state}")
+        metrics.user_state_changed(ev.old_state, ev.new_state)
+
+    def on_error(ev):
+        logger.error(f"agent_session_error source={type(ev.source).__name__} error={ev.error!r}")
+        metrics.error(f"session:{type(ev.source).__name__}")
+
+    session.on("user_state_changed", on_user_state_changed)
+    session.on("agent_state_changed", on_agent_state_changed)
     session.on(
         "user_input_transcribed",
         lambda ev: logger.info(
             f"user_input_transcribed final={ev.is_final} speaker_id={ev.speaker_id} transcript={ev.transcript!r}"
         ),
     )
-    session.on(
-        "error",
-        lambda ev: logger.error(
-            f"agent_session_error source={type(ev.source).__name__} error={ev.error!r}"
-        ),
-    )
+    session.on("error", on_error)
 
     await session.start(
-        agent=Assistant(room=ctx.room),
+        agent=Assistant(room=ctx.room, instructions=render_session_instructions(userdata)),
         room=ctx.room,
         room_options=RoomOptions(
             participant_identity=participant.identity,
@@ -349,13 +1032,14 @@ async def entrypoint(ctx: JobContext):
         ),
     )
 
+    startup.mark("session_started")
     logger.info(f"AgentSession started for participant_identity={participant.identity}")
 
     session.generate_reply(
-        instructions=f"Say exactly this greeting to the user: {WELCOME_MESSAGE}",
+        instructions=f"Say exactly this greeting to the user: {resources['welcome_message']}",
         allow_interruptions=True,
     )
 
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
+    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
@@ -0,0 +1,38 @@
+"""user_recommendations table
+
+Revision ID: 3b0e8f2c9d41
+Revises: 6643363f63af
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b0e8f2c9d41'
+down_revision: Union[str, Sequence[str], None] = '6643363f63af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user_recommendations',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('onboarding_version', sa.Integer(), nullable=False),
+        sa.Column('catalog_version', sa.String(length=32), nullable=False),
+        sa.Column('strength', sa.Float(), nullable=False),
+        sa.Column('entries', sa.JSON(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_recommendations')
@@ -0,0 +1,50 @@
+"""university_selection_counts rollup
+
+Revision ID: 5e2b9d7c3a18
+Revises: d41f8a6b2c07
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b9d7c3a18'
+down_revision: Union[str, Sequence[str], None] = 'd41f8a6b2c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    counts = op.create_table(
+        'university_selection_counts',
+        sa.Column('university_id', sa.String(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('intake_year', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('university_id', 'status', 'intake_year'),
+    )
+    # Backfill with one GROUP BY over the existing selections
+    selections = sa.table(
+        'user_universities', sa.column('user_id'), sa.column('university_id'), sa.column('status')
+    )
+    onboarding = sa.table('user_onboarding', sa.column('user_id'), sa.column('target_intake_year'))
+    year = sa.func.coalesce(onboarding.c.target_intake_year, 0)
+    status = sa.cast(selections.c.status, sa.String(20))
+    op.execute(
+        counts.insert().from_select(
+            ['university_id', 'status', 'intake_year', 'count'],
+            sa.select(selections.c.university_id, status, year, sa.func.count())
+            .select_from(selections.outerjoin(onboarding, onboarding.c.user_id == selections.c.user_id))
+            .group_by(selections.c.university_id, status, year),
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('university_selection_counts')
@@ -0,0 +1,30 @@
+"""per-user versions for onboarding and selections
+
+Revision ID: 6643363f63af
+Revises: 816b637800fc
+Create Date: 2026-10-17 12:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6643363f63af'
+down_revision: Union[str, Sequence[str], None] = '816b637800fc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('selections_version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('user_onboarding', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user_onboarding', 'version')
+    op.drop_column('users', 'selections_version')
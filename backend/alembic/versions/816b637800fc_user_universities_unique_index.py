@@ -0,0 +1,61 @@
+"""user_universities unique (user_id, university_id) index
+
+Revision ID: 816b637800fc
+Revises: a96867d7e9b8
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '816b637800fc'
+down_revision: Union[str, Sequence[str], None] = 'a96867d7e9b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_user_universities_user_id_university_id'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the newest row of any duplicated selection so the unique index can be built
+    op.execute(
+        """
+        DELETE FROM user_universities
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM user_universities GROUP BY user_id, university_id
+        )
+        """
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # CONCURRENTLY can't run inside a transaction and doesn't block writes
+        with op.get_context().autocommit_block():
+            op.create_index(
+                INDEX_NAME,
+                'user_universities',
+                ['user_id', 'university_id'],
+                unique=True,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+    else:
+        op.create_index(INDEX_NAME, 'user_universities', ['user_id', 'university_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                INDEX_NAME,
+                table_name='user_universities',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    else:
+        op.drop_index(INDEX_NAME, table_name='user_universities')
@@ -0,0 +1,70 @@
+"""normalized onboarding columns and user_preferred_countries
+
+Revision ID: 9c4d2e7a1f53
+Revises: 3b0e8f2c9d41
+Create Date: 2026-10-17 15:00:00.000000
+
+The new columns start empty; fill them from the existing answers afterwards
+with `python backfill_onboarding_columns.py` (kept out of the migration so it
+does not depend on the application's parsers).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d2e7a1f53'
+down_revision: Union[str, Sequence[str], None] = '3b0e8f2c9d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_user_onboarding_gpa_normalized', 'user_onboarding', ['gpa_normalized']),
+    ('ix_user_onboarding_english', 'user_onboarding', ['english_exam', 'english_score']),
+    ('ix_user_onboarding_graduate', 'user_onboarding', ['graduate_exam', 'graduate_score']),
+    ('ix_user_onboarding_budget', 'user_onboarding', ['budget_max_usd', 'budget_min_usd']),
+    ('ix_user_preferred_countries_country', 'user_preferred_countries', ['country', 'user_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_onboarding', sa.Column('gpa_normalized', sa.Float(), nullable=True))
+    op.add_column('user_onboarding', sa.Column('english_exam', sa.String(length=20), nullable=True))
+    op.add_column('user_onboarding', sa.Column('english_score', sa.Float(), nullable=True))
+    op.add_column('user_onboarding', sa.Column('graduate_exam', sa.String(length=20), nullable=True))
+    op.add_column('user_onboarding', sa.Column('graduate_score', sa.Float(), nullable=True))
+    op.add_column('user_onboarding', sa.Column('budget_min_usd', sa.Integer(), nullable=True))
+    op.add_column('user_onboarding', sa.Column('budget_max_usd', sa.Integer(), nullable=True))
+    op.create_table(
+        'user_preferred_countries',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('country', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'country'),
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # CONCURRENTLY can't run inside a transaction
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in INDEXES[:-1]:
+        op.drop_index(name, table_name=table)
+    op.drop_table('user_preferred_countries')
+    op.drop_column('user_onboarding', 'budget_max_usd')
+    op.drop_column('user_onboarding', 'budget_min_usd')
+    op.drop_column('user_onboarding', 'graduate_score')
+    op.drop_column('user_onboarding', 'graduate_exam')
+    op.drop_column('user_onboarding', 'english_score')
+    op.drop_column('user_onboarding', 'english_exam')
+    op.drop_column('user_onboarding', 'gpa_normalized')
@@ -1,12 +1,15 @@
-from fastapi import Depends, HTTPException, status, Request
+from fastapi import Depends, HTTPException, status, Request, Response
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import auth_cache
+from app.core.response_cache import CachedResponse
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_async_read_db, is_replica
 from app.models.user import User
 from app.crud import crud_user
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+def get_current_user_id(request: Request) -> int:
+    """Resolve the user id from the access_token cookie without touching the DB."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -22,17 +25,77 @@ def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
     if token.startswith("Bearer "):
         token = token[7:]
         
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
+    user_id = auth_cache.get_token_subject(token)
+    if user_id is None:
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+            sub: str = payload.get("sub")
+            if sub is None:
+                raise credentials_exception
+            user_id = int(sub)
+        except (JWTError, ValueError):
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-        
-    user = db.query(User).filter(User.id == int(user_id)).first()
+        auth_cache.set_token_subject(token, user_id, expires_at=payload.get("exp"))
+    return user_id
+
+
+async def get_current_user(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> User:
+    user = auth_cache.get_user(user_id)
+    if user is not None:
+        return user
+
+    user = await crud_user.get(db, user_id)
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # Only primary reads are cached: a lagging replica's row could otherwise
+    # outlive the write it missed, and end up in a response_cache body
+    if not is_replica(db):
+        auth_cache.set_user(user)
     return user
+
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Only users with users.is_admin set (granted directly in the database)."""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names this (weak) ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(etag: str, cache_control: str = "private, no-cache") -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def cached_response(request: Request, cached: CachedResponse) -> Response:
+    """Serve a response_cache body as-is (304 when its ETag is already current)."""
+    if cached.etag is None:
+        return Response(cached.body, media_type="application/json")
+    if etag_matches(request, cached.etag):
+        return not_modified(cached.etag)
+    return Response(
+        cached.body,
+        media_type="application/json",
+        headers={"ETag": cached.etag, "Cache-Control": "private, no-cache"},
+    )
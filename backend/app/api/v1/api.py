@@ -1,8 +1,12 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, onboarding, universities, voice
+from app.api.v1.endpoints import admin, analytics, auth, dashboard, onboarding, recommendations, universities, voice
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(onboarding.router, prefix="/onboarding", tags=["onboarding"])
 api_router.include_router(universities.router, prefix="/universities", tags=["universities"])
+api_router.include_router(recommendations.router, prefix="/recommendations", tags=["recommendations"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
 api_router.include_router(voice.router, prefix="/voice", tags=["voice"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
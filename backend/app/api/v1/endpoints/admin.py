@@ -0,0 +1,35 @@
+import datetime
+from typing import Literal
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app.api import deps
+from app.crud import crud_export
+from app.db.session import AsyncSessionLocal, ReplicaSessionLocal
+
+router = APIRouter()
+
+
+@router.get("/export")
+async def export_students(
+    format: Literal["csv", "ndjson"] = "csv",
+    admin = Depends(deps.get_current_admin),
+):
+    """
+    Every onboarding profile joined with its university selections, streamed
+    as CSV or NDJSON while it is read (server-side cursor, constant memory).
+    Reads from the replica when one is configured.
+    """
+    session_factory = ReplicaSessionLocal or AsyncSessionLocal
+
+    async def body():
+        # The session lives as long as the stream, not the request handler
+        async with session_factory() as db:
+            async for chunk in crud_export.export_chunks(db, format):
+                yield chunk
+
+    filename = f"students-{datetime.date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        body(),
+        media_type=crud_export.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+    )
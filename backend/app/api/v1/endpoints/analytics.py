@@ -0,0 +1,39 @@
+from typing import Dict, Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.crud import crud_analytics
+from app.data.catalog import catalog
+from app.schemas.analytics import UniversityAnalytics, UniversitySelectionStats
+
+router = APIRouter()
+
+
+@router.get("/universities", response_model=UniversityAnalytics)
+async def read_university_analytics(
+    intake_year: Optional[int] = Query(default=None, description="0 = students without a target intake year"),
+    sort: Literal["total", "shortlisted", "locked"] = "total",
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    admin = Depends(deps.get_current_admin),
+):
+    """
+    How many students have shortlisted / locked each university, optionally
+    for one target intake year, most selected first. Reads the incrementally
+    maintained rollup, so the cost grows with the number of universities,
+    not students.
+    """
+    stats: Dict[str, UniversitySelectionStats] = {}
+    for row in await crud_analytics.get_counts(db, intake_year=intake_year):
+        entry = stats.get(row.university_id)
+        if entry is None:
+            university = catalog.get(row.university_id)
+            entry = stats[row.university_id] = UniversitySelectionStats(
+                university_id=row.university_id,
+                name=university.name if university else None,
+                country=university.country if university else None,
+            )
+        setattr(entry, row.status, getattr(entry, row.status) + row.count)
+        entry.total += row.count
+    ranked = sorted(stats.values(), key=lambda s: (-getattr(s, sort), s.university_id))
+    return UniversityAnalytics(intake_year=intake_year, universities=ranked[:limit])
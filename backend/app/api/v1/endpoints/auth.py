@@ -1,31 +1,51 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from jose import jwt, JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db, get_async_read_db
 from app.schemas.user import UserCreate, User, UserLogin
 from app.crud import crud_user
-from app.core import security
+from app.core import auth_cache, response_cache, security
 from app.core.config import settings
 from app.api import deps
 
 router = APIRouter()
 
 @router.get("/me", response_model=User)
-def read_user_me(current_user: User = Depends(deps.get_current_user)):
+async def read_user_me(
+    request: Request,
+    user_id: int = Depends(deps.get_current_user_id),
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """
     Get current logged in user.
+    Served from response_cache when cached (db is then never used). A miss
+    reads the row itself rather than auth_cache's snapshot, so the body is
+    what db sees now (and response_cache.put skips replica sessions).
     """
-    return current_user
+    cached = await response_cache.get(user_id, response_cache.ME)
+    if cached is None:
+        current_user = await crud_user.get(db, user_id)
+        if current_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        cached = await response_cache.put(
+            db, user_id, response_cache.ME, response_cache.serialize(User, current_user)
+        )
+    return deps.cached_response(request, cached)
 
 @router.post("/signup", response_model=User)
-def signup(response: Response, user_in: UserCreate, db: Session = Depends(get_db)):
-    user = crud_user.get_user_by_email(db, email=user_in.email)
+async def signup(response: Response, user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    user = await crud_user.get_user_by_email(db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
-    user = crud_user.create_user(db, obj_in=user_in)
+    user = await crud_user.create_user(db, obj_in=user_in)
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
@@ -43,8 +63,8 @@ def signup(response: Response, user_in: UserCreate, db: Session = Depends(get_db
     return user
 
 @router.post("/login")
-def login(response: Response, user_in: UserLogin, db: Session = Depends(get_db)):
-    user = crud_user.authenticate(db, email=user_in.email, password=user_in.password)
+async def login(response: Response, user_in: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = await crud_user.authenticate(db, email=user_in.email, password=user_in.password)
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     
@@ -65,17 +85,17 @@ def login(response: Response, user_in: UserLogin, db: Session = Depends(get_db))
     return {"message": "Success", "user": user}
 
 @router.post("/google-login")
-def google_login(response: Response, token_data: dict, db: Session = Depends(get_db)):
+async def google_login(response: Response, token_data: dict, db: AsyncSession = Depends(get_async_db)):
     # In a full implementation, we'd verify the token with google-auth
     # For now, we trust the decoded data from frontend for the prototype
     email = token_data.get("email")
     name = token_data.get("name")
     
-    user = crud_user.get_user_by_email(db, email=email)
+    user = await crud_user.get_user_by_email(db, email=email)
     if not user:
         # Create user if doesn't exist (Password is empty for Google users)
         user_in = UserCreate(email=email, full_name=name, password="")
-        user = crud_user.create_user(db, obj_in=user_in)
+        user = await crud_user.create_user(db, obj_in=user_in)
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
@@ -94,6 +114,18 @@ def google_login(response: Response, token_data: dict, db: Session = Depends(get
     return {"message": "Success", "user": user}
 
 @router.post("/logout")
-def logout(response: Response):
+async def logout(request: Request, response: Response):
+    token = request.cookies.get("access_token")
+    if token:
+        if token.startswith("Bearer "):
+            token = token[7:]
+        auth_cache.invalidate_token(token)
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+            auth_cache.invalidate_user(int(payload.get("sub")))
+        except (JWTError, TypeError, ValueError):
+            pass
     response.delete_cookie("access_token")
     return {"message": "Logged out successfully"}
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_read_db, is_replica
+from app.api import deps
+from app.core import auth_cache
+from app.crud import crud_user
+from app.schemas.dashboard import Dashboard
+
+router = APIRouter()
+
+
+@router.get("", response_model=Dashboard)
+async def read_dashboard(
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: int = Depends(deps.get_current_user_id),
+):
+    """
+    Current user, onboarding and university selections in one response.
+    Replaces separate /auth/me, /onboarding and /universities/ calls after login.
+    """
+    user = await crud_user.get_with_profile(db, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not is_replica(db):
+        auth_cache.set_user(user)
+    return {"user": user, "onboarding": user.onboarding, "universities": user.universities}
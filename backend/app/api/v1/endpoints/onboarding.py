@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from typing import Optional
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db, get_async_read_db
 from app.api import deps
+from app.core import auth_cache, response_cache
 from app.models.user import User
 from app.schemas.onboarding import Onboarding, OnboardingUpdate
 from app.crud import crud_onboarding
@@ -10,24 +12,41 @@ router = APIRouter()
 
 
 @router.get("", response_model=Onboarding | None)
-def get_my_onboarding(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user),
+async def get_my_onboarding(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: int = Depends(deps.get_current_user_id),
 ):
-    """Get current user's onboarding data."""
-    return crud_onboarding.get_by_user_id(db, user_id=current_user.id)
+    """
+    Get current user's onboarding data.
+    Served from response_cache when cached; otherwise answers 304 from the row
+    version alone when If-None-Match is current.
+    """
+    cached = await response_cache.get(user_id, response_cache.ONBOARDING)
+    if cached is not None:
+        return deps.cached_response(request, cached)
+    # Still 401 for a user that no longer exists
+    await deps.get_current_user(user_id, db)
+    version = await crud_onboarding.get_version(db, user_id=user_id)
+    etag = f'W/"onboarding-{user_id}-{version}"'
+    if deps.etag_matches(request, etag):
+        return deps.not_modified(etag)
+    record = await crud_onboarding.get_by_user_id(db, user_id=user_id)
+    cached = await response_cache.put(
+        db, user_id, response_cache.ONBOARDING, response_cache.serialize(Optional[Onboarding], record), etag
+    )
+    return deps.cached_response(request, cached)
 
 
 @router.put("", response_model=Onboarding)
-def upsert_my_onboarding(
+async def upsert_my_onboarding(
     body: OnboardingUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(deps.get_current_user),
 ):
     """Create or update onboarding and mark user as onboarded."""
-    record = crud_onboarding.upsert(db, user_id=current_user.id, obj_in=body)
-    current_user.is_onboarded = True
-    db.add(current_user)
-    db.commit()
-    db.refresh(record)
+    record = await crud_onboarding.upsert(
+        db, user_id=current_user.id, obj_in=body, mark_onboarded=True
+    )
+    auth_cache.invalidate_user(current_user.id)
     return record
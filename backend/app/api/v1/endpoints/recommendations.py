@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.crud import crud_onboarding, crud_recommendation
+from app.data.catalog import catalog
+from app.db.session import get_async_db
+from app.schemas.recommendation import Recommendations
+
+router = APIRouter()
+
+
+@router.get("", response_model=Recommendations)
+async def read_recommendations(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(deps.get_current_user_id),
+):
+    """
+    Dream / Target / Safe universities for the current user's onboarding profile,
+    scored deterministically against the catalog. Results are stored per user and
+    only recomputed after the profile or the catalog changes.
+    """
+    version = await crud_onboarding.get_version(db, user_id=user_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Complete onboarding to get recommendations")
+    etag = f'W/"recommendations-{user_id}-{version}-{catalog.version}"'
+    if deps.etag_matches(request, etag):
+        return deps.not_modified(etag)
+    stored = await crud_recommendation.get_for_user(db, user_id=user_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Complete onboarding to get recommendations")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+    body = {"dream": [], "target": [], "safe": []}
+    for entry in stored.entries:
+        university = catalog.get(entry["university_id"])
+        if university is not None:
+            body[entry["category"]].append({**entry, "university": university.to_dict()})
+    return Recommendations(
+        strength=stored.strength,
+        catalog_version=stored.catalog_version,
+        computed_at=stored.computed_at,
+        **body,
+    )
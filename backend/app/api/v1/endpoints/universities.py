@@ -1,49 +1,247 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+import base64
+import json
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
+from app.core import changes, response_cache
+from app.core.config import settings
+from app.data.catalog import catalog
+from app.db.session import AsyncSessionLocal, get_async_db
 from app.schemas.university import UserUniversity as UserUniversitySchema
-from app.schemas.university import UserUniversityCreate
+from app.schemas.university import (
+    CatalogPage,
+    CatalogUniversity,
+    UserUniversityBatch,
+    UserUniversityBatchDelete,
+    UserUniversityCreate,
+)
 from app.crud import crud_university
 
 router = APIRouter()
 
 @router.get("/", response_model=List[UserUniversitySchema])
-def read_user_universities(
-    db: Session = Depends(deps.get_db),
-    current_user = Depends(deps.get_current_user),
+async def read_user_universities(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    user_id: int = Depends(deps.get_current_user_id),
 ):
     """
     Retrieve user's university selections.
+    Served from response_cache when cached; otherwise answers 304 from
+    users.selections_version when If-None-Match is current.
+    """
+    cached = await response_cache.get(user_id, response_cache.UNIVERSITIES)
+    if cached is not None:
+        return deps.cached_response(request, cached)
+    # Still 401 for a user that no longer exists
+    await deps.get_current_user(user_id, db)
+    version = await crud_university.get_version(db, user_id=user_id)
+    etag = f'W/"universities-{user_id}-{version}"'
+    if deps.etag_matches(request, etag):
+        return deps.not_modified(etag)
+    selections = await crud_university.get_user_universities(db, user_id=user_id)
+    cached = await response_cache.put(
+        db,
+        user_id,
+        response_cache.UNIVERSITIES,
+        response_cache.serialize(List[UserUniversitySchema], selections),
+        etag,
+    )
+    return deps.cached_response(request, cached)
+
+def _sse(event: str, data: dict, event_id=None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+@router.get("/stream")
+async def stream_user_universities(request: Request, user_id: int = Depends(deps.get_current_user_id)):
     """
-    return crud_university.get_user_universities(db, user_id=current_user.id)
+    Server-sent events for the user's selections, from any source (web, API,
+    voice agent). Starts with a "hello" event carrying the current
+    selections_version, then sends a "selection" event per committed change
+    with the changed university_id -> status (null when removed) and the new
+    version as its id. A "resync" event means changes may have been missed
+    (including on reconnect with a stale Last-Event-ID); refetch GET /universities/.
+    Holds no database connection while open.
+    """
+    queue = await changes.bus.subscribe(user_id)
+    try:
+        # Subscribed first, so nothing committed after this read can be missed
+        async with AsyncSessionLocal() as db:
+            version = await crud_university.get_version(db, user_id=user_id)
+    except BaseException:
+        changes.bus.unsubscribe(user_id, queue)
+        raise
+    last_event_id = request.headers.get("last-event-id")
+
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            yield _sse("hello", {"version": version}, version)
+            if last_event_id is not None and last_event_id != str(version):
+                yield _sse("resync", changes.RESYNC)
+            while True:
+                try:
+                    change = await asyncio.wait_for(
+                        queue.get(), timeout=settings.CHANGE_STREAM_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                if change["type"] == "resync":
+                    yield _sse("resync", change)
+                else:
+                    yield _sse("selection", change, change["version"])
+        finally:
+            changes.bus.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+def _catalog_cache_headers(response: Response) -> str:
+    etag = f'"catalog-{catalog.version}"'
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = f"public, max-age={settings.CATALOG_CACHE_MAX_AGE_SECONDS}"
+    return etag
+
+def _encode_cursor(sort: str, key) -> str:
+    payload = json.dumps({"sort": sort, "key": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def _decode_cursor(sort: str, cursor: str):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        key = tuple(payload["key"])
+        # The key is bisected against the precomputed keys of this ordering, so it must match their shape
+        sample = catalog.orders[sort][0][0]
+        if payload["sort"] != sort or len(key) != len(sample) or any(
+            type(a) is not type(b) for a, b in zip(sample, key)
+        ):
+            raise ValueError(cursor)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+@router.get("/catalog", response_model=CatalogPage)
+async def read_catalog(
+    request: Request,
+    response: Response,
+    country: List[str] = Query(default=[]),
+    field: List[str] = Query(default=[]),
+    acceptance: List[Literal["low", "medium", "high"]] = Query(default=[]),
+    min_fee: Optional[int] = Query(default=None, ge=0),
+    max_fee: Optional[int] = Query(default=None, ge=0),
+    sort: Literal["name", "fee", "acceptance", "country"] = "name",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    """
+    Public university catalog. Repeat country/field/acceptance to match any of
+    several values. Filters resolve through the catalog's indexes and pages are
+    keyset-paginated over precomputed orderings; pass next_cursor back as cursor.
+    The body depends only on the URL and the catalog version, so it is served
+    with a long max-age and answers 304 to a current If-None-Match.
+    """
+    etag = _catalog_cache_headers(response)
+    if deps.etag_matches(request, etag):
+        return deps.not_modified(etag, response.headers["Cache-Control"])
+    after = _decode_cursor(sort, cursor) if cursor else None
+    candidates = catalog.match(
+        countries=country,
+        fields=field,
+        acceptance=acceptance,
+        min_fee=min_fee,
+        max_fee=max_fee,
+    )
+    page = catalog.page(candidates, sort=sort, descending=order == "desc", after=after, limit=limit)
+    return CatalogPage(
+        items=[CatalogUniversity(**u.to_dict()) for u in page.items],
+        total=page.total,
+        next_cursor=_encode_cursor(sort, page.next_key) if page.next_key else None,
+        version=catalog.version,
+    )
+
+@router.get("/catalog/{university_id}", response_model=CatalogUniversity)
+async def read_catalog_university(university_id: str, request: Request, response: Response):
+    """
+    A single catalog entry, cached like the listing.
+    """
+    university = catalog.get(university_id)
+    if university is None:
+        raise HTTPException(status_code=404, detail="University not found")
+    etag = _catalog_cache_headers(response)
+    if deps.etag_matches(request, etag):
+        return deps.not_modified(etag, response.headers["Cache-Control"])
+    return CatalogUniversity(**university.to_dict())
 
 @router.post("/", response_model=UserUniversitySchema)
-def update_university_selection(
+async def update_university_selection(
     uni_in: UserUniversityCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(deps.get_current_user),
 ):
     """
     Add or Update a university selection (shortlist/lock).
     """
-    return crud_university.update_university_status(
+    return await crud_university.update_university_status(
         db, 
         user_id=current_user.id, 
         university_id=uni_in.university_id, 
         status=uni_in.status
     )
 
+@router.post("/batch", response_model=List[UserUniversitySchema])
+async def update_university_selections_batch(
+    batch_in: UserUniversityBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(deps.get_current_user),
+):
+    """
+    Shortlist/lock and remove many universities in one transaction.
+    Returns the resulting selection list.
+    """
+    return await crud_university.apply_batch(
+        db,
+        user_id=current_user.id,
+        selections={s.university_id: s.status for s in batch_in.selections},
+        remove=batch_in.remove,
+    )
+
+@router.delete("/batch", response_model=List[UserUniversitySchema])
+async def remove_university_selections_batch(
+    batch_in: UserUniversityBatchDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(deps.get_current_user),
+):
+    """
+    Remove many universities from selection in one transaction.
+    Returns the resulting selection list.
+    """
+    return await crud_university.apply_batch(
+        db,
+        user_id=current_user.id,
+        selections={},
+        remove=batch_in.university_ids,
+    )
+
 @router.delete("/{university_id}", response_model=dict)
-def remove_university_selection(
+async def remove_university_selection(
     university_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(deps.get_current_user),
 ):
     """
     Remove a university from selection (un-shortlist).
     """
-    success = crud_university.remove_university(
+    success = await crud_university.remove_university(
         db, 
         user_id=current_user.id, 
         university_id=university_id
@@ -7,7 +7,7 @@ import uuid
 router = APIRouter()
 
 @router.get("/token")
-def get_voice_token(
+async def get_voice_token(
     current_user = Depends(deps.get_current_user),
 ):
     """
@@ -0,0 +1,162 @@
+"""
+Admission control: a concurrency limit and a bounded FIFO wait queue per route
+class, so a burst in one class (bcrypt logins, say) cannot take the database
+connections and event loop time that the others need.
+
+Route classes:
+- auth: login / signup / Google login, which hash or verify a password
+- read: other GET/HEAD requests
+- write: everything else
+The change stream, /metrics and /health/db are never limited (the stream is
+long-lived and holds no connection).
+
+A request that finds its class at the limit waits in the queue. When the queue
+is full, or the wait exceeds ADMISSION_QUEUE_TIMEOUT_SECONDS, it fails fast
+with 503 and Retry-After instead of stalling until the client gives up.
+Limits are per worker process.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram
+
+AUTH = "auth"
+READ = "read"
+WRITE = "write"
+
+QUEUE_DEPTH = Gauge("admission_queue_depth", "Requests waiting for admission", ["route_class"])
+ACTIVE = Gauge("admission_active", "Requests admitted and being served", ["route_class"])
+REJECTED = Counter(
+    "admission_rejected_total", "Requests shed with 503 by route class and reason", ["route_class", "reason"]
+)
+WAIT_SECONDS = Histogram(
+    "admission_wait_seconds",
+    "Time admitted requests spent in the wait queue",
+    ["route_class"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+_AUTH_PATHS = {f"{settings.API_V1_STR}/auth/{name}" for name in ("login", "signup", "google-login")}
+_UNLIMITED_PATHS = {"/metrics", "/health/db", f"{settings.API_V1_STR}/universities/stream"}
+
+
+class Rejected(Exception):
+    """The request was not admitted; reason is "queue_full" or "timeout"."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Limiter:
+    """At most `concurrency` holders; up to `queue_size` more wait in arrival order."""
+
+    def __init__(self, route_class: str, concurrency: int, queue_size: int):
+        self.route_class = route_class
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: float) -> None:
+        if self.active < self.concurrency and not self._waiters:
+            self._admit(0.0)
+            return
+        if len(self._waiters) >= self.queue_size:
+            raise Rejected("queue_full")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        QUEUE_DEPTH.inc(route_class=self.route_class)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # release() handed us the slot just as we gave up; pass it on
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                raise Rejected("timeout")
+            raise
+        finally:
+            QUEUE_DEPTH.dec(route_class=self.route_class)
+        # The slot was handed over by release(), which left `active` as it was
+        WAIT_SECONDS.observe(time.perf_counter() - start, route_class=self.route_class)
+
+    def _admit(self, waited: float) -> None:
+        self.active += 1
+        ACTIVE.inc(route_class=self.route_class)
+        WAIT_SECONDS.observe(waited, route_class=self.route_class)
+
+    def release(self) -> None:
+        if self._waiters and self.active <= self.concurrency:
+            # Hand the slot straight to the oldest waiter
+            self._waiters.popleft().set_result(None)
+            return
+        self.active -= 1
+        ACTIVE.dec(route_class=self.route_class)
+
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+
+limiters: Dict[str, Limiter] = {
+    AUTH: Limiter(AUTH, settings.ADMISSION_AUTH_CONCURRENCY, settings.ADMISSION_AUTH_QUEUE_SIZE),
+    READ: Limiter(READ, settings.ADMISSION_READ_CONCURRENCY, settings.ADMISSION_READ_QUEUE_SIZE),
+    WRITE: Limiter(WRITE, settings.ADMISSION_WRITE_CONCURRENCY, settings.ADMISSION_WRITE_QUEUE_SIZE),
+}
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """The request's route class, or None if it is admitted without a limit."""
+    if path in _UNLIMITED_PATHS or method == "OPTIONS":
+        return None
+    if path in _AUTH_PATHS:
+        return AUTH
+    return READ if method in ("GET", "HEAD") else WRITE
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware applying `limiters` to HTTP requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        kind = route_class(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if kind is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = limiters[kind]
+        try:
+            await limiter.acquire(settings.ADMISSION_QUEUE_TIMEOUT_SECONDS)
+        except Rejected as e:
+            REJECTED.inc(route_class=kind, reason=e.reason)
+            await _send_busy(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+async def _send_busy(send) -> None:
+    body = json.dumps({"detail": "Server is busy, please retry"}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
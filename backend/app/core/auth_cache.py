@@ -0,0 +1,57 @@
+"""
+In-process cache for get_current_user.
+Maps a raw JWT to its verified user id and a user id to a snapshot of the
+users row, so most authenticated requests never hit the database.
+Entries are dropped on writes to the user and expire after AUTH_CACHE_TTL_SECONDS
+(which bounds staleness across workers).
+"""
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+_token_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+_user_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def get_token_subject(token: str) -> Optional[int]:
+    return _token_cache.get(token)
+
+
+def set_token_subject(token: str, user_id: int, expires_at: Optional[float] = None) -> None:
+    # Never keep a token around longer than the JWT itself is valid
+    ttl = None if expires_at is None else expires_at - time.time()
+    _token_cache.set(token, user_id, ttl)
+
+
+def invalidate_token(token: str) -> None:
+    _token_cache.delete(token)
+
+
+def get_user(user_id: int) -> Optional[User]:
+    """Return a fresh detached User built from the cached row, or None."""
+    row = _user_cache.get(user_id)
+    if row is None:
+        return None
+    user = User(**row)
+    make_transient_to_detached(user)
+    return user
+
+
+def set_user(user: User) -> None:
+    row: Dict[str, Any] = {
+        attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs
+    }
+    _user_cache.set(user.id, row)
+
+
+def invalidate_user(user_id: int) -> None:
+    _user_cache.delete(user_id)
+
+
+def clear() -> None:
+    _token_cache.clear()
+    _user_cache.clear()
@@ -0,0 +1,206 @@
+"""
+Change notifications for a user's university selections, fanned out to the
+open /universities/stream connections of that user.
+
+Writers call notify() inside their transaction, so a change is only announced
+once it commits. With Postgres the event is a NOTIFY on CHANNEL, which reaches
+every API worker (and is how the voice agent, a separate process, publishes
+too). Each worker holds one LISTEN connection for all of its streams. The
+in-process bus (SQLite, tests) delivers after the session commits, and only to
+streams of the same process.
+
+Events are dicts:
+{"type": "selection", "user_id", "version", "source", "changes": {university_id: status or None}}.
+A subscriber whose queue overflows, or that may have missed events while the
+LISTEN connection was down, gets {"type": "resync"} and should refetch.
+"""
+import abc
+import asyncio
+import json
+import logging
+from typing import Dict, Mapping, Optional, Set
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+# The voice agent NOTIFYs this channel directly; keep agent_standalone in sync
+CHANNEL = "selection_changes"
+RESYNC = {"type": "resync"}
+RECONNECT_SECONDS = 1.0
+# How long a new stream waits for the worker's LISTEN connection before going ahead
+LISTEN_WAIT_SECONDS = 5.0
+
+STREAMS_OPEN = Gauge("change_streams_open", "Open selection change streams")
+EVENTS_DELIVERED = Counter("change_events_delivered_total", "Change events queued to streams")
+EVENTS_DROPPED = Counter("change_events_dropped_total", "Streams reset to resync after a full queue")
+
+
+class ChangeBus(abc.ABC):
+    """Per-user fan-out to local subscriber queues."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+
+    async def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        STREAMS_OPEN.inc()
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is None or queue not in queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+        STREAMS_OPEN.dec()
+
+    def dispatch(self, change: dict) -> None:
+        for queue in self._subscribers.get(change.get("user_id"), ()):
+            _offer(queue, change)
+
+    def resync_all(self) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                _offer(queue, RESYNC)
+
+    @abc.abstractmethod
+    async def publish(self, db: AsyncSession, change: dict) -> None:
+        ...
+
+    async def stop(self) -> None:
+        pass
+
+
+def _offer(queue: asyncio.Queue, change: dict) -> None:
+    try:
+        queue.put_nowait(change)
+        EVENTS_DELIVERED.inc()
+    except asyncio.QueueFull:
+        # A stream this far behind refetches instead of replaying
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC)
+        EVENTS_DROPPED.inc()
+
+
+class InProcessChangeBus(ChangeBus):
+    async def publish(self, db: AsyncSession, change: dict) -> None:
+        event.listen(db.sync_session, "after_commit", lambda session: self.dispatch(change), once=True)
+
+
+class PostgresChangeBus(ChangeBus):
+    """NOTIFY to publish; one LISTEN connection per worker, opened with the first stream."""
+
+    def __init__(self, queue_size: int, url: str):
+        super().__init__(queue_size)
+        self.url = url
+        self._listener: Optional[asyncio.Task] = None
+        # Set while the LISTEN is active
+        self._listening = asyncio.Event()
+
+    async def subscribe(self, user_id: int) -> asyncio.Queue:
+        """
+        Waits (up to LISTEN_WAIT_SECONDS) for the LISTEN to be active, so changes
+        committed after this returns are delivered. A stream that gives up
+        waiting is subscribed anyway and gets a resync once LISTEN comes up.
+        """
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        if not self._listening.is_set():
+            try:
+                await asyncio.wait_for(self._listening.wait(), LISTEN_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning("LISTEN %s not active yet; stream will resync when it is", CHANNEL)
+        return await super().subscribe(user_id)
+
+    async def publish(self, db: AsyncSession, change: dict) -> None:
+        # Delivered by Postgres on commit, dropped on rollback
+        await db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CHANNEL, "payload": json.dumps(change, separators=(",", ":"))},
+        )
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self.dispatch(json.loads(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed %s payload", CHANNEL)
+
+    async def _listen(self) -> None:
+        import asyncpg
+        from app.db.session import async_database_url
+
+        url, connect_args = async_database_url(self.url)
+        dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            closed = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(dsn, **connect_args)
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                # Streams subscribed before now (waiting through a failed first
+                # connect, or across a reconnect) may have missed changes
+                self.resync_all()
+                self._listening.set()
+                try:
+                    await closed.wait()
+                finally:
+                    self._listening.clear()
+                    if not connection.is_closed():
+                        await connection.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("LISTEN %s connection failed: %s", CHANNEL, e)
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+
+
+def _create_bus() -> ChangeBus:
+    url = settings.ASYNC_DATABASE_URL or settings.DATABASE_URL
+    kind = settings.CHANGE_BUS
+    if kind == "auto":
+        kind = "postgres" if make_url(url).get_backend_name() == "postgresql" else "memory"
+    if kind == "postgres":
+        return PostgresChangeBus(settings.CHANGE_STREAM_QUEUE_SIZE, url)
+    return InProcessChangeBus(settings.CHANGE_STREAM_QUEUE_SIZE)
+
+
+bus = _create_bus()
+
+
+async def notify(
+    db: AsyncSession,
+    user_id: int,
+    version: int,
+    changes: Mapping[str, Optional[str]],
+    source: str = "api",
+) -> None:
+    """Announce selection changes (university_id -> status, None if removed) once db commits."""
+    await bus.publish(
+        db,
+        {
+            "type": "selection",
+            "user_id": user_id,
+            "version": version,
+            "source": source,
+            "changes": {
+                university_id: getattr(status, "value", status) for university_id, status in changes.items()
+            },
+        },
+    )
@@ -5,6 +5,14 @@ class Settings(BaseSettings):
     PROJECT_NAME: str
     API_V1_STR: str
     DATABASE_URL: str
+    # Optional explicit async URL; derived from DATABASE_URL (asyncpg / aiosqlite) when unset
+    ASYNC_DATABASE_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    # Optional read replica for read-only GETs (same pool sizes); unset = everything on DATABASE_URL
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # After a client's own write, its reads stay on the primary this long (covers replica lag)
+    READ_YOUR_WRITES_SECONDS: float = 5.0
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
@@ -12,6 +20,49 @@ class Settings(BaseSettings):
     COOKIE_SAMESITE: str = "lax"
     COOKIE_SECURE: bool = False
 
+    # get_current_user cache (token -> user id, user id -> users row snapshot)
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # Serialized /auth/me, /onboarding and /universities/ bodies per user: "none",
+    # "memory" (per process; single worker) or a redis:// URL shared by workers and the voice agent
+    RESPONSE_CACHE: str = "none"
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_PREFIX: str = "gg:response:v1"
+    RESPONSE_CACHE_TIMEOUT_SECONDS: float = 0.25
+
+    # Password hashing (bcrypt runs in a process pool; 0 workers = threads only)
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10.0
+
+    # Browser/CDN max-age for GET /universities/catalog (revalidated by ETag afterwards)
+    CATALOG_CACHE_MAX_AGE_SECONDS: int = 86400
+
+    # Selection change streams (GET /universities/stream): "postgres" (LISTEN/NOTIFY),
+    # "memory" (single process) or "auto" (postgres when the database is Postgres)
+    CHANGE_BUS: str = "auto"
+    CHANGE_STREAM_QUEUE_SIZE: int = 100
+    CHANGE_STREAM_KEEPALIVE_SECONDS: float = 15.0
+
+    # Admission control per route class (auth = password routes, read = GET, write = the rest):
+    # concurrent requests per worker, then a bounded wait queue; beyond that, or after waiting
+    # ADMISSION_QUEUE_TIMEOUT_SECONDS, requests get 503 with Retry-After
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_AUTH_CONCURRENCY: int = 4
+    ADMISSION_AUTH_QUEUE_SIZE: int = 16
+    ADMISSION_READ_CONCURRENCY: int = 32
+    ADMISSION_READ_QUEUE_SIZE: int = 256
+    ADMISSION_WRITE_CONCURRENCY: int = 16
+    ADMISSION_WRITE_QUEUE_SIZE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # Request/DB instrumentation and the /metrics endpoint
+    METRICS_ENABLED: bool = True
+
     # CORS: when using cookies (allow_credentials=True), origins cannot be "*". Comma-separated list. Set in .env.
     BACKEND_CORS_ORIGINS: str
 
@@ -0,0 +1,117 @@
+"""
+Async password hashing.
+bcrypt is CPU bound (~100-300 ms per call), so it runs in a bounded process pool
+instead of on the event loop or Starlette's threadpool. When more than
+PASSWORD_HASH_MAX_PENDING jobs are queued or running in the pool, new ones
+fail fast with PasswordHashingBusy rather than queueing behind a login burst.
+"""
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from app.core import security
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[Executor] = None
+_pending = 0
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+def _thread_executor() -> Executor:
+    return ThreadPoolExecutor(
+        max_workers=max(settings.PASSWORD_HASH_WORKERS, 1), thread_name_prefix="password-hash"
+    )
+
+
+def _use_threads(error: BaseException) -> Executor:
+    global _executor
+    logger.warning(f"Process pool unavailable, hashing in threads: {error}")
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = _thread_executor()
+    return _executor
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.PASSWORD_HASH_WORKERS > 0:
+            try:
+                _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+            except (OSError, NotImplementedError) as e:
+                _use_threads(e)
+        else:
+            _executor = _thread_executor()
+    return _executor
+
+
+async def start() -> None:
+    """
+    Create the pool and run a no-op through it. ProcessPoolExecutor only spawns
+    its workers on first submit, so this is where a runtime that can't run them
+    (e.g. serverless without /dev/shm) is detected and falls back to threads,
+    rather than on the first login.
+    """
+    executor = _get_executor()
+    if isinstance(executor, ProcessPoolExecutor):
+        try:
+            await asyncio.wrap_future(executor.submit(int))
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            _use_threads(e)
+
+
+def _finished() -> None:
+    global _pending
+    _pending -= 1
+
+
+def _release(loop: asyncio.AbstractEventLoop) -> None:
+    try:
+        loop.call_soon_threadsafe(_finished)
+    except RuntimeError:
+        # Loop already closed (shutdown); nothing is left to admit
+        pass
+
+
+async def _run(fn, *args):
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHashingBusy()
+    loop = asyncio.get_running_loop()
+    future = _get_executor().submit(fn, *args)
+    # Counted until the pool is done with the job, not until this call stops
+    # waiting: a job whose caller timed out still holds its queue slot or worker
+    _pending += 1
+    future.add_done_callback(lambda _: _release(loop))
+    try:
+        return await asyncio.wait_for(
+            asyncio.wrap_future(future), timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        # Cancels the job if it hasn't started yet
+        raise PasswordHashingBusy()
+
+
+async def get_password_hash(password: str) -> str:
+    return await _run(security.get_password_hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run(security.verify_password, plain_password, hashed_password)
+
+
+def pending() -> int:
+    return _pending
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,154 @@
+"""
+Request and database instrumentation, exposed at /metrics.
+Everything here is wired up only when METRICS_ENABLED is set, so a disabled
+build pays nothing beyond the import.
+"""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.metrics import Counter, Gauge, Histogram
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status code", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ["method", "route"]
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+HTTP_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50),
+)
+HTTP_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in SQL per HTTP request", ["method", "route"]
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed")
+DB_QUERY_SECONDS = Histogram("db_query_duration_seconds", "SQL statement latency")
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent acquiring a pooled connection (including new connects)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out of the async pool")
+DB_REPLICA_POOL_CHECKED_OUT = Gauge(
+    "db_replica_pool_checked_out", "Connections currently checked out of the async replica pool"
+)
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def _route_template(scope) -> str:
+    """
+    The matched route's template (e.g. /api/v1/universities/{university_id}),
+    so labels are bounded by construction; "unmatched" when no route matched.
+    A route of an included router only knows its own path, so the include
+    prefix FastAPI records for the request is prepended.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    included = scope.get("fastapi", {}).get("included_router")
+    prefix = getattr(getattr(included, "include_context", None), "prefix", "")
+    return prefix + route.path
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: per-route latency, status codes, in-flight and DB time."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+            route = _route_template(scope)
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status_code))
+            HTTP_LATENCY.observe(elapsed, method=method, route=route)
+            HTTP_DB_QUERIES.observe(stats.queries, method=method, route=route)
+            HTTP_DB_SECONDS.observe(stats.db_seconds, method=method, route=route)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    DB_QUERIES.inc()
+    DB_QUERY_SECONDS.observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine, pool_gauge: Gauge = DB_POOL_CHECKED_OUT) -> None:
+    """Count statements and SQL time on a (sync or async_engine.sync_engine) engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    if isinstance(engine.pool, TimedAsyncQueuePool):
+        pool_gauge.set_function(engine.pool.checkedout)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout takes."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            DB_POOL_WAIT.observe(waited)
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.pool_wait_seconds += waited
@@ -0,0 +1,245 @@
+"""
+Read-through cache of serialized per-user GET responses (/auth/me,
+/onboarding, /universities/), keyed by user id and resource.
+
+A hit is served from the stored JSON bytes as-is: no database session is
+opened and nothing goes through Pydantic. The crud functions that write a
+resource invalidate it write-through after their commit, and entries also
+expire after RESPONSE_CACHE_TTL_SECONDS.
+
+RESPONSE_CACHE selects the backend:
+- "none" (default): disabled.
+- "memory": a per-process LRU bounded by RESPONSE_CACHE_MAX_BYTES. Writes made
+  by another API worker or by the voice agent do not reach it, so use it only
+  with a single worker, or accept bodies up to the TTL old.
+- a redis:// URL: shared by all workers. The voice agent deletes from it too.
+
+A reader that missed can still store a body read just before a concurrent
+write committed; the TTL bounds how long such an entry lives. Bodies read from
+the replica are never stored (see put).
+"""
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge
+from app.db.session import is_replica
+
+logger = logging.getLogger(__name__)
+
+ME = "me"
+ONBOARDING = "onboarding"
+UNIVERSITIES = "universities"
+
+REQUESTS = Counter(
+    "response_cache_requests_total", "Response cache lookups by resource and result", ["resource", "result"]
+)
+ERRORS = Counter("response_cache_errors_total", "Response cache backend errors by operation", ["operation"])
+HIT_RATIO = Gauge("response_cache_hit_ratio", "Response cache hits / lookups since start")
+BYTES = Gauge("response_cache_bytes", "Bytes held by the response cache")
+
+
+@dataclass
+class CachedResponse:
+    """A serialized JSON body and the ETag it was served with, if any."""
+
+    body: bytes
+    etag: Optional[str] = None
+
+    def encode(self) -> bytes:
+        return (self.etag or "").encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, data: bytes) -> "CachedResponse":
+        etag, _, body = data.partition(b"\n")
+        return cls(body=body, etag=etag.decode() or None)
+
+
+class CacheBackend:
+    async def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        pass
+
+    async def delete(self, keys: Sequence[str]) -> None:
+        pass
+
+    def bytes_used(self) -> float:
+        return 0
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """LRU with per-entry expiry; the oldest entries go once max_bytes is exceeded."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0 or len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (time.monotonic() + ttl_seconds, value)
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                self._pop(next(iter(self._data)))
+
+    async def delete(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+
+    def _pop(self, key: str) -> None:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._bytes -= len(item[1])
+
+    def bytes_used(self) -> float:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisBackend(CacheBackend):
+    """
+    Any server speaking the Redis protocol. Errors are logged and treated as
+    misses, so an unreachable cache only costs the database reads it saved.
+    """
+
+    # used_memory is read from INFO at most this often, on writes
+    MEMORY_REFRESH_SECONDS = 10.0
+
+    def __init__(self, url: str):
+        import redis.asyncio
+
+        self.client = redis.asyncio.Redis.from_url(
+            url, socket_timeout=settings.RESPONSE_CACHE_TIMEOUT_SECONDS
+        )
+        self._used_memory = 0
+        self._memory_read_at = 0.0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self.client.get(key)
+        except Exception as e:
+            self._failed("get", e)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        try:
+            await self.client.set(key, value, px=max(1, int(ttl_seconds * 1000)))
+            if time.monotonic() - self._memory_read_at > self.MEMORY_REFRESH_SECONDS:
+                self._memory_read_at = time.monotonic()
+                self._used_memory = (await self.client.info("memory"))["used_memory"]
+        except Exception as e:
+            self._failed("set", e)
+
+    async def delete(self, keys: Sequence[str]) -> None:
+        try:
+            await self.client.delete(*keys)
+        except Exception as e:
+            # The entry now lives until it expires
+            self._failed("delete", e)
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        ERRORS.inc(operation=operation)
+        logger.warning("Response cache %s failed: %s", operation, error)
+
+    def bytes_used(self) -> float:
+        # Server-wide, so it includes other workers' entries
+        return self._used_memory
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def _create_backend() -> Optional[CacheBackend]:
+    kind = settings.RESPONSE_CACHE
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return MemoryBackend(settings.RESPONSE_CACHE_MAX_BYTES)
+    return RedisBackend(kind)
+
+
+backend = _create_backend()
+_lookups = {"hit": 0, "miss": 0}
+
+HIT_RATIO.set_function(lambda: _lookups["hit"] / max(1, _lookups["hit"] + _lookups["miss"]))
+BYTES.set_function(lambda: backend.bytes_used() if backend is not None else 0)
+
+
+def _key(user_id: int, resource: str) -> str:
+    # The voice agent builds the same key; keep agent_standalone in sync
+    return f"{settings.RESPONSE_CACHE_PREFIX}:{user_id}:{resource}"
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def serialize(schema: Any, value: Any) -> bytes:
+    """value (ORM objects are fine) as JSON through the endpoint's response schema."""
+    adapter = _adapter(schema)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+async def get(user_id: int, resource: str) -> Optional[CachedResponse]:
+    if backend is None:
+        return None
+    data = await backend.get(_key(user_id, resource))
+    result = "miss" if data is None else "hit"
+    _lookups[result] += 1
+    REQUESTS.inc(resource=resource, result=result)
+    return None if data is None else CachedResponse.decode(data)
+
+
+async def put(
+    db: AsyncSession, user_id: int, resource: str, body: bytes, etag: Optional[str] = None
+) -> CachedResponse:
+    """
+    Store a body read through db and return it as a CachedResponse.
+    Not stored when db is a replica session: a lagging replica could otherwise
+    pin data older than the last invalidation for the whole TTL.
+    """
+    cached = CachedResponse(body=body, etag=etag)
+    if backend is not None and not is_replica(db):
+        await backend.set(_key(user_id, resource), cached.encode(), settings.RESPONSE_CACHE_TTL_SECONDS)
+    return cached
+
+
+async def invalidate(user_id: int, *resources: str) -> None:
+    if backend is not None:
+        await backend.delete([_key(user_id, resource) for resource in resources])
+
+
+async def close() -> None:
+    if backend is not None:
+        await backend.close()
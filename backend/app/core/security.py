@@ -5,7 +5,11 @@ from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS,
+)
 
 def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
     if expires_delta:
@@ -21,11 +25,9 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     # Hash the plain password first to match the storage logic
     pre_hashed = hashlib.sha256(plain_password.encode()).hexdigest()
-    print(f"DEBUG: verify_password - pre_hashed length: {len(pre_hashed)}")
     return pwd_context.verify(pre_hashed, hashed_password)
 
 def get_password_hash(password: str) -> str:
     # Pre-hash with SHA-256 to bypass bcrypt's 72-character limit
     pre_hashed = hashlib.sha256(password.encode()).hexdigest()
-    print(f"DEBUG: get_password_hash - pre_hashed length: {len(pre_hashed)}")
     return pwd_context.hash(pre_hashed)
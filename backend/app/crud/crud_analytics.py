@@ -0,0 +1,168 @@
+"""
+Selection rollups: university_selection_counts holds
+count(*) of user_universities per (university_id, status, target intake year).
+
+Writers report each changed selection's status before and after the write
+(record_changes), and onboarding reports intake year changes
+(move_intake_year); both apply +/- deltas in the writer's transaction.
+Each write's "before" statuses come from the write statements themselves
+(see crud_university._upsert), so concurrent writers never count the same
+change twice. rebuild() recomputes the table from the source tables, for
+backfills and to verify the incremental counts.
+"""
+from collections import Counter
+from typing import Dict, List, Mapping, Optional, Tuple
+from sqlalchemy import String, cast, delete, func, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.analytics import UniversitySelectionCount
+from app.models.onboarding import UserOnboarding
+from app.models.university import UserUniversity
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# (university_id, status, intake_year)
+Bucket = Tuple[str, str, int]
+
+
+def _status(value) -> Optional[str]:
+    return getattr(value, "value", value)
+
+
+async def get_intake_year(db: AsyncSession, user_id: int) -> int:
+    result = await db.execute(
+        select(UserOnboarding.target_intake_year).where(UserOnboarding.user_id == user_id)
+    )
+    return result.scalar() or 0
+
+
+async def _apply(db: AsyncSession, deltas: Mapping[Bucket, int]) -> None:
+    rows = [
+        {"university_id": university_id, "status": status, "intake_year": year, "count": delta}
+        for (university_id, status, year), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(UniversitySelectionCount).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                UniversitySelectionCount.university_id,
+                UniversitySelectionCount.status,
+                UniversitySelectionCount.intake_year,
+            ],
+            set_={"count": UniversitySelectionCount.count + stmt.excluded.count},
+        )
+        await db.execute(stmt)
+        return
+    for row in rows:
+        key = (row["university_id"], row["status"], row["intake_year"])
+        existing = await db.get(UniversitySelectionCount, key)
+        if existing is None:
+            db.add(UniversitySelectionCount(**row))
+        else:
+            existing.count = existing.count + row["count"]
+    await db.flush()
+
+
+async def record_changes(
+    db: AsyncSession,
+    user_id: int,
+    before: Mapping[str, Optional[str]],
+    after: Mapping[str, Optional[str]],
+) -> None:
+    """
+    Apply the rollup deltas for one user's selection write. before/after map
+    university_id -> status (None = not selected) for every university the
+    write touched. Runs in the caller's transaction.
+    """
+    deltas: Counter = Counter()
+    year = None
+    for university_id in set(before) | set(after):
+        old, new = _status(before.get(university_id)), _status(after.get(university_id))
+        if old == new:
+            continue
+        if year is None:
+            year = await get_intake_year(db, user_id)
+        if old is not None:
+            deltas[(university_id, old, year)] -= 1
+        if new is not None:
+            deltas[(university_id, new, year)] += 1
+    await _apply(db, deltas)
+
+
+async def move_intake_year(db: AsyncSession, user_id: int, old_year: Optional[int], new_year: Optional[int]) -> None:
+    """Move the user's selections between intake-year buckets after an onboarding change."""
+    old_year, new_year = old_year or 0, new_year or 0
+    if old_year == new_year:
+        return
+    result = await db.execute(
+        select(UserUniversity.university_id, UserUniversity.status).where(UserUniversity.user_id == user_id)
+    )
+    deltas: Counter = Counter()
+    for university_id, status in result:
+        deltas[(university_id, _status(status), old_year)] -= 1
+        deltas[(university_id, _status(status), new_year)] += 1
+    await _apply(db, deltas)
+
+
+def source_counts_query():
+    """The rollup computed from scratch: (university_id, status, intake_year, count) rows."""
+    year = func.coalesce(UserOnboarding.target_intake_year, 0)
+    # Text, not the universitystatus enum, so it can also feed INSERT ... SELECT into the rollup
+    status = cast(UserUniversity.status, String(20))
+    return (
+        select(UserUniversity.university_id, status, year, func.count())
+        .select_from(UserUniversity)
+        .outerjoin(UserOnboarding, UserOnboarding.user_id == UserUniversity.user_id)
+        .group_by(UserUniversity.university_id, status, year)
+    )
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """
+    Recompute the rollup from user_universities (one GROUP BY scan) and write
+    only the buckets that differ, in one transaction. Returns how many
+    buckets were wrong (0 means the incremental counts had not drifted).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Writers' deltas wait for this transaction, and any already applied
+        # commit before the lock is granted, so the scan below sees them
+        await db.execute(text("LOCK TABLE university_selection_counts IN EXCLUSIVE MODE"))
+    actual: Dict[Bucket, int] = {
+        (university_id, _status(status), year): count
+        for university_id, status, year, count in await db.execute(source_counts_query())
+    }
+    stored: Dict[Bucket, int] = {
+        (row.university_id, row.status, row.intake_year): row.count
+        for row in await db.execute(select(UniversitySelectionCount.__table__))
+    }
+    fixed = 0
+    for bucket in set(actual) | set(stored):
+        count = actual.get(bucket, 0)
+        if stored.get(bucket) == count or (count == 0 and bucket not in stored):
+            continue
+        fixed += 1
+        university_id, status, year = bucket
+        where = (
+            UniversitySelectionCount.university_id == university_id,
+            UniversitySelectionCount.status == status,
+            UniversitySelectionCount.intake_year == year,
+        )
+        if count == 0:
+            await db.execute(delete(UniversitySelectionCount).where(*where))
+        elif bucket in stored:
+            await db.execute(update(UniversitySelectionCount).where(*where).values(count=count))
+        else:
+            db.add(UniversitySelectionCount(university_id=university_id, status=status, intake_year=year, count=count))
+    await db.commit()
+    return fixed
+
+
+async def get_counts(db: AsyncSession, *, intake_year: Optional[int] = None) -> List[UniversitySelectionCount]:
+    query = select(UniversitySelectionCount).where(UniversitySelectionCount.count > 0)
+    if intake_year is not None:
+        query = query.where(UniversitySelectionCount.intake_year == intake_year)
+    return list((await db.execute(query)).scalars().all())
@@ -0,0 +1,90 @@
+"""
+Bulk export of onboarding profiles joined with university selections, one row
+per (student, selection) and one row with empty selection columns for
+students without any. Rows come off a server-side cursor (stream_results with
+yield_per), and each batch is encoded into one chunk and dropped, so memory
+stays flat regardless of the number of students.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator, List, Sequence
+from sqlalchemy import DateTime, String, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.onboarding import UserOnboarding
+from app.models.university import UserUniversity
+from app.models.user import User
+
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+DEFAULT_BATCH_SIZE = 2000
+
+_ONBOARDING_SKIP = {"id", "user_id"}
+# Bookkeeping columns that would be ambiguous in a flat row
+_ONBOARDING_PREFIXED = {"version", "created_at", "updated_at"}
+
+
+def _columns() -> list:
+    return [
+        User.id.label("user_id"),
+        User.email,
+        User.full_name,
+        *(
+            column.label(f"onboarding_{column.name}") if column.name in _ONBOARDING_PREFIXED else column
+            for column in UserOnboarding.__table__.columns
+            if column.name not in _ONBOARDING_SKIP
+        ),
+        UserUniversity.university_id,
+        # Raw string: skips building an enum per row
+        type_coerce(UserUniversity.status, String).label("university_status"),
+    ]
+
+
+def export_query():
+    return (
+        select(*_columns())
+        .select_from(UserOnboarding)
+        .join(User, User.id == UserOnboarding.user_id)
+        .outerjoin(UserUniversity, UserUniversity.user_id == UserOnboarding.user_id)
+        .order_by(UserOnboarding.user_id, UserUniversity.id)
+    )
+
+
+EXPORT_FIELDS: List[str] = [column.name for column in export_query().selected_columns]
+# Everything else is already a str/int/float/None that csv and json write as-is
+_DATETIME_INDEXES = [
+    index for index, column in enumerate(export_query().selected_columns) if isinstance(column.type, DateTime)
+]
+
+
+def _plain_rows(rows: Sequence[Sequence]) -> List[list]:
+    plain = []
+    for row in rows:
+        row = list(row)
+        for index in _DATETIME_INDEXES:
+            if row[index] is not None:
+                row[index] = row[index].isoformat()
+        plain.append(row)
+    return plain
+
+
+def _csv_chunk(rows: Sequence[Sequence]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(rows: Sequence[Sequence]) -> str:
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    return "".join(dumps(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in rows)
+
+
+async def export_chunks(
+    db: AsyncSession, fmt: str = "csv", batch_size: int = DEFAULT_BATCH_SIZE
+) -> AsyncIterator[str]:
+    """Yield the export as text chunks of batch_size rows (CSV starts with a header line)."""
+    encode = _csv_chunk if fmt == "csv" else _ndjson_chunk
+    if fmt == "csv":
+        yield _csv_chunk([EXPORT_FIELDS])
+    result = await db.stream(export_query().execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield encode(_plain_rows(rows))
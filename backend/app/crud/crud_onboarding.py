@@ -1,33 +1,210 @@
-from typing import Optional
-from sqlalchemy.orm import Session
-from app.models.onboarding import UserOnboarding
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import bindparam, delete, func, insert as sql_insert, select, update as sql_update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import response_cache
+from app.crud import crud_analytics
+from app.data.profile import normalized_columns
+from app.models.onboarding import UserOnboarding, UserPreferredCountry
+from app.models.user import User
 from app.schemas.onboarding import OnboardingCreate, OnboardingUpdate
 
 
-def get_by_user_id(db: Session, *, user_id: int) -> Optional[UserOnboarding]:
-    return db.query(UserOnboarding).filter(UserOnboarding.user_id == user_id).first()
+async def get_version(db: AsyncSession, *, user_id: int) -> int:
+    """Current onboarding version for the user (0 if they have none yet)."""
+    result = await db.execute(
+        select(UserOnboarding.version).where(UserOnboarding.user_id == user_id)
+    )
+    return result.scalar() or 0
 
 
-def create(db: Session, *, user_id: int, obj_in: OnboardingCreate) -> UserOnboarding:
-    db_obj = UserOnboarding(user_id=user_id, **obj_in.model_dump(exclude_unset=False))
+async def get_by_user_id(db: AsyncSession, *, user_id: int) -> Optional[UserOnboarding]:
+    result = await db.execute(select(UserOnboarding).where(UserOnboarding.user_id == user_id))
+    return result.scalars().first()
+
+
+def _with_normalized(data: dict) -> Tuple[dict, Optional[Tuple[str, ...]]]:
+    """data plus its normalized columns, and the parsed countries (None if not submitted)."""
+    normalized = normalized_columns(data)
+    countries = normalized.pop("countries", None)
+    return {**data, **normalized}, countries
+
+
+async def get_countries(db: AsyncSession, *, user_id: int) -> List[str]:
+    result = await db.execute(
+        select(UserPreferredCountry.country)
+        .where(UserPreferredCountry.user_id == user_id)
+        .order_by(UserPreferredCountry.country)
+    )
+    return list(result.scalars().all())
+
+
+async def _replace_countries(db: AsyncSession, user_id: int, countries: Sequence[str]) -> None:
+    await db.execute(delete(UserPreferredCountry).where(UserPreferredCountry.user_id == user_id))
+    if countries:
+        await db.execute(
+            sql_insert(UserPreferredCountry),
+            [{"user_id": user_id, "country": country} for country in countries],
+        )
+
+
+async def create(db: AsyncSession, *, user_id: int, obj_in: OnboardingCreate) -> UserOnboarding:
+    data, countries = _with_normalized(obj_in.model_dump(exclude_unset=False))
+    db_obj = UserOnboarding(user_id=user_id, **data)
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    await db.flush()
+    await _replace_countries(db, user_id, countries or ())
+    await crud_analytics.move_intake_year(db, user_id, None, db_obj.target_intake_year)
+    await db.commit()
+    await response_cache.invalidate(db_obj.user_id, response_cache.ONBOARDING)
+    await db.refresh(db_obj)
     return db_obj
 
 
-def update(db: Session, *, db_obj: UserOnboarding, obj_in: OnboardingUpdate) -> UserOnboarding:
-    data = obj_in.model_dump(exclude_unset=True)
+async def update(db: AsyncSession, *, db_obj: UserOnboarding, obj_in: OnboardingUpdate) -> UserOnboarding:
+    data, countries = _with_normalized(obj_in.model_dump(exclude_unset=True))
+    old_intake_year = db_obj.target_intake_year
     for field, value in data.items():
         setattr(db_obj, field, value)
+    db_obj.version = UserOnboarding.version + 1
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    if countries is not None:
+        await _replace_countries(db, db_obj.user_id, countries)
+    if "target_intake_year" in data:
+        await crud_analytics.move_intake_year(db, db_obj.user_id, old_intake_year, data["target_intake_year"])
+    await db.commit()
+    await response_cache.invalidate(db_obj.user_id, response_cache.ONBOARDING)
+    await db.refresh(db_obj)
     return db_obj
 
 
-def upsert(db: Session, *, user_id: int, obj_in: OnboardingUpdate) -> UserOnboarding:
-    existing = get_by_user_id(db, user_id=user_id)
-    if existing:
-        return update(db, db_obj=existing, obj_in=obj_in)
-    return create(db, user_id=user_id, obj_in=OnboardingCreate(**obj_in.model_dump()))
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+async def upsert(
+    db: AsyncSession, *, user_id: int, obj_in: OnboardingUpdate, mark_onboarded: bool = False
+) -> UserOnboarding:
+    """
+    Insert or update the user's onboarding row in one transaction.
+    On Postgres/SQLite this is a single INSERT ... ON CONFLICT (user_id) DO UPDATE
+    ... RETURNING that only touches the submitted columns; other dialects fall
+    back to select-then-write. With mark_onboarded, users.is_onboarded is set in
+    the same transaction. The normalized columns (and user_preferred_countries)
+    of the submitted free-text fields are written alongside them.
+    """
+    data, countries = _with_normalized(obj_in.model_dump(exclude_unset=True))
+    dialect = db.get_bind().dialect
+    insert = _UPSERT_INSERTS.get(dialect.name)
+    if "target_intake_year" in data:
+        # Selection rollups are bucketed by intake year; see crud_analytics
+        old_intake_year = (
+            await db.execute(
+                select(UserOnboarding.target_intake_year)
+                .where(UserOnboarding.user_id == user_id)
+                .with_for_update()
+            )
+        ).scalar()
+
+    if insert is not None and dialect.insert_returning:
+        stmt = insert(UserOnboarding).values(user_id=user_id, **data)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserOnboarding.user_id],
+            set_={
+                **{field: stmt.excluded[field] for field in data},
+                "version": UserOnboarding.version + 1,
+                "updated_at": func.now(),
+            },
+        ).returning(UserOnboarding)
+        result = await db.execute(stmt, execution_options={"populate_existing": True})
+        record = result.scalars().one()
+    else:
+        record = await get_by_user_id(db, user_id=user_id)
+        if record is None:
+            record = UserOnboarding(user_id=user_id)
+            db.add(record)
+        else:
+            record.version = UserOnboarding.version + 1
+        for field, value in data.items():
+            setattr(record, field, value)
+        await db.flush()
+        await db.refresh(record)
+
+    if countries is not None:
+        await _replace_countries(db, user_id, countries)
+    if "target_intake_year" in data:
+        await crud_analytics.move_intake_year(db, user_id, old_intake_year, data["target_intake_year"])
+    if mark_onboarded:
+        await db.execute(
+            sql_update(User)
+            .where(User.id == user_id, User.is_onboarded.is_not(True))
+            .values(is_onboarded=True)
+        )
+    await db.commit()
+    # is_onboarded is part of GET /auth/me
+    await response_cache.invalidate(
+        user_id, response_cache.ONBOARDING, *((response_cache.ME,) if mark_onboarded else ())
+    )
+    return record
+
+
+# Free-text answers the normalized columns are parsed from (see app.data.profile)
+_FREE_TEXT_FIELDS = (
+    "gpa_or_percentage",
+    "ielts_toefl_score",
+    "gre_gmat_score",
+    "budget_range_per_year",
+    "preferred_countries",
+)
+_NORMALIZED_FIELDS = (
+    "gpa_normalized",
+    "english_exam",
+    "english_score",
+    "graduate_exam",
+    "graduate_score",
+    "budget_min_usd",
+    "budget_max_usd",
+)
+
+
+async def backfill_normalized(db: AsyncSession, *, batch_size: int = 1000) -> int:
+    """
+    Re-parse every onboarding row's free-text answers into its normalized
+    columns and user_preferred_countries, in user_id batches of one
+    transaction each. Bumps each row's version, since GET /onboarding returns
+    the normalized columns. Returns how many rows were written.
+    """
+    # Core UPDATE on the table: one executemany keyed by user_id
+    table = UserOnboarding.__table__
+    stmt = (
+        sql_update(table)
+        .where(table.c.user_id == bindparam("b_user_id"))
+        .values(**{field: bindparam(field) for field in _NORMALIZED_FIELDS}, version=table.c.version + 1)
+    )
+    count = 0
+    last_user_id = 0
+    while True:
+        result = await db.execute(
+            select(UserOnboarding.user_id, *(getattr(UserOnboarding, field) for field in _FREE_TEXT_FIELDS))
+            .where(UserOnboarding.user_id > last_user_id)
+            .order_by(UserOnboarding.user_id)
+            .limit(batch_size)
+        )
+        rows = result.mappings().all()
+        if not rows:
+            break
+        last_user_id = rows[-1]["user_id"]
+        user_ids = [row["user_id"] for row in rows]
+        updates, countries = [], []
+        for row in rows:
+            columns = normalized_columns(row)
+            countries.extend({"user_id": row["user_id"], "country": country} for country in columns.pop("countries"))
+            updates.append({"b_user_id": row["user_id"], **columns})
+        await db.execute(stmt, updates)
+        await db.execute(delete(UserPreferredCountry).where(UserPreferredCountry.user_id.in_(user_ids)))
+        if countries:
+            await db.execute(sql_insert(UserPreferredCountry), countries)
+        await db.commit()
+        for user_id in user_ids:
+            await response_cache.invalidate(user_id, response_cache.ONBOARDING)
+        count += len(rows)
+    return count
@@ -0,0 +1,140 @@
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.data.profile import profile_from_normalized
+from app.data.recommend import RecommendationSet, engine
+from app.models.onboarding import UserOnboarding, UserPreferredCountry
+from app.models.recommendation import UserRecommendation
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# What profile_from_normalized reads, plus the keys of the stored result
+_PROFILE_COLUMNS = (
+    "user_id",
+    "version",
+    "gpa_normalized",
+    "english_exam",
+    "english_score",
+    "ielts_toefl_status",
+    "graduate_exam",
+    "graduate_score",
+    "gre_gmat_status",
+    "budget_min_usd",
+    "budget_max_usd",
+    "field_of_study",
+)
+
+
+def _profile_query():
+    return select(*(UserOnboarding.__table__.c[name] for name in _PROFILE_COLUMNS))
+
+
+async def _profiles(db: AsyncSession, rows: Sequence) -> list:
+    """StudentProfiles for onboarding rows, with countries from user_preferred_countries."""
+    countries: Dict[int, List[str]] = {}
+    if rows:
+        result = await db.execute(
+            select(UserPreferredCountry.user_id, UserPreferredCountry.country).where(
+                UserPreferredCountry.user_id.in_([row["user_id"] for row in rows])
+            )
+        )
+        for user_id, country in result:
+            countries.setdefault(user_id, []).append(country)
+    return [profile_from_normalized(row, tuple(countries.get(row["user_id"], ()))) for row in rows]
+
+
+def _row(user_id: int, onboarding_version: int, result: RecommendationSet) -> dict:
+    return {
+        "user_id": user_id,
+        "onboarding_version": onboarding_version,
+        "catalog_version": engine.version,
+        "strength": result.strength,
+        "entries": [entry.to_dict() for entry in result.all()],
+    }
+
+
+async def _save(db: AsyncSession, rows: Sequence[dict]) -> None:
+    if not rows:
+        return
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(UserRecommendation).values(list(rows))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserRecommendation.user_id],
+            set_={
+                "onboarding_version": stmt.excluded.onboarding_version,
+                "catalog_version": stmt.excluded.catalog_version,
+                "strength": stmt.excluded.strength,
+                "entries": stmt.excluded.entries,
+                "computed_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+    else:
+        for row in rows:
+            await db.merge(UserRecommendation(**row))
+        await db.flush()
+
+
+async def get_for_user(db: AsyncSession, *, user_id: int) -> Optional[UserRecommendation]:
+    """
+    The user's recommendations, recomputed (and stored) only when their
+    onboarding or the catalog changed since the stored result.
+    None if the user has no onboarding profile yet.
+    """
+    onboarding = (
+        await db.execute(_profile_query().where(UserOnboarding.user_id == user_id))
+    ).mappings().first()
+    if onboarding is None:
+        return None
+    stored = await db.get(UserRecommendation, user_id)
+    if (
+        stored is not None
+        and stored.onboarding_version == onboarding["version"]
+        and stored.catalog_version == engine.version
+    ):
+        return stored
+
+    [profile] = await _profiles(db, [onboarding])
+    await _save(db, [_row(user_id, onboarding["version"], engine.recommend(profile))])
+    await db.commit()
+    return await db.get(UserRecommendation, user_id, populate_existing=True)
+
+
+async def recompute_all(db: AsyncSession, *, batch_size: int = 1000, stale_only: bool = False) -> int:
+    """
+    Recompute every user's recommendations (e.g. after a catalog update).
+    Onboarding rows are read in user_id keyset batches and each batch is
+    scored as one matrix and written with one multi-row upsert.
+    With stale_only, users whose stored result is current are skipped.
+    Returns the number of users recomputed.
+    """
+    total = 0
+    last_user_id = 0
+    while True:
+        # Plain rows of just the scored columns; no ORM objects to build or track
+        query = (
+            _profile_query()
+            .where(UserOnboarding.user_id > last_user_id)
+            .order_by(UserOnboarding.user_id)
+            .limit(batch_size)
+        )
+        onboardings = list((await db.execute(query)).mappings().all())
+        if not onboardings:
+            break
+        last_user_id = onboardings[-1]["user_id"]
+        if stale_only:
+            stored = await db.execute(
+                select(UserRecommendation.user_id, UserRecommendation.onboarding_version).where(
+                    UserRecommendation.user_id.in_([o["user_id"] for o in onboardings]),
+                    UserRecommendation.catalog_version == engine.version,
+                )
+            )
+            current = {(user_id, version) for user_id, version in stored}
+            onboardings = [o for o in onboardings if (o["user_id"], o["version"]) not in current]
+        results = engine.recommend_many(await _profiles(db, onboardings))
+        await _save(db, [_row(o["user_id"], o["version"], r) for o, r in zip(onboardings, results)])
+        await db.commit()
+        total += len(onboardings)
+    return total
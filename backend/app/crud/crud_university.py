@@ -1,28 +1,152 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import changes, response_cache
+from app.crud import crud_analytics
 from app.models.university import UserUniversity, UniversityStatus
+from app.models.user import User
 
-def get_user_universities(db: Session, user_id: int) -> List[UserUniversity]:
-    return db.query(UserUniversity).filter(UserUniversity.user_id == user_id).all()
+async def get_version(db: AsyncSession, user_id: int) -> int:
+    """Current selections version for the user (a primary-key lookup)."""
+    result = await db.execute(select(User.selections_version).where(User.id == user_id))
+    return result.scalar() or 0
 
-def get_user_university(db: Session, user_id: int, university_id: str) -> Optional[UserUniversity]:
-    return db.query(UserUniversity).filter(
+async def _bump_version(db: AsyncSession, user_id: int) -> int:
+    """Increment the user's selections version and return the new value."""
+    stmt = (
+        update(User)
+        .where(User.id == user_id)
+        .values(selections_version=User.selections_version + 1)
+    )
+    if db.get_bind().dialect.update_returning:
+        return (await db.execute(stmt.returning(User.selections_version))).scalar() or 0
+    await db.execute(stmt)
+    return await get_version(db, user_id)
+
+async def _bump_and_notify(db: AsyncSession, user_id: int, changed: Dict[str, Optional[UniversityStatus]]) -> None:
+    """Bump the version and queue a change event for the user's streams (sent on commit)."""
+    version = await _bump_version(db, user_id)
+    await changes.notify(db, user_id, version, changed)
+
+async def _invalidate(user_id: int) -> None:
+    """Drop the cached GET /universities/ body; call after committing a change."""
+    await response_cache.invalidate(user_id, response_cache.UNIVERSITIES)
+
+async def get_user_universities(db: AsyncSession, user_id: int) -> List[UserUniversity]:
+    result = await db.execute(select(UserUniversity).where(UserUniversity.user_id == user_id))
+    return list(result.scalars().all())
+
+async def get_user_university(db: AsyncSession, user_id: int, university_id: str) -> Optional[UserUniversity]:
+    result = await db.execute(
+        select(UserUniversity).where(
+            UserUniversity.user_id == user_id,
+            UserUniversity.university_id == university_id
+        )
+    )
+    return result.scalars().first()
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+async def _current_statuses(db: AsyncSession, user_id: int, university_ids: Iterable[str]) -> Dict[str, UniversityStatus]:
+    """Statuses of existing selections, rows locked on Postgres until commit."""
+    university_ids = list(university_ids)
+    if not university_ids:
+        return {}
+    result = await db.execute(
+        select(UserUniversity.university_id, UserUniversity.status)
+        .where(UserUniversity.user_id == user_id, UserUniversity.university_id.in_(university_ids))
+        .with_for_update()
+    )
+    return dict(result.all())
+
+async def _upsert(
+    db: AsyncSession, insert, user_id: int, selections: Dict[str, UniversityStatus]
+) -> Dict[str, Optional[UniversityStatus]]:
+    """
+    Write selections (university_id -> status) and return each one's previous
+    status (None = created here), for the rollup deltas. Both come from the
+    writes themselves: the INSERT reports the rows it created, and the rows it
+    skipped already exist, so they are locked before being read and updated.
+    Racing writers of the same selection therefore see each other's result.
+    """
+    before: Dict[str, Optional[UniversityStatus]] = {}
+    pending = dict(selections)
+    while pending:
+        stmt = insert(UserUniversity).values([
+            {"user_id": user_id, "university_id": university_id, "status": status}
+            for university_id, status in pending.items()
+        ])
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[UserUniversity.user_id, UserUniversity.university_id],
+        ).returning(UserUniversity.university_id)
+        for university_id in (await db.execute(stmt)).scalars():
+            before[university_id] = None
+            del pending[university_id]
+        updates: Dict[UniversityStatus, List[str]] = {}
+        for university_id, old_status in (await _current_statuses(db, user_id, pending)).items():
+            before[university_id] = old_status
+            status = pending.pop(university_id)
+            if old_status != status:
+                updates.setdefault(status, []).append(university_id)
+        for status, university_ids in updates.items():
+            await db.execute(
+                update(UserUniversity)
+                .where(UserUniversity.user_id == user_id, UserUniversity.university_id.in_(university_ids))
+                .values(status=status)
+            )
+        # Anything still pending was deleted between the two statements; insert it again
+    return before
+
+async def _delete(db: AsyncSession, user_id: int, university_ids: Iterable[str]) -> Dict[str, UniversityStatus]:
+    """Remove selections; returns the status of each row this statement deleted."""
+    university_ids = list(university_ids)
+    if not university_ids:
+        return {}
+    stmt = delete(UserUniversity).where(
         UserUniversity.user_id == user_id,
-        UserUniversity.university_id == university_id
-    ).first()
+        UserUniversity.university_id.in_(university_ids),
+    )
+    if db.get_bind().dialect.delete_returning:
+        result = await db.execute(stmt.returning(UserUniversity.university_id, UserUniversity.status))
+        return dict(result.all())
+    before = await _current_statuses(db, user_id, university_ids)
+    await db.execute(stmt)
+    return before
 
-def update_university_status(
-    db: Session, 
+async def update_university_status(
+    db: AsyncSession, 
     user_id: int, 
     university_id: str, 
     status: UniversityStatus
 ) -> UserUniversity:
-    existing = get_user_university(db, user_id, university_id)
+    dialect = db.get_bind().dialect
+    insert = _UPSERT_INSERTS.get(dialect.name)
+    if insert is not None and dialect.insert_returning:
+        # Atomic on the (user_id, university_id) unique index, so a web click and
+        # a voice command racing each other can't create duplicate rows
+        before = await _upsert(db, insert, user_id, {university_id: status})
+        await crud_analytics.record_changes(db, user_id, before, {university_id: status})
+        await _bump_and_notify(db, user_id, {university_id: status})
+        result = await db.execute(
+            select(UserUniversity)
+            .where(UserUniversity.user_id == user_id, UserUniversity.university_id == university_id)
+            .execution_options(populate_existing=True)
+        )
+        selection = result.scalars().one()
+        await db.commit()
+        await _invalidate(user_id)
+        return selection
+
+    existing = await get_user_university(db, user_id, university_id)
     
     if existing:
+        await crud_analytics.record_changes(db, user_id, {university_id: existing.status}, {university_id: status})
         existing.status = status
-        db.commit()
-        db.refresh(existing)
+        await _bump_and_notify(db, user_id, {university_id: status})
+        await db.commit()
+        await _invalidate(user_id)
+        await db.refresh(existing)
         return existing
     else:
         new_selection = UserUniversity(
@@ -31,14 +155,63 @@ def update_university_status(
             status=status
         )
         db.add(new_selection)
-        db.commit()
-        db.refresh(new_selection)
+        await crud_analytics.record_changes(db, user_id, {}, {university_id: status})
+        await _bump_and_notify(db, user_id, {university_id: status})
+        await db.commit()
+        await _invalidate(user_id)
+        await db.refresh(new_selection)
         return new_selection
 
-def remove_university(db: Session, user_id: int, university_id: str) -> bool:
-    existing = get_user_university(db, user_id, university_id)
-    if existing:
-        db.delete(existing)
-        db.commit()
+async def remove_university(db: AsyncSession, user_id: int, university_id: str) -> bool:
+    before = await _delete(db, user_id, [university_id])
+    if before:
+        await crud_analytics.record_changes(db, user_id, before, {})
+        await _bump_and_notify(db, user_id, {university_id: None})
+        await db.commit()
+        await _invalidate(user_id)
         return True
     return False
+
+async def apply_batch(
+    db: AsyncSession,
+    user_id: int,
+    selections: Dict[str, UniversityStatus],
+    remove: Iterable[str] = (),
+) -> List[UserUniversity]:
+    """
+    Upsert many selections and remove others in a single transaction, then
+    return the user's resulting list. selections maps university_id -> status.
+    """
+    remove = [university_id for university_id in remove if university_id not in selections]
+    before = await _delete(db, user_id, remove)
+    if selections:
+        dialect = db.get_bind().dialect
+        insert = _UPSERT_INSERTS.get(dialect.name)
+        if insert is not None and dialect.insert_returning:
+            before.update(await _upsert(db, insert, user_id, selections))
+        else:
+            existing = {
+                selection.university_id: selection
+                for selection in await get_user_universities(db, user_id)
+            }
+            for university_id, status in selections.items():
+                if university_id in existing:
+                    before[university_id] = existing[university_id].status
+                    existing[university_id].status = status
+                else:
+                    db.add(UserUniversity(user_id=user_id, university_id=university_id, status=status))
+            await db.flush()
+    if selections or remove:
+        await crud_analytics.record_changes(db, user_id, before, selections)
+        await _bump_and_notify(db, user_id, {**dict.fromkeys(remove), **selections})
+    result = await db.execute(
+        select(UserUniversity)
+        .where(UserUniversity.user_id == user_id)
+        .order_by(UserUniversity.id)
+        .execution_options(populate_existing=True)
+    )
+    rows = list(result.scalars().all())
+    await db.commit()
+    if selections or remove:
+        await _invalidate(user_id)
+    return rows
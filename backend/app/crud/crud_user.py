@@ -1,27 +1,44 @@
 from typing import Optional
-from sqlalchemy.orm import Session
-from app.core.security import get_password_hash, verify_password
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from app.core import auth_cache, hashing, response_cache
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
-def create_user(db: Session, *, obj_in: UserCreate) -> User:
+async def get(db: AsyncSession, user_id: int) -> Optional[User]:
+    return await db.get(User, user_id)
+
+async def get_with_profile(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Load a user with onboarding (joined) and selections (one IN query): 2 statements."""
+    result = await db.execute(
+        select(User)
+        .where(User.id == user_id)
+        .options(joinedload(User.onboarding), selectinload(User.universities))
+    )
+    return result.scalars().first()
+
+async def create_user(db: AsyncSession, *, obj_in: UserCreate) -> User:
     db_obj = User(
         email=obj_in.email,
-        hashed_password=get_password_hash(obj_in.password),
+        hashed_password=await hashing.get_password_hash(obj_in.password),
         full_name=obj_in.full_name,
     )
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    auth_cache.invalidate_user(db_obj.id)
+    await response_cache.invalidate(db_obj.id, response_cache.ME)
     return db_obj
 
-def authenticate(db: Session, *, email: str, password: str) -> Optional[User]:
-    user = get_user_by_email(db, email=email)
+async def authenticate(db: AsyncSession, *, email: str, password: str) -> Optional[User]:
+    user = await get_user_by_email(db, email=email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await hashing.verify_password(password, user.hashed_password):
         return None
     return user
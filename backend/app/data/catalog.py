@@ -0,0 +1,288 @@
+"""
+Structured university catalog loaded from universities.json.
+The catalog is immutable and indexed once at import time (by country, field,
+fee band, acceptance tier and tag, plus every sort order) so searches and
+pages touch only the matching entries.
+It has no settings or database dependencies, so the voice agent can load it too.
+"""
+import hashlib
+import json
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+DATA_PATH = Path(__file__).with_name("universities.json")
+
+ACCEPTANCE_TIERS = ("low", "medium", "high")
+
+# Sort key per ordering; the id is always last so keys are unique and usable as keyset cursors
+SORT_KEYS = {
+    "name": lambda u: (u.name.lower(), u.id),
+    "fee": lambda u: (u.fee_usd, u.id),
+    "acceptance": lambda u: (ACCEPTANCE_TIERS.index(u.acceptance), u.id),
+    "country": lambda u: (u.country.lower(), u.name.lower(), u.id),
+}
+
+# Below this share of the catalog, page() bisects the candidates' sorted ranks
+# instead of walking the full ordering and skipping non-candidates
+SPARSE_CANDIDATES = 0.25
+
+# Upper bounds (USD) of the fee bands used by the fee index; the last band is open
+FEE_BANDS = (20000, 30000, 40000, 50000)
+
+COUNTRY_ALIASES = {
+    "us": "USA",
+    "usa": "USA",
+    "united states": "USA",
+    "united states of america": "USA",
+    "america": "USA",
+    "uk": "UK",
+    "united kingdom": "UK",
+    "great britain": "UK",
+    "britain": "UK",
+    "england": "UK",
+    "scotland": "UK",
+    "canada": "Canada",
+    "australia": "Australia",
+}
+
+
+@dataclass(frozen=True)
+class University:
+    id: str
+    name: str
+    country: str
+    city: str
+    fields: Tuple[str, ...]
+    fee_usd: int
+    acceptance: str
+    tags: Tuple[str, ...]
+    description: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["fields"] = list(self.fields)
+        data["tags"] = list(self.tags)
+        return data
+
+
+def _key(value: str) -> str:
+    return " ".join(value.lower().replace("-", " ").split())
+
+
+def normalize_country(value: str) -> str:
+    """Map "United States", "us", "England"... to the catalog's country names."""
+    return COUNTRY_ALIASES.get(_key(value), value.strip())
+
+
+def fee_band(fee_usd: int) -> int:
+    for i, bound in enumerate(FEE_BANDS):
+        if fee_usd < bound:
+            return i
+    return len(FEE_BANDS)
+
+
+@dataclass(frozen=True)
+class CatalogPage:
+    items: List[University]
+    total: int
+    # Sort key of the last item, to pass back as the cursor of the next page
+    next_key: Optional[Tuple[Any, ...]]
+
+
+class Catalog:
+    def __init__(self, universities: Iterable[University], version: str = ""):
+        # Content hash of the source data; changes only when the dataset does
+        self.version = version
+        # Sorted by fee so index lookups come back cheapest first
+        self.universities: Tuple[University, ...] = tuple(
+            sorted(universities, key=lambda u: (u.fee_usd, u.id))
+        )
+        self.by_id: Dict[str, University] = {u.id: u for u in self.universities}
+        self.by_country: Dict[str, FrozenSet[str]] = self._index(lambda u: [_key(u.country)])
+        self.by_field: Dict[str, FrozenSet[str]] = self._index(lambda u: [_key(f) for f in u.fields])
+        self.by_fee_band: Dict[int, FrozenSet[str]] = self._index(lambda u: [fee_band(u.fee_usd)])
+        self.by_acceptance: Dict[str, FrozenSet[str]] = self._index(lambda u: [u.acceptance])
+        self.by_tag: Dict[str, FrozenSet[str]] = self._index(lambda u: [_key(t) for t in u.tags])
+        # Words of the name, city and tags, for free-text queries
+        self.words: Dict[str, FrozenSet[str]] = {
+            u.id: frozenset(_key(" ".join((u.name, u.city, *u.tags))).replace(",", " ").split())
+            for u in self.universities
+        }
+        # Every supported ordering, precomputed: (sorted keys, ids in that order),
+        # and each id's position in it
+        self.orders: Dict[str, Tuple[Tuple[Tuple[Any, ...], ...], Tuple[str, ...]]] = {}
+        self.ranks: Dict[str, Dict[str, int]] = {}
+        for name, sort_key in SORT_KEYS.items():
+            ordered = sorted(self.universities, key=sort_key)
+            self.orders[name] = (tuple(sort_key(u) for u in ordered), tuple(u.id for u in ordered))
+            self.ranks[name] = {u.id: position for position, u in enumerate(ordered)}
+
+    def _index(self, keys) -> Dict[Any, FrozenSet[str]]:
+        index: Dict[Any, set] = {}
+        for university in self.universities:
+            for key in keys(university):
+                index.setdefault(key, set()).add(university.id)
+        return {key: frozenset(ids) for key, ids in index.items()}
+
+    def __len__(self) -> int:
+        return len(self.universities)
+
+    def get(self, university_id: str) -> Optional[University]:
+        return self.by_id.get(university_id)
+
+    def countries(self) -> List[str]:
+        return sorted({u.country for u in self.universities})
+
+    def fields(self) -> List[str]:
+        return sorted({f for u in self.universities for f in u.fields})
+
+    def match(
+        self,
+        *,
+        countries: Sequence[str] = (),
+        fields: Sequence[str] = (),
+        acceptance: Sequence[str] = (),
+        min_fee: Optional[int] = None,
+        max_fee: Optional[int] = None,
+    ) -> Optional[FrozenSet[str]]:
+        """
+        Ids matching every given filter (any of the values within one filter),
+        resolved from the indexes. None means no filter was given.
+        """
+        candidates: Optional[FrozenSet[str]] = None
+
+        def narrow(ids: Iterable[str]) -> None:
+            nonlocal candidates
+            ids = frozenset(ids)
+            candidates = ids if candidates is None else candidates & ids
+
+        if countries:
+            narrow(uid for c in countries for uid in self.by_country.get(_key(normalize_country(c)), ()))
+        if fields:
+            narrow(uid for f in fields for uid in self.by_field.get(_key(f), ()))
+        if acceptance:
+            narrow(uid for a in acceptance for uid in self.by_acceptance.get(a.strip().lower(), ()))
+        if max_fee is not None or min_fee is not None:
+            low = fee_band(min_fee) if min_fee is not None else 0
+            high = fee_band(max_fee) if max_fee is not None else len(FEE_BANDS)
+            narrow(
+                uid
+                for band in range(low, high + 1)
+                for uid in self.by_fee_band.get(band, ())
+                if (max_fee is None or self.by_id[uid].fee_usd <= max_fee)
+                and (min_fee is None or self.by_id[uid].fee_usd >= min_fee)
+            )
+        return candidates
+
+    def search(
+        self,
+        *,
+        country: Optional[str] = None,
+        field: Optional[str] = None,
+        max_fee: Optional[int] = None,
+        min_fee: Optional[int] = None,
+        acceptance: Optional[str] = None,
+        query: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[University]:
+        """
+        Filter by any combination of criteria, cheapest first. `query` matches tags,
+        name and city; entries matching more query words rank higher.
+        """
+        candidates = self.match(
+            countries=[country] if country else (),
+            fields=[field] if field else (),
+            acceptance=[acceptance] if acceptance else (),
+            min_fee=min_fee,
+            max_fee=max_fee,
+        )
+        if candidates is None:
+            results = list(self.universities)
+        else:
+            results = [u for u in self.universities if u.id in candidates]
+
+        words = _key(query).split() if query else []
+        if words:
+            scored = []
+            for university in results:
+                score = sum(1 for word in words if word in self.words[university.id])
+                if score:
+                    scored.append((-score, university))
+            scored.sort(key=lambda item: item[0])
+            results = [university for _, university in scored]
+
+        return results[:limit] if limit else results
+
+    def page(
+        self,
+        candidates: Optional[FrozenSet[str]],
+        *,
+        sort: str = "name",
+        descending: bool = False,
+        after: Optional[Tuple[Any, ...]] = None,
+        limit: int = 20,
+    ) -> CatalogPage:
+        """
+        Keyset pagination over a precomputed ordering: `after` is the sort key of
+        the previous page's last item, located by bisection, so pages stay stable
+        even if the dataset changes between requests. A small candidate set is
+        paged through its own positions in the ordering (sorted, then bisected),
+        so the cost follows the matches rather than the catalog.
+        """
+        keys, ids = self.orders[sort]
+        # This page starts after `after`: positions [start, len) ascending, or below `end` descending
+        if descending:
+            end = bisect_left(keys, after) if after is not None else len(ids)
+        else:
+            start = bisect_right(keys, after) if after is not None else 0
+        # `walk_filter` is what the loop below still has to skip non-members of
+        walk_filter = candidates
+        if candidates is not None and len(candidates) < len(ids) * SPARSE_CANDIDATES:
+            ranks = sorted(self.ranks[sort][uid] for uid in candidates)
+            if descending:
+                positions = reversed(ranks[: bisect_left(ranks, end)])
+            else:
+                positions = ranks[bisect_left(ranks, start):]
+            walk_filter = None
+        elif descending:
+            positions = range(end - 1, -1, -1)
+        else:
+            positions = range(start, len(ids))
+
+        items: List[University] = []
+        last = None
+        for position in positions:
+            if walk_filter is not None and ids[position] not in walk_filter:
+                continue
+            if len(items) == limit:
+                return CatalogPage(items, self._count(candidates), keys[last])
+            items.append(self.by_id[ids[position]])
+            last = position
+        return CatalogPage(items, self._count(candidates), None)
+
+    def _count(self, candidates: Optional[FrozenSet[str]]) -> int:
+        return len(self.universities) if candidates is None else len(candidates)
+
+
+def load_catalog(path: Path = DATA_PATH) -> Catalog:
+    raw = path.read_bytes()
+    universities = [
+        University(
+            id=row["id"],
+            name=row["name"],
+            country=row["country"],
+            city=row.get("city", ""),
+            fields=tuple(row.get("fields", ())),
+            fee_usd=int(row["fee_usd"]),
+            acceptance=row["acceptance"].lower(),
+            tags=tuple(row.get("tags", ())),
+            description=row.get("description", ""),
+        )
+        for row in json.loads(raw)
+    ]
+    return Catalog(universities, version=hashlib.sha256(raw).hexdigest()[:16])
+
+
+catalog = load_catalog()
@@ -0,0 +1,262 @@
+"""
+Parsers that turn the free-text onboarding answers into comparable numbers:
+GPA on a 4.0 scale, English / graduate test scores with their exam type,
+a yearly budget range in USD and a list of catalog country names.
+crud_onboarding stores the results at write time; the voice agent, which
+reads the raw text, parses on the fly. Like the catalog, this has no settings
+or database dependencies.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Tuple
+
+from app.data.catalog import normalize_country
+
+_NUMBER = r"\d+(?:,\d{3})*(?:\.\d+)?"
+_NUMBER_RE = re.compile(_NUMBER)
+_WORD_RE = re.compile(r"[a-z]+")
+_RATIO_RE = re.compile(rf"({_NUMBER})\s*(?:/|out of)\s*({_NUMBER})")
+_AMOUNT_RE = re.compile(rf"({_NUMBER})\s*([a-z]*)")
+_BARE_INR_UNIT_RE = re.compile(r"\d\s*(?:l|cr)\b")
+_COUNTRY_SPLIT_RE = re.compile(r"[,;/&|\n]|\band\b", re.IGNORECASE)
+
+# Approximate conversion rates to USD, good enough to compare against tuition fees
+USD_RATES = {
+    "usd": 1.0,
+    "inr": 0.012,
+    "gbp": 1.27,
+    "eur": 1.08,
+    "cad": 0.73,
+    "aud": 0.66,
+}
+_CURRENCY_MARKERS = (
+    ("inr", ("₹", "inr", "rs", "rupee", "rupees", "lakh", "lakhs", "lac", "lacs", "crore", "crores", "cr")),
+    ("gbp", ("£", "gbp", "pound")),
+    ("eur", ("€", "eur", "euro")),
+    ("cad", ("cad", "c$")),
+    ("aud", ("aud", "a$")),
+    ("usd", ("$", "usd", "dollar")),
+)
+_MULTIPLIERS = (
+    (("crore", "crores", "cr"), 10_000_000),
+    (("lakh", "lakhs", "lac", "lacs", "l"), 100_000),
+    (("k",), 1_000),
+    (("m", "million"), 1_000_000),
+)
+
+ENGLISH_EXAMS = ("ielts", "toefl", "pte", "duolingo")
+GRADUATE_EXAMS = ("gre", "gmat")
+
+
+@dataclass(frozen=True)
+class StudentProfile:
+    gpa: Optional[float] = None
+    english_exam: Optional[str] = None
+    english_score: Optional[float] = None
+    english_status: Optional[str] = None
+    test_exam: Optional[str] = None
+    test_score: Optional[float] = None
+    test_status: Optional[str] = None
+    budget_min_usd: Optional[int] = None
+    budget_max_usd: Optional[int] = None
+    countries: Tuple[str, ...] = ()
+    field_of_study: Optional[str] = None
+
+
+def _numbers(text: str):
+    return [float(n.replace(",", "")) for n in _NUMBER_RE.findall(text)]
+
+
+def _words(text: str):
+    return _WORD_RE.findall(text.lower())
+
+
+def parse_gpa(value: Optional[str]) -> Optional[float]:
+    """
+    "3.5", "3.5/4", "8.2 CGPA", "8.2/10", "85%", "85" -> GPA on a 4.0 scale.
+    Bare numbers up to 4.3 are read as 4.0-scale GPAs, up to 10 as 10-point
+    CGPAs and anything larger as a percentage.
+    """
+    if not value:
+        return None
+    text = value.strip().lower()
+    ratio = _RATIO_RE.search(text)
+    if ratio:
+        score, scale = float(ratio.group(1).replace(",", "")), float(ratio.group(2).replace(",", ""))
+        gpa = score / scale * 4.0 if scale else None
+    else:
+        numbers = _numbers(text)
+        if not numbers:
+            return None
+        score = numbers[0]
+        if "%" in text or "percent" in text or score > 10:
+            gpa = score / 100 * 4.0
+        elif score <= 4.3:
+            gpa = score
+        else:
+            gpa = score / 10 * 4.0
+    if gpa is None:
+        return None
+    return round(min(max(gpa, 0.0), 4.0), 2)
+
+
+def _parse_exam(value: Optional[str], exams, guess) -> Tuple[Optional[str], Optional[float]]:
+    if not value:
+        return None, None
+    numbers = _numbers(value)
+    if not numbers:
+        return None, None
+    score = numbers[-1]
+    named = next((exam for exam in exams if exam in _words(value)), None)
+    return named or guess(score), score
+
+
+def _guess_english(score: float) -> Optional[str]:
+    if score <= 9:
+        return "ielts"
+    if score <= 120:
+        return "toefl"
+    return None
+
+
+def _guess_graduate(score: float) -> Optional[str]:
+    if 260 <= score <= 340:
+        return "gre"
+    if 200 <= score <= 800:
+        return "gmat"
+    return None
+
+
+def parse_english_score(value: Optional[str]) -> Tuple[Optional[str], Optional[float]]:
+    """"7.5" -> ("ielts", 7.5); "100" -> ("toefl", 100); "PTE 65" -> ("pte", 65)."""
+    return _parse_exam(value, ENGLISH_EXAMS, _guess_english)
+
+
+def parse_graduate_score(value: Optional[str]) -> Tuple[Optional[str], Optional[float]]:
+    """"320" -> ("gre", 320); "700" -> ("gmat", 700)."""
+    return _parse_exam(value, GRADUATE_EXAMS, _guess_graduate)
+
+
+def _currency(text: str) -> str:
+    words = set(_words(text))
+    for currency, markers in _CURRENCY_MARKERS:
+        for marker in markers:
+            if (marker in words) if marker.isalpha() else (marker in text):
+                return currency
+    # A bare "L" / "Cr" unit ("10-20 L") only makes sense in rupees
+    if _BARE_INR_UNIT_RE.search(text):
+        return "inr"
+    return "usd"
+
+
+def _amounts(text: str):
+    """Numbers in text with their lakh/crore/k multipliers applied."""
+    found = []
+    for match in _AMOUNT_RE.finditer(text):
+        multiplier = next((m for names, m in _MULTIPLIERS if match.group(2) in names), 1)
+        found.append((float(match.group(1).replace(",", "")), multiplier))
+    # "10-20 Lakhs": a unit after the last number applies to the whole range
+    if found and found[-1][1] > 1:
+        found = [(amount, multiplier if multiplier > 1 else found[-1][1]) for amount, multiplier in found]
+    return [amount * multiplier for amount, multiplier in found]
+
+
+def parse_budget(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    "$10,000 - $30,000", "Under $10,000", "$60,000+", "10-20 Lakhs", "£25k"
+    -> (min, max) per year in USD; an open end is None.
+    """
+    if not value:
+        return None, None
+    text = value.strip().lower()
+    amounts = _amounts(text)
+    if not amounts:
+        return None, None
+    rate = USD_RATES[_currency(text)]
+    usd = [int(round(amount * rate)) for amount in amounts]
+    words = set(_words(text))
+    if words & {"under", "below", "less", "upto", "up", "max", "maximum"}:
+        return 0, usd[0]
+    if text.rstrip().endswith("+") or words & {"above", "over", "more", "min", "minimum", "plus"}:
+        return usd[0], None
+    if len(usd) >= 2:
+        return min(usd[:2]), max(usd[:2])
+    return usd[0], usd[0]
+
+
+def parse_countries(value: Optional[str]) -> Tuple[str, ...]:
+    """"USA, UK & canada" -> ("USA", "UK", "Canada") using the catalog's names."""
+    if not value:
+        return ()
+    parts = _COUNTRY_SPLIT_RE.split(value)
+    countries = []
+    for part in parts:
+        part = part.strip(" .")
+        if part:
+            country = normalize_country(part)
+            if country not in countries:
+                countries.append(country)
+    return tuple(countries)
+
+
+def normalized_columns(data: Mapping[str, Any]) -> dict:
+    """
+    Normalized user_onboarding column values for whichever free-text fields
+    appear in data (a partial update only recomputes what it changes).
+    preferred_countries is returned as a tuple under "countries".
+    """
+    columns = {}
+    if "gpa_or_percentage" in data:
+        columns["gpa_normalized"] = parse_gpa(data["gpa_or_percentage"])
+    if "ielts_toefl_score" in data:
+        columns["english_exam"], columns["english_score"] = parse_english_score(data["ielts_toefl_score"])
+    if "gre_gmat_score" in data:
+        columns["graduate_exam"], columns["graduate_score"] = parse_graduate_score(data["gre_gmat_score"])
+    if "budget_range_per_year" in data:
+        columns["budget_min_usd"], columns["budget_max_usd"] = parse_budget(data["budget_range_per_year"])
+    if "preferred_countries" in data:
+        columns["countries"] = parse_countries(data["preferred_countries"])
+    return columns
+
+
+def _get(row: Any, name: str):
+    if isinstance(row, Mapping):
+        return row.get(name)
+    return getattr(row, name, None)
+
+
+def profile_from_normalized(row: Any, countries: Tuple[str, ...] = ()) -> StudentProfile:
+    """StudentProfile from the stored normalized columns; no parsing."""
+    return StudentProfile(
+        gpa=_get(row, "gpa_normalized"),
+        english_exam=_get(row, "english_exam"),
+        english_score=_get(row, "english_score"),
+        english_status=_get(row, "ielts_toefl_status"),
+        test_exam=_get(row, "graduate_exam"),
+        test_score=_get(row, "graduate_score"),
+        test_status=_get(row, "gre_gmat_status"),
+        budget_min_usd=_get(row, "budget_min_usd"),
+        budget_max_usd=_get(row, "budget_max_usd"),
+        countries=tuple(countries),
+        field_of_study=_get(row, "field_of_study"),
+    )
+
+
+def profile_from_onboarding(row: Any) -> StudentProfile:
+    """Build a StudentProfile by parsing a UserOnboarding row, schema or plain dict."""
+    english_exam, english_score = parse_english_score(_get(row, "ielts_toefl_score"))
+    test_exam, test_score = parse_graduate_score(_get(row, "gre_gmat_score"))
+    budget_min, budget_max = parse_budget(_get(row, "budget_range_per_year"))
+    return StudentProfile(
+        gpa=parse_gpa(_get(row, "gpa_or_percentage")),
+        english_exam=english_exam,
+        english_score=english_score,
+        english_status=_get(row, "ielts_toefl_status"),
+        test_exam=test_exam,
+        test_score=test_score,
+        test_status=_get(row, "gre_gmat_status"),
+        budget_min_usd=budget_min,
+        budget_max_usd=budget_max,
+        countries=parse_countries(_get(row, "preferred_countries")),
+        field_of_study=_get(row, "field_of_study"),
+    )
@@ -0,0 +1,199 @@
+"""
+Deterministic Dream / Target / Safe recommendations.
+A profile's academic strength (GPA, English test, GRE/GMAT, each scaled to 0..1)
+is compared with every university's selectivity at once as NumPy arrays:
+margin = strength - selectivity decides the category, and the ranking within a
+category prefers small margins (the most ambitious safe school, the most
+reachable dream school), preferred countries and fees within budget.
+recommend_many scores any number of profiles as one (profiles x universities)
+matrix, which is what the batch recompute uses.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.data.catalog import Catalog, catalog as default_catalog
+from app.data.profile import StudentProfile
+
+CATEGORIES = ("dream", "target", "safe")
+
+# How hard a university is to get into, per acceptance tier (0..1, same scale as strength)
+TIER_SELECTIVITY = {"low": 0.8, "medium": 0.55, "high": 0.3}
+
+# Score ranges mapped linearly to 0..1 strength
+GPA_RANGE = (2.5, 4.0)
+EXAM_RANGES = {
+    "ielts": (5.5, 8.0),
+    "toefl": (70.0, 115.0),
+    "pte": (50.0, 85.0),
+    "duolingo": (95.0, 145.0),
+    "gre": (295.0, 335.0),
+    "gmat": (550.0, 750.0),
+}
+WEIGHTS = {"gpa": 0.5, "english": 0.25, "test": 0.25}
+# Used when a profile has no parsable GPA or scores at all
+UNKNOWN_STRENGTH = 0.5
+# Most programs require an English test; not having one counts against the profile
+MISSING_ENGLISH_PENALTY = 0.05
+
+# margin < DREAM_BELOW is a dream school, margin > SAFE_ABOVE a safe one, target in between
+DREAM_BELOW = -0.1
+SAFE_ABOVE = 0.15
+# Fees up to this fraction over the budget are still suggested (and flagged)
+BUDGET_STRETCH = 0.25
+
+COUNTRY_BONUS = 0.2
+FIELD_BONUS = 0.05
+
+
+@dataclass(frozen=True)
+class Recommendation:
+    university_id: str
+    category: str
+    score: float
+    # strength - selectivity; negative is a reach
+    margin: float
+    within_budget: bool
+    preferred_country: bool
+
+    def to_dict(self) -> Dict:
+        # Spelled out: dataclasses.asdict deep-copies and dominates the batch recompute
+        return {
+            "university_id": self.university_id,
+            "category": self.category,
+            "score": self.score,
+            "margin": self.margin,
+            "within_budget": self.within_budget,
+            "preferred_country": self.preferred_country,
+        }
+
+
+@dataclass
+class RecommendationSet:
+    strength: float
+    dream: List[Recommendation] = field(default_factory=list)
+    target: List[Recommendation] = field(default_factory=list)
+    safe: List[Recommendation] = field(default_factory=list)
+
+    def all(self) -> List[Recommendation]:
+        return [*self.dream, *self.target, *self.safe]
+
+
+def _scale(value: Optional[float], bounds) -> Optional[float]:
+    if value is None:
+        return None
+    low, high = bounds
+    return min(max((value - low) / (high - low), 0.0), 1.0)
+
+
+def _exam(exam: Optional[str], score: Optional[float]) -> Optional[float]:
+    bounds = EXAM_RANGES.get(exam or "")
+    return _scale(score, bounds) if bounds else None
+
+
+def strength(profile: StudentProfile) -> float:
+    """Weighted 0..1 academic strength from whichever scores the profile has."""
+    parts = {
+        "gpa": _scale(profile.gpa, GPA_RANGE),
+        "english": _exam(profile.english_exam, profile.english_score),
+        "test": _exam(profile.test_exam, profile.test_score),
+    }
+    present = {name: value for name, value in parts.items() if value is not None}
+    if not present:
+        value = UNKNOWN_STRENGTH
+    else:
+        value = sum(WEIGHTS[name] * v for name, v in present.items()) / sum(WEIGHTS[name] for name in present)
+    if parts["english"] is None:
+        value -= MISSING_ENGLISH_PENALTY
+    return min(max(value, 0.0), 1.0)
+
+
+class RecommendationEngine:
+    def __init__(self, catalog: Catalog):
+        self.catalog = catalog
+        universities = catalog.universities
+        self.ids = [u.id for u in universities]
+        self.fees = np.array([u.fee_usd for u in universities], dtype=np.float64)
+        self.selectivity = np.array([TIER_SELECTIVITY[u.acceptance] for u in universities])
+        self.countries = sorted({u.country for u in universities})
+        country_index = {country: i for i, country in enumerate(self.countries)}
+        # (universities x countries) one-hot
+        self.country_onehot = np.zeros((len(universities), len(self.countries)), dtype=np.float64)
+        for i, u in enumerate(universities):
+            self.country_onehot[i, country_index[u.country]] = 1.0
+        self._country_index = country_index
+        self._position = {uid: i for i, uid in enumerate(self.ids)}
+
+    @property
+    def version(self) -> str:
+        return self.catalog.version
+
+    def _field_matches(self, profile: StudentProfile) -> np.ndarray:
+        matches = np.zeros(len(self.ids))
+        if profile.field_of_study:
+            for uid in self.catalog.match(fields=[profile.field_of_study]) or ():
+                matches[self._position[uid]] = 1.0
+        return matches
+
+    def recommend_many(
+        self, profiles: Sequence[StudentProfile], limit: int = 3
+    ) -> List[RecommendationSet]:
+        """Score every profile against every university in one pass."""
+        if not profiles:
+            return []
+        m = len(profiles)
+        strengths = np.array([strength(p) for p in profiles])
+        budgets = np.array(
+            [p.budget_max_usd if p.budget_max_usd else np.inf for p in profiles], dtype=np.float64
+        )
+        preferred = np.zeros((m, len(self.countries)))
+        for row, profile in enumerate(profiles):
+            for country in profile.countries:
+                if country in self._country_index:
+                    preferred[row, self._country_index[country]] = 1.0
+        fields = np.stack([self._field_matches(p) for p in profiles])
+
+        # Rounded so profiles sitting exactly on a threshold aren't split by float noise
+        margin = np.round(strengths[:, None] - self.selectivity[None, :], 6)
+        over_budget = np.maximum(self.fees[None, :] / budgets[:, None] - 1.0, 0.0)
+        country_match = (preferred @ self.country_onehot.T) > 0
+        # Preferences naming no catalog country don't restrict anything
+        has_preference = preferred.any(axis=1)[:, None]
+        eligible = (~has_preference | country_match) & (over_budget <= BUDGET_STRETCH)
+
+        score = (
+            1.0
+            - np.abs(margin)
+            - over_budget
+            + COUNTRY_BONUS * (country_match & has_preference)
+            + FIELD_BONUS * fields
+        )
+        category = np.where(margin < DREAM_BELOW, 0, np.where(margin > SAFE_ABOVE, 2, 1))
+
+        results = [RecommendationSet(strength=round(float(s), 3)) for s in strengths]
+        for index, name in enumerate(CATEGORIES):
+            ranked = np.where(eligible & (category == index), score, -np.inf)
+            order = np.argsort(-ranked, axis=1, kind="stable")[:, :limit]
+            for row in range(m):
+                picks = getattr(results[row], name)
+                for col in order[row]:
+                    if ranked[row, col] == -np.inf:
+                        break
+                    picks.append(
+                        Recommendation(
+                            university_id=self.ids[col],
+                            category=name,
+                            score=round(float(score[row, col]), 3),
+                            margin=round(float(margin[row, col]), 3),
+                            within_budget=bool(over_budget[row, col] == 0),
+                            preferred_country=bool(country_match[row, col]),
+                        )
+                    )
+        return results
+
+    def recommend(self, profile: StudentProfile, limit: int = 3) -> RecommendationSet:
+        return self.recommend_many([profile], limit)[0]
+
+
+engine = RecommendationEngine(default_catalog)
@@ -1,4 +1,6 @@
 from app.db.session import Base  # noqa
 from app.models.user import User  # noqa
 from app.models.university import UserUniversity  # noqa
-from app.models.onboarding import UserOnboarding  # noqa
+from app.models.onboarding import UserOnboarding, UserPreferredCountry  # noqa
+from app.models.recommendation import UserRecommendation  # noqa
+from app.models.analytics import UniversitySelectionCount  # noqa
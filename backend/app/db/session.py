@@ -1,5 +1,12 @@
-from sqlalchemy import create_engine
+import math
+import time
+from typing import Any, Dict, Optional, Tuple
+from fastapi import Depends, Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from app.core import instrumentation
 from app.core.config import settings
 
 engine = create_engine(settings.DATABASE_URL,pool_pre_ping=True,
@@ -8,9 +15,118 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+
+def async_database_url(url: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Map a sync DATABASE_URL to its async driver (asyncpg / aiosqlite).
+    asyncpg does not understand libpq's sslmode, so it is moved to connect_args.
+    """
+    parsed = make_url(url)
+    connect_args: Dict[str, Any] = {}
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        query = dict(parsed.query)
+        sslmode = query.pop("sslmode", None)
+        if sslmode and sslmode != "disable":
+            connect_args["ssl"] = sslmode
+        parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False), connect_args
+
+
+def _create_async_engine(url: str):
+    async_url, connect_args = async_database_url(url)
+    return create_async_engine(
+        async_url,
+        connect_args=connect_args,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        **(
+            {
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                **({"poolclass": instrumentation.TimedAsyncQueuePool} if settings.METRICS_ENABLED else {}),
+            }
+            if not async_url.startswith("sqlite")
+            else {}
+        ),
+    )
+
+
+async_engine = _create_async_engine(settings.ASYNC_DATABASE_URL or settings.DATABASE_URL)
+# Read-only GETs (get_async_read_db) go here when a replica is configured
+replica_async_engine = (
+    _create_async_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else None
+)
+if settings.METRICS_ENABLED:
+    instrumentation.instrument_engine(engine)
+    instrumentation.instrument_engine(async_engine.sync_engine)
+    if replica_async_engine is not None:
+        instrumentation.instrument_engine(
+            replica_async_engine.sync_engine, instrumentation.DB_REPLICA_POOL_CHECKED_OUT
+        )
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+ReplicaSessionLocal: Optional[async_sessionmaker] = (
+    async_sessionmaker(replica_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    if replica_async_engine is not None
+    else None
+)
+
+# Set on responses to requests that committed; the client's reads skip the replica until it expires
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
+
+def pin_to_primary(response: Response) -> None:
+    until = time.time() + settings.READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        key=PRIMARY_PIN_COOKIE,
+        value=f"{until:.3f}",
+        max_age=math.ceil(settings.READ_YOUR_WRITES_SECONDS),
+        httponly=True,
+        samesite=settings.COOKIE_SAMESITE,
+        secure=settings.COOKIE_SECURE,
+    )
+
+
+def pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, "")) > time.time()
+    except ValueError:
+        return False
+
+
+def is_replica(db: AsyncSession) -> bool:
+    return replica_async_engine is not None and db.bind is replica_async_engine
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(response: Response):
+    """Primary session; a commit pins the client to the primary for READ_YOUR_WRITES_SECONDS."""
+    async with AsyncSessionLocal() as db:
+        if ReplicaSessionLocal is not None:
+            event.listen(db.sync_session, "after_commit", lambda session: pin_to_primary(response), once=True)
+        yield db
+
+
+async def get_async_read_db(request: Request, primary: AsyncSession = Depends(get_async_db)):
+    """
+    Session for read-only dependencies: the replica when one is configured,
+    unless the client wrote recently (see pin_to_primary). Never commit on it.
+    Otherwise this is the request's own get_async_db session, so an endpoint
+    using both holds a single primary connection.
+    """
+    if ReplicaSessionLocal is None or pinned_to_primary(request):
+        yield primary
+        return
+    async with ReplicaSessionLocal() as db:
+        yield db
@@ -1,18 +1,27 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
+from app.core import changes, hashing, metrics, response_cache
+from app.core.admission import AdmissionMiddleware
+from app.core.instrumentation import MetricsMiddleware
 from app.core.config import settings
-from app.db.session import engine, Base
+from app.db.session import async_engine, replica_async_engine, Base
 import app.models.user  # noqa: F401
 import app.models.onboarding  # noqa: F401  # register tables for create_all
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
-from app.db.session import get_db
+from app.db.session import get_async_db
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
 )
 
+# Added first so it runs inside CORS: shed requests still carry CORS headers
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+
 # With credentials (cookies), browsers reject "*". Use explicit origins.
 origins = [o.strip() for o in settings.BACKEND_CORS_ORIGINS.split(",") if o.strip()]
 app.add_middleware(
@@ -22,15 +31,47 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+
+@app.exception_handler(hashing.PasswordHashingBusy)
+def password_hashing_busy(request: Request, exc: hashing.PasswordHashingBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.on_event("startup")
+async def start_pools():
+    await hashing.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_pools():
+    hashing.shutdown()
+    await changes.bus.stop()
+    await response_cache.close()
+    await async_engine.dispose()
+    if replica_async_engine is not None:
+        await replica_async_engine.dispose()
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def read_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health/db")
-def db_health(db: Session = Depends(get_db)):
-    db.execute("SELECT 1")
+async def db_health(db: AsyncSession = Depends(get_async_db)):
+    await db.execute(text("SELECT 1"))
     return {"db": "ok"}
 
 
 @app.get("/")
-def root():
+async def root():
     return {"message": f"Welcome to {settings.PROJECT_NAME} API"}
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String
+from app.db.session import Base
+
+
+class UniversitySelectionCount(Base):
+    """
+    How many students have each university in each status, per target intake
+    year. Kept in step with user_universities by every selection write (see
+    crud_analytics) and rebuilt from scratch by reconcile_selection_counts.py.
+    """
+    __tablename__ = "university_selection_counts"
+
+    university_id = Column(String, primary_key=True)
+    status = Column(String(20), primary_key=True)                  # shortlisted / locked
+    # user_onboarding.target_intake_year; 0 when the student hasn't given one
+    intake_year = Column(Integer, primary_key=True, default=0)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -10,6 +10,13 @@ class UserOnboarding(Base):
     Covers: Academic Background, Study Goal, Budget, Exams & Readiness.
     """
     __tablename__ = "user_onboarding"
+    __table_args__ = (
+        # Eligibility and budget filters on the normalized columns below
+        Index("ix_user_onboarding_gpa_normalized", "gpa_normalized"),
+        Index("ix_user_onboarding_english", "english_exam", "english_score"),
+        Index("ix_user_onboarding_graduate", "graduate_exam", "graduate_score"),
+        Index("ix_user_onboarding_budget", "budget_max_usd", "budget_min_usd"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False, index=True)
@@ -39,7 +46,33 @@ class UserOnboarding(Base):
     gre_gmat_score = Column(String(20), nullable=True)             # e.g. "320" (GRE) or "700" (GMAT) – when status is "taken"
     sop_status = Column(String(50), nullable=True)                 # Not started / Draft / Ready
 
+    # Normalized from the free-text answers above on every write (see crud_onboarding)
+    gpa_normalized = Column(Float, nullable=True)                  # 4.0 scale
+    english_exam = Column(String(20), nullable=True)               # ielts / toefl / pte / duolingo
+    english_score = Column(Float, nullable=True)
+    graduate_exam = Column(String(20), nullable=True)              # gre / gmat
+    graduate_score = Column(Float, nullable=True)
+    budget_min_usd = Column(Integer, nullable=True)                # per year; null = open-ended
+    budget_max_usd = Column(Integer, nullable=True)
+
+    # Bumped on every save; backs the GET /onboarding ETag
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     user = relationship("User", back_populates="onboarding")
+
+
+class UserPreferredCountry(Base):
+    """
+    preferred_countries split into one row per catalog country name, so
+    "students who want the UK" is an indexed lookup instead of a text scan.
+    """
+    __tablename__ = "user_preferred_countries"
+    __table_args__ = (
+        Index("ix_user_preferred_countries_country", "country", "user_id"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    country = Column(String(64), primary_key=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class UserRecommendation(Base):
+    """
+    Last Dream/Target/Safe result per user. Valid while both versions still
+    match the user's onboarding row and the loaded catalog.
+    """
+    __tablename__ = "user_recommendations"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    onboarding_version = Column(Integer, nullable=False)
+    catalog_version = Column(String(32), nullable=False)
+    strength = Column(Float, nullable=False)
+    entries = Column(JSON, nullable=False)                         # [{university_id, category, score, ...}]
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
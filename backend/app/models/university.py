@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 import enum
@@ -9,6 +9,10 @@ class UniversityStatus(str, enum.Enum):
 
 class UserUniversity(Base):
     __tablename__ = "user_universities"
+    __table_args__ = (
+        # One row per (user, university); also serves per-user lookups
+        Index("ix_user_universities_user_id_university_id", "user_id", "university_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, false
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -12,8 +12,12 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean(), default=True)
     is_onboarded = Column(Boolean(), default=False)
+    # Counselling staff: bulk export and analytics endpoints
+    is_admin = Column(Boolean(), nullable=False, default=False, server_default=false())
+    # Bumped on every user_universities write; backs the GET /universities/ ETag
+    selections_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     onboarding = relationship("UserOnboarding", back_populates="user", uselist=False)
-    universities = relationship("UserUniversity", back_populates="user")
+    universities = relationship("UserUniversity", back_populates="user", order_by="UserUniversity.id")
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class UniversitySelectionStats(BaseModel):
+    university_id: str
+    # From the catalog; None for ids the catalog no longer has
+    name: Optional[str] = None
+    country: Optional[str] = None
+    shortlisted: int = 0
+    locked: int = 0
+    total: int = 0
+
+
+class UniversityAnalytics(BaseModel):
+    intake_year: Optional[int] = None
+    universities: List[UniversitySelectionStats]
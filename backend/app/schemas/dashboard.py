@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.onboarding import Onboarding
+from app.schemas.university import UserUniversity
+from app.schemas.user import User
+
+
+class Dashboard(BaseModel):
+    user: User
+    onboarding: Optional[Onboarding] = None
+    universities: List[UserUniversity] = []
@@ -35,6 +35,14 @@ class OnboardingUpdate(OnboardingBase):
 class Onboarding(OnboardingBase):
     id: int
     user_id: int
+    # Parsed from the free-text fields on save (read-only)
+    gpa_normalized: Optional[float] = None
+    english_exam: Optional[str] = None
+    english_score: Optional[float] = None
+    graduate_exam: Optional[str] = None
+    graduate_score: Optional[float] = None
+    budget_min_usd: Optional[int] = None
+    budget_max_usd: Optional[int] = None
 
     class Config:
         from_attributes = True
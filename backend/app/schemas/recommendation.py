@@ -0,0 +1,24 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.university import CatalogUniversity
+
+
+class Recommendation(BaseModel):
+    university: CatalogUniversity
+    category: str                  # dream / target / safe
+    score: float
+    # Profile strength minus university selectivity; negative is a reach
+    margin: float
+    within_budget: bool
+    preferred_country: bool
+
+
+class Recommendations(BaseModel):
+    # 0..1 academic strength derived from GPA and test scores
+    strength: float
+    dream: List[Recommendation] = []
+    target: List[Recommendation] = []
+    safe: List[Recommendation] = []
+    catalog_version: str
+    computed_at: Optional[datetime] = None
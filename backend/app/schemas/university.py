@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from app.models.university import UniversityStatus
 
 class UserUniversityBase(BaseModel):
@@ -12,9 +12,37 @@ class UserUniversityCreate(UserUniversityBase):
 class UserUniversityUpdate(UserUniversityBase):
     pass
 
+class UserUniversityBatch(BaseModel):
+    # Applied in one transaction: upserts first, then removals
+    selections: List[UserUniversityCreate] = Field(default_factory=list, max_length=200)
+    remove: List[str] = Field(default_factory=list, max_length=200)
+
+class UserUniversityBatchDelete(BaseModel):
+    university_ids: List[str] = Field(max_length=200)
+
 class UserUniversity(UserUniversityBase):
     id: int
     user_id: int
 
     class Config:
         orm_mode = True
+
+class CatalogUniversity(BaseModel):
+    id: str
+    name: str
+    country: str
+    city: str
+    fields: List[str]
+    fee_usd: int
+    acceptance: str
+    tags: List[str]
+    description: str
+
+class CatalogPage(BaseModel):
+    items: List[CatalogUniversity]
+    # Matches across all pages
+    total: int
+    # Pass as ?cursor= for the next page; null on the last page
+    next_cursor: Optional[str] = None
+    # Catalog content version (also the ETag)
+    version: str
@@ -0,0 +1,32 @@
+"""
+Fill user_onboarding's normalized columns (GPA, test scores, budget) and
+user_preferred_countries from the free-text answers. Run once after
+migration 9c4d2e7a1f53, which adds them empty; new writes fill them as they
+go. Safe to re-run, e.g. after a parser change in app/data/profile.py.
+
+    python backfill_onboarding_columns.py [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import time
+
+from app.core import response_cache
+from app.crud import crud_onboarding
+from app.db import base  # noqa: F401  (registers every model with the mapper)
+from app.db.session import AsyncSessionLocal, async_engine
+
+
+async def main(batch_size: int) -> None:
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        count = await crud_onboarding.backfill_normalized(db, batch_size=batch_size)
+    await response_cache.close()
+    await async_engine.dispose()
+    print(f"Backfilled normalized columns for {count} onboarding rows in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,109 @@
+"""
+In-process stand-ins for the LiveKit objects agent_standalone.entrypoint touches
+(JobContext, JobProcess, Room, participant, AgentSession and the realtime model),
+so agent benchmarks can run whole jobs without a LiveKit server or Gemini.
+
+install(agent_standalone, first_audio_seconds) swaps the session and model in;
+FakeSession then "speaks" first_audio_seconds after generate_reply, which is
+where the real model would start streaming the greeting.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+
+class FakeLocalParticipant:
+    def __init__(self, publish_seconds: float = 0.0):
+        self.publish_seconds = publish_seconds
+        self.published = 0
+
+    async def publish_data(self, payload, topic=None, **kwargs):
+        if self.publish_seconds:
+            await asyncio.sleep(self.publish_seconds)
+        self.published += 1
+
+
+class FakeRoom:
+    def __init__(self, name: str, publish_seconds: float = 0.0):
+        self.name = name
+        self.local_participant = FakeLocalParticipant(publish_seconds)
+        self.handlers = {}
+
+    def on(self, event, callback=None):
+        self.handlers.setdefault(event, []).append(callback)
+        return callback
+
+
+class FakeProcess:
+    def __init__(self):
+        self.userdata = {}
+
+
+class FakeJobContext:
+    """A job whose participant joins join_seconds after connect."""
+
+    def __init__(self, user_id: int, proc: FakeProcess, join_seconds: float = 0.0, publish_seconds: float = 0.0):
+        self.room = FakeRoom(f"counsellor-{user_id}-bench", publish_seconds)
+        self.proc = proc
+        self.participant = SimpleNamespace(identity=str(user_id))
+        self.join_seconds = join_seconds
+        self.shutdown_callbacks = []
+
+    def add_shutdown_callback(self, callback):
+        self.shutdown_callbacks.append(callback)
+
+    async def shutdown(self):
+        for callback in self.shutdown_callbacks:
+            await callback()
+
+    async def connect(self, auto_subscribe=None):
+        await asyncio.sleep(0)
+
+    async def wait_for_participant(self):
+        if self.join_seconds:
+            await asyncio.sleep(self.join_seconds)
+        return self.participant
+
+
+class FakeSession:
+    """AgentSession stand-in: records handlers and emits agent state changes."""
+
+    first_audio_seconds = 0.0
+    instances = []
+
+    def __init__(self, llm=None, vad=None, userdata=None, **kwargs):
+        self.llm = llm
+        self.vad = vad
+        self.userdata = userdata
+        self.handlers = {}
+        self.agent = None
+        self.tasks = []
+        FakeSession.instances.append(self)
+
+    def on(self, event, callback=None):
+        self.handlers.setdefault(event, []).append(callback)
+        return callback
+
+    def emit(self, event, payload):
+        for callback in self.handlers.get(event, []):
+            callback(payload)
+
+    async def start(self, agent, room=None, room_options=None):
+        self.agent = agent
+        room.agent_session = self
+        self.started_at = time.perf_counter()
+
+    def generate_reply(self, instructions=None, allow_interruptions=True):
+        async def speak():
+            await asyncio.sleep(self.first_audio_seconds)
+            self.emit("agent_state_changed", SimpleNamespace(old_state="thinking", new_state="speaking"))
+
+        self.tasks.append(asyncio.ensure_future(speak()))
+
+
+def install(agent_module, first_audio_seconds: float = 0.0) -> None:
+    FakeSession.first_audio_seconds = first_audio_seconds
+    agent_module.AgentSession = FakeSession
+    agent_module.google = SimpleNamespace(
+        realtime=SimpleNamespace(RealtimeModel=lambda **kwargs: SimpleNamespace(**kwargs))
+    )
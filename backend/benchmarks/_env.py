@@ -0,0 +1,49 @@
+"""
+Shared setup for the benchmark scripts. Call configure() before importing app:
+it puts backend/ on sys.path, stubs the LiveKit/Google settings and points
+DATABASE_URL at BENCH_DATABASE_URL (a throwaway SQLite file by default), so a
+benchmark never touches the database configured in .env.
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+STUB_SETTINGS = {
+    "PROJECT_NAME": "Globalgrad",
+    "API_V1_STR": "/api/v1",
+    "SECRET_KEY": "bench-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "BACKEND_CORS_ORIGINS": "http://localhost",
+    "GOOGLE_CLIENT_ID": "stub",
+    "GOOGLE_CLIENT_SECRET": "stub",
+    "LIVEKIT_URL": "ws://localhost",
+    "LIVEKIT_API_KEY": "stub",
+    "LIVEKIT_API_SECRET": "stub-livekit-secret-for-benchmarks",
+    "GEMINI_API_KEY": "stub",
+    "GOOGLE_API_KEY": "stub",
+}
+
+
+def configure(db_name: str = "bench.db") -> str:
+    """Prepare the environment and return the database URL in use."""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    os.environ["DATABASE_URL"] = os.environ.get(
+        "BENCH_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), db_name)}"
+    )
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    for key, value in STUB_SETTINGS.items():
+        os.environ.setdefault(key, value)
+    return os.environ["DATABASE_URL"]
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of samples (seconds), in milliseconds."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 2)
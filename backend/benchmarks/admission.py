@@ -0,0 +1,146 @@
+"""
+Admission control under a login flood: tail latency of a cheap read
+(GET /universities/) while N login loops (bcrypt) and W selection writers
+hammer the app, with the per-class limits lifted and then as configured.
+
+Each login holds a pooled DB connection while its password is verified, so
+without limits a burst drains the pool and reads wait behind it. Runs the app
+in-process against a throwaway SQLite database and prints JSON: read p50/p99,
+status counts per class and the deepest queue seen. Exits non-zero if the
+admitted read p99 exceeds --read-p99-budget-ms, or a shed request lacked
+Retry-After.
+
+    python benchmarks/admission.py --logins 64 --writers 8 --duration 5
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import _env
+
+_env.configure("admission.db")
+
+import httpx  # noqa: E402
+from app.core import admission  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "bench-password"
+BASE_URL = "http://bench/api/v1"
+
+
+def new_client(**kwargs):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=BASE_URL, timeout=60, **kwargs)
+
+
+class Phase:
+    def __init__(self, duration):
+        self.until = time.perf_counter() + duration
+        self.read_samples = []
+        self.statuses = {"read": {}, "login": {}, "write": {}}
+        self.missing_retry_after = 0
+        self.max_queue = {name: 0 for name in admission.limiters}
+
+    def running(self):
+        return time.perf_counter() < self.until
+
+    def record(self, kind, response):
+        counts = self.statuses[kind]
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+        if response.status_code == 503 and "retry-after" not in response.headers:
+            self.missing_retry_after += 1
+
+
+async def read_loop(client, phase):
+    while phase.running():
+        start = time.perf_counter()
+        r = await client.get("/universities/")
+        phase.read_samples.append(time.perf_counter() - start)
+        phase.record("read", r)
+        await asyncio.sleep(0.01)
+
+
+async def login_loop(phase):
+    async with new_client() as client:
+        while phase.running():
+            r = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            phase.record("login", r)
+            if r.status_code == 503:
+                await asyncio.sleep(float(r.headers.get("retry-after", 1)))
+
+
+async def write_loop(cookies, phase, n):
+    async with new_client(cookies=cookies) as client:
+        while phase.running():
+            r = await client.post("/universities/", json={"university_id": f"usa-{n % 5 + 1}", "status": "shortlisted"})
+            phase.record("write", r)
+
+
+async def sample_queues(phase):
+    while phase.running():
+        for name, limiter in admission.limiters.items():
+            phase.max_queue[name] = max(phase.max_queue[name], limiter.waiting())
+        await asyncio.sleep(0.005)
+
+
+async def run_phase(client, args, logins, writers):
+    phase = Phase(args.duration)
+    await asyncio.gather(
+        sample_queues(phase),
+        *(read_loop(client, phase) for _ in range(args.readers)),
+        *(login_loop(phase) for _ in range(logins)),
+        *(write_loop(client.cookies, phase, n) for n in range(writers)),
+    )
+    return {
+        "logins": logins,
+        "writers": writers,
+        "read_requests": len(phase.read_samples),
+        "read_p50_ms": _env.percentile(phase.read_samples, 50),
+        "read_p99_ms": _env.percentile(phase.read_samples, 99),
+        "status_counts": phase.statuses,
+        "max_queue_depth": phase.max_queue,
+        "shed_without_retry_after": phase.missing_retry_after,
+    }
+
+
+# Limits from settings, restored after the unlimited phase
+CONFIGURED = [(limiter.concurrency, limiter.queue_size) for limiter in admission.limiters.values()]
+
+
+def set_unlimited(unlimited):
+    for limiter, (concurrency, queue_size) in zip(admission.limiters.values(), CONFIGURED):
+        limiter.concurrency, limiter.queue_size = (10**6, 10**6) if unlimited else (concurrency, queue_size)
+
+
+async def main(args):
+    Base.metadata.create_all(bind=engine)
+    async with new_client() as client:
+        await client.post("/auth/signup", json={"email": EMAIL, "password": PASSWORD, "full_name": "Bench"})
+        (await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})).raise_for_status()
+        results = {"idle": await run_phase(client, args, 0, 0)}
+        set_unlimited(True)
+        results["flood_unlimited"] = await run_phase(client, args, args.logins, args.writers)
+        set_unlimited(False)
+        results["flood_admission"] = await run_phase(client, args, args.logins, args.writers)
+
+    admitted = results["flood_admission"]
+    results["checks"] = checks = {
+        "read_p99_within_budget": admitted["read_p99_ms"] <= args.read_p99_budget_ms,
+        "shed_requests_have_retry_after": all(r["shed_without_retry_after"] == 0 for r in results.values()),
+    }
+    print(json.dumps(results, indent=2))
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64, help="concurrent login loops")
+    parser.add_argument("--writers", type=int, default=8, help="concurrent selection write loops")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent GET /universities/ loops")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per phase")
+    parser.add_argument("--read-p99-budget-ms", type=float, default=250.0)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,85 @@
+"""
+Show that the voice agent's event loop keeps servicing audio frames while a
+slow database call from a function tool is in flight.
+
+A 10 ms "audio frame" ticker runs alongside N concurrent slow DB calls, first
+through agent_standalone.run_db (executor) and then inline on the loop the way
+the tools used to call SQLAlchemy. Prints the worst frame gap for each mode as
+JSON and exits non-zero if run_db lets a gap exceed --max-gap-ms.
+
+    python benchmarks/agent_event_loop.py --query-seconds 0.5 --calls 4
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import _env
+
+_env.configure("agent.db")
+
+from sqlalchemy import text  # noqa: E402
+import agent_standalone  # noqa: E402
+
+FRAME_SECONDS = 0.01
+
+
+def slow_query(db, seconds):
+    """Stand-in for a slow Postgres round trip: blocks the calling thread."""
+    db.execute(text("SELECT 1")).scalar()
+    time.sleep(seconds)
+    return True
+
+
+async def audio_frames(stop, gaps):
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(FRAME_SECONDS)
+        now = time.perf_counter()
+        gaps.append(now - last - FRAME_SECONDS)
+        last = now
+
+
+async def measure(mode, calls, seconds):
+    stop, gaps = asyncio.Event(), []
+    ticker = asyncio.create_task(audio_frames(stop, gaps))
+    await asyncio.sleep(FRAME_SECONDS * 5)
+    start = time.perf_counter()
+    if mode == "run_db":
+        await asyncio.gather(*(agent_standalone.run_db(slow_query, seconds) for _ in range(calls)))
+    else:
+        for _ in range(calls):
+            db = agent_standalone.SessionLocal()
+            try:
+                slow_query(db, seconds)
+            finally:
+                db.close()
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return {
+        "tool_calls": calls,
+        "wall_seconds": round(elapsed, 3),
+        "frames": len(gaps),
+        "max_frame_gap_ms": round(max(gaps) * 1000, 2),
+        "p99_frame_gap_ms": _env.percentile(gaps, 99),
+    }
+
+
+async def main(args):
+    results = {
+        "run_db": await measure("run_db", args.calls, args.query_seconds),
+        "inline_blocking": await measure("inline", args.calls, args.query_seconds),
+    }
+    print(json.dumps(results, indent=2))
+    return 0 if results["run_db"]["max_frame_gap_ms"] <= args.max_gap_ms else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--query-seconds", type=float, default=0.3)
+    parser.add_argument("--calls", type=int, default=4, help="concurrent slow tool calls")
+    parser.add_argument("--max-gap-ms", type=float, default=50.0)
+    sys.exit(asyncio.run(main(parser.parse_args())))
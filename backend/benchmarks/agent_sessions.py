@@ -0,0 +1,182 @@
+"""
+How many concurrent counselling sessions one agent worker holds before tool
+latency degrades.
+
+Runs N simulated sessions through agent_standalone.entrypoint on one event
+loop against fake LiveKit objects and a stubbed realtime model (see
+_agent_fakes.py), using a seeded local database. After its greeting, each
+session plays a scripted conversation. Each user turn ends speech, the model
+"thinks", and the agent calls a function tool. Assistant's real tools run, so
+their SQL goes through run_db and the worker's connection pool.
+
+Tool latency percentiles (wall, DB and publish_data time) and session error
+counts come from the agent's own worker metrics. While the sessions run, a
+sampler records DB pool saturation (connections checked out, run_db calls
+queued for a thread) and event-loop lag.
+
+    python benchmarks/agent_sessions.py --sessions 300 --ramp-seconds 5
+    python benchmarks/agent_sessions.py --sessions 300 --query-delay-ms 5   # emulate a remote Postgres
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+import _env
+
+_env.configure("agent_sessions.db")
+
+from sqlalchemy import event  # noqa: E402
+import _agent_fakes  # noqa: E402
+import agent_standalone  # noqa: E402
+
+SAMPLE_SECONDS = 0.01
+
+# (tool, kwargs) per user turn; university ids are filled in per session
+CONVERSATION = [
+    ("get_user_profile", {}),
+    ("recommend_universities", {}),
+    ("search_universities", {"country": "UK", "max_fee_usd": 40000}),
+    ("add_to_shortlist", {"university_id": None}),
+    ("get_my_list", {}),
+    ("search_universities", {"field": "Computer Science", "keywords": "research"}),
+    ("add_to_shortlist", {"university_id": None}),
+    ("lock_university", {"university_id": None}),
+    ("get_my_list", {}),
+]
+UNIVERSITY_IDS = [f"{country}-{n}" for country in ("usa", "uk", "can", "aus") for n in range(1, 6)]
+
+
+class Sampler:
+    """Event-loop lag and pool/executor occupancy, sampled every SAMPLE_SECONDS."""
+
+    def __init__(self):
+        self.loop_lag = []
+        self.checked_out = []
+        self.queued = []
+        self.stop = asyncio.Event()
+
+    async def run(self):
+        pool = agent_standalone.engine.pool
+        executor = agent_standalone._db_executor
+        last = time.perf_counter()
+        while not self.stop.is_set():
+            await asyncio.sleep(SAMPLE_SECONDS)
+            now = time.perf_counter()
+            self.loop_lag.append(now - last - SAMPLE_SECONDS)
+            last = now
+            self.checked_out.append(pool.checkedout())
+            self.queued.append(executor._work_queue.qsize())
+
+    def report(self):
+        samples = len(self.checked_out) or 1
+        return {
+            "event_loop_lag": {
+                "p50_ms": _env.percentile(self.loop_lag, 50),
+                "p99_ms": _env.percentile(self.loop_lag, 99),
+                "max_ms": _env.percentile(self.loop_lag, 100),
+            },
+            "db_pool": {
+                "size": agent_standalone.DB_POOL_SIZE,
+                "max_checked_out": max(self.checked_out, default=0),
+                "saturated_fraction": round(
+                    sum(1 for n in self.checked_out if n >= agent_standalone.DB_POOL_SIZE) / samples, 3
+                ),
+                "max_queued_calls": max(self.queued, default=0),
+                "mean_queued_calls": round(sum(self.queued) / samples, 2),
+            },
+        }
+
+
+async def run_session(index, proc, args, rng):
+    user_id = index % args.users + 1
+    await asyncio.sleep(rng.uniform(0, args.ramp_seconds))
+    ctx = _agent_fakes.FakeJobContext(user_id, proc, join_seconds=rng.uniform(0, args.join_ms / 1000))
+    await agent_standalone.entrypoint(ctx)
+    session = ctx.room.agent_session
+    await asyncio.gather(*session.tasks)
+
+    tools = {tool.info.name: tool for tool in session.agent.tools}
+    run_context = SimpleNamespace(userdata=session.userdata, session=session)
+    picks = iter(rng.sample(UNIVERSITY_IDS, 3))
+    for name, kwargs in CONVERSATION[: args.turns]:
+        # User speaks, stops; the model takes a moment before calling the tool and answering
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * args.think_ms / 1000)
+        session.emit("user_state_changed", SimpleNamespace(old_state="listening", new_state="speaking"))
+        session.emit("user_state_changed", SimpleNamespace(old_state="speaking", new_state="listening"))
+        if "university_id" in kwargs:
+            kwargs = {**kwargs, "university_id": next(picks, "usa-1")}
+        await tools[name](run_context, **kwargs)
+        await asyncio.sleep(session.first_audio_seconds)
+        session.emit("agent_state_changed", SimpleNamespace(old_state="thinking", new_state="speaking"))
+        session.emit("agent_state_changed", SimpleNamespace(old_state="speaking", new_state="listening"))
+    await ctx.shutdown()
+
+
+def add_query_delay(engine, seconds):
+    """Sleep before every statement, like a network round trip to Postgres."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def delay(conn, cursor, statement, parameters, context, executemany):
+        time.sleep(seconds)
+
+
+async def main(args):
+    from app.db.session import engine
+    from seed import seed
+
+    seed(engine, args.users)
+    logging.getLogger("voice-agent").setLevel(logging.WARNING)
+    _agent_fakes.install(agent_standalone, first_audio_seconds=args.first_audio_ms / 1000)
+    if args.query_delay_ms:
+        add_query_delay(agent_standalone.engine, args.query_delay_ms / 1000)
+
+    proc = _agent_fakes.FakeProcess()
+    agent_standalone.prewarm(proc)
+    rng = random.Random(args.seed)
+    sampler = Sampler()
+    sampling = asyncio.create_task(sampler.run())
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(run_session(i, proc, args, random.Random(rng.random())) for i in range(args.sessions)),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+    sampler.stop.set()
+    await sampling
+
+    failed = [repr(o) for o in outcomes if isinstance(o, BaseException)]
+    worker = agent_standalone.worker_metrics.summary()
+    result = {
+        "sessions": args.sessions,
+        "failed_sessions": len(failed),
+        "failures": failed[:5],
+        "wall_seconds": round(elapsed, 2),
+        "db_pool_size": agent_standalone.DB_POOL_SIZE,
+        "query_delay_ms": args.query_delay_ms,
+        "first_audio": worker["first_audio"],
+        "response_gap": worker["response_gap"],
+        "tools": worker["tools"],
+        "errors": worker["errors"],
+        **sampler.report(),
+    }
+    print(json.dumps(result, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200, help="concurrent simulated sessions")
+    parser.add_argument("--users", type=int, default=1000, help="students to seed")
+    parser.add_argument("--turns", type=int, default=len(CONVERSATION), help="tool-calling turns per session")
+    parser.add_argument("--ramp-seconds", type=float, default=2.0, help="spread session starts over this long")
+    parser.add_argument("--think-ms", type=float, default=200.0, help="mean pause before each tool call")
+    parser.add_argument("--first-audio-ms", type=float, default=300.0, help="simulated model time to audio")
+    parser.add_argument("--join-ms", type=float, default=200.0, help="max simulated wait for the participant")
+    parser.add_argument("--query-delay-ms", type=float, default=0.0, help="added latency per SQL statement")
+    parser.add_argument("--seed", type=int, default=1)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,104 @@
+"""
+Job start -> first greeting latency of the voice agent, with and without the
+prewarm hook, checked against AGENT_STARTUP_TARGET_SECONDS.
+
+Runs agent_standalone.entrypoint in-process against fake LiveKit objects (see
+_agent_fakes.py) and a seeded bench database. The "cold" job runs on a process
+that never prewarmed, as the worker did before prewarm_fnc existed. The warm
+jobs run after prewarm(). Startup figures are read back from the
+agent_startup_seconds metric lines the agent logs. Exits non-zero if the warm
+p95 misses the target.
+
+    python benchmarks/agent_startup.py --jobs 20 --first-audio-ms 300
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+
+import _env
+
+_env.configure("agent_startup.db")
+
+import _agent_fakes  # noqa: E402
+import agent_standalone  # noqa: E402
+
+
+class MetricCapture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.startups = []
+        self.prewarms = []
+
+    def emit(self, record):
+        try:
+            data = json.loads(record.getMessage())
+        except ValueError:
+            return
+        if data.get("metric") == "agent_startup_seconds":
+            self.startups.append(data)
+        elif data.get("metric") == "agent_prewarm_seconds":
+            self.prewarms.append(data)
+
+
+async def run_job(proc, user_id, args):
+    ctx = _agent_fakes.FakeJobContext(user_id, proc, join_seconds=args.join_ms / 1000)
+    await agent_standalone.entrypoint(ctx)
+    session = _agent_fakes.FakeSession.instances[-1]
+    await asyncio.gather(*session.tasks)
+
+
+async def main(args):
+    from app.db.session import engine
+    from seed import seed
+
+    seed(engine, args.users)
+    capture = MetricCapture()
+    logging.getLogger("voice-agent").addHandler(capture)
+    logging.getLogger("voice-agent").setLevel(logging.INFO)
+    _agent_fakes.install(agent_standalone, first_audio_seconds=args.first_audio_ms / 1000)
+
+    # Cold: nothing loaded, no pooled connections
+    await run_job(_agent_fakes.FakeProcess(), 1, args)
+    cold = capture.startups[-1]
+
+    proc = _agent_fakes.FakeProcess()
+    start = time.perf_counter()
+    agent_standalone.prewarm(proc)
+    prewarm_seconds = time.perf_counter() - start
+
+    for i in range(args.jobs):
+        await run_job(proc, (i % args.users) + 1, args)
+    warm = [report["value"] for report in capture.startups[1:]]
+
+    p95 = _env.percentile(warm, 95)
+    target_ms = agent_standalone.STARTUP_TARGET_SECONDS * 1000
+    result = {
+        "target_ms": target_ms,
+        "simulated_first_audio_ms": args.first_audio_ms,
+        "simulated_join_ms": args.join_ms,
+        "prewarm_ms": round(prewarm_seconds * 1000, 2),
+        "prewarm": capture.prewarms[-1] if capture.prewarms else None,
+        "cold_job": {"startup_ms": round(cold["value"] * 1000, 2), "phases": cold["phases"]},
+        "warm_jobs": {
+            "jobs": len(warm),
+            "p50_ms": _env.percentile(warm, 50),
+            "p95_ms": p95,
+            "max_ms": _env.percentile(warm, 100),
+            "phases_last": capture.startups[-1]["phases"],
+        },
+        "within_target": p95 is not None and p95 <= target_ms,
+    }
+    print(json.dumps(result, indent=2))
+    return 0 if result["within_target"] else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20, help="warm jobs to run after prewarm")
+    parser.add_argument("--users", type=int, default=200, help="students to seed")
+    parser.add_argument("--first-audio-ms", type=float, default=300.0, help="simulated model time to first audio")
+    parser.add_argument("--join-ms", type=float, default=0.0, help="simulated wait for the participant")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,96 @@
+"""
+Selection analytics: the GROUP BY over user_universities that admins used to
+run, against reading the incrementally maintained rollup, plus a drift check.
+
+Seeds N students, times both queries, then runs --writes random selection
+writes through crud_university (shortlist, lock, remove, batch) and onboarding
+intake-year changes. Finally crud_analytics.rebuild reports how many rollup
+buckets were wrong. Exits non-zero if the incremental counts drifted.
+
+    python benchmarks/analytics.py --users 50000 --writes 2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import _env
+
+_env.configure("analytics.db")
+
+from app.crud import crud_analytics, crud_onboarding, crud_university  # noqa: E402
+from app.db.session import AsyncSessionLocal, engine  # noqa: E402
+from app.models.university import UniversityStatus  # noqa: E402
+from app.schemas.onboarding import OnboardingUpdate  # noqa: E402
+from seed import UNIVERSITY_IDS, seed  # noqa: E402
+
+
+async def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await fn(db)
+            samples.append(time.perf_counter() - start)
+    return {"p50_ms": _env.percentile(samples, 50), "max_ms": _env.percentile(samples, 100)}
+
+
+async def random_write(db, rng, users):
+    user_id = rng.randint(1, users)
+    kind = rng.random()
+    if kind < 0.4:
+        await crud_university.update_university_status(
+            db, user_id=user_id, university_id=rng.choice(UNIVERSITY_IDS), status=rng.choice(list(UniversityStatus))
+        )
+    elif kind < 0.6:
+        await crud_university.remove_university(db, user_id=user_id, university_id=rng.choice(UNIVERSITY_IDS))
+    elif kind < 0.9:
+        picks = rng.sample(UNIVERSITY_IDS, 6)
+        await crud_university.apply_batch(
+            db,
+            user_id=user_id,
+            selections={uid: rng.choice(list(UniversityStatus)) for uid in picks[:3]},
+            remove=picks[3:],
+        )
+    else:
+        await crud_onboarding.upsert(
+            db, user_id=user_id, obj_in=OnboardingUpdate(target_intake_year=rng.choice([None, 2026, 2027, 2028]))
+        )
+
+
+async def main(args):
+    seed(engine, args.users)
+    rng = random.Random(args.seed)
+
+    async def group_by(db):
+        return (await db.execute(crud_analytics.source_counts_query())).all()
+
+    async def rollup(db):
+        return await crud_analytics.get_counts(db)
+
+    result = {
+        "users": args.users,
+        "group_by_scan": await timed(group_by, args.repeat),
+        "rollup_read": await timed(rollup, args.repeat),
+    }
+    start = time.perf_counter()
+    for _ in range(args.writes):
+        async with AsyncSessionLocal() as db:
+            await random_write(db, rng, args.users)
+    result["writes"] = args.writes
+    result["write_seconds"] = round(time.perf_counter() - start, 2)
+    async with AsyncSessionLocal() as db:
+        result["drifted_buckets"] = await crud_analytics.rebuild(db)
+    print(json.dumps(result, indent=2))
+    return 0 if result["drifted_buckets"] == 0 else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--writes", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,82 @@
+"""
+Measure /auth/me tail latency while a bcrypt-heavy login burst is running.
+
+Runs the app in-process against a throwaway SQLite database and prints JSON:
+the /auth/me p50/p99 with no load and with N concurrent login loops.
+
+    python benchmarks/bcrypt_me_latency.py --logins 32 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import _env
+
+_env.configure("bcrypt.db")
+
+import httpx  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "bench-password"
+
+
+async def me_loop(client, until, samples):
+    while time.perf_counter() < until:
+        start = time.perf_counter()
+        r = await client.get("/api/v1/auth/me")
+        r.raise_for_status()
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+
+
+async def login_loop(base_url, until, counts):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url) as client:
+        while time.perf_counter() < until:
+            r = await client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            counts[r.status_code] = counts.get(r.status_code, 0) + 1
+
+
+async def phase(client, base_url, logins, duration):
+    samples, counts = [], {}
+    until = time.perf_counter() + duration
+    await asyncio.gather(
+        me_loop(client, until, samples),
+        *(login_loop(base_url, until, counts) for _ in range(logins)),
+    )
+    return {
+        "login_workers": logins,
+        "me_requests": len(samples),
+        "me_p50_ms": _env.percentile(samples, 50),
+        "me_p99_ms": _env.percentile(samples, 99),
+        "login_status_counts": counts,
+    }
+
+
+async def main(args):
+    Base.metadata.create_all(bind=engine)
+    base_url = "http://bench"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url) as client:
+        await client.post(
+            "/api/v1/auth/signup",
+            json={"email": EMAIL, "password": PASSWORD, "full_name": "Bench"},
+        )
+        r = await client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        r.raise_for_status()
+        results = {
+            "idle": await phase(client, base_url, 0, args.duration),
+            "bcrypt_load": await phase(client, base_url, args.logins, args.duration),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=16, help="concurrent login loops")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per phase")
+    asyncio.run(main(parser.parse_args()))
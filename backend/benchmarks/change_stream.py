@@ -0,0 +1,94 @@
+"""
+Commit -> stream delivery latency of selection change events.
+
+Opens --streams subscriptions on the change bus (several per user, like open
+tabs) and makes --writes selection changes through crud_university. For each
+change it measures how long after the write call returned (i.e. after commit)
+every stream of that user received it. The in-process bus hands events over
+during commit, so its deliveries show as 0 ms. Uses the in-process bus on SQLite. With BENCH_DATABASE_URL pointing at
+Postgres, events take the real NOTIFY/LISTEN round trip.
+
+    python benchmarks/change_stream.py --users 200 --streams 600 --writes 500
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import _env
+
+_env.configure("change_stream.db")
+
+from app.core import changes  # noqa: E402
+from app.crud import crud_university  # noqa: E402
+from app.db.session import AsyncSessionLocal, engine  # noqa: E402
+from app.models.university import UniversityStatus  # noqa: E402
+from seed import seed  # noqa: E402
+
+UNIVERSITY_IDS = [f"{country}-{n}" for country in ("usa", "uk", "can", "aus") for n in range(1, 6)]
+
+
+async def consume(queue, received):
+    while True:
+        change = await queue.get()
+        if change["type"] == "selection":
+            received.append((change["user_id"], change["version"], time.perf_counter()))
+
+
+async def main(args):
+    seed(engine, args.users)
+    rng = random.Random(args.seed)
+    committed, received, writes = {}, [], []
+    queues = [(user_id, await changes.bus.subscribe(user_id))
+              for user_id in (i % args.users + 1 for i in range(args.streams))]
+    consumers = [asyncio.create_task(consume(q, received)) for _, q in queues]
+    # Let a Postgres LISTEN connection come up before writing
+    await asyncio.sleep(0.5)
+
+    start = time.perf_counter()
+    for _ in range(args.writes):
+        user_id = rng.randint(1, min(args.users, args.streams))
+        async with AsyncSessionLocal() as db:
+            write_start = time.perf_counter()
+            await crud_university.update_university_status(
+                db, user_id=user_id, university_id=rng.choice(UNIVERSITY_IDS),
+                status=rng.choice(list(UniversityStatus)),
+            )
+            returned = time.perf_counter()
+            writes.append(returned - write_start)
+            version = await crud_university.get_version(db, user_id)
+        committed[(user_id, version)] = returned
+    await asyncio.sleep(0.5)
+    elapsed = time.perf_counter() - start
+    latencies = [max(0.0, at - committed[(user_id, version)]) for user_id, version, at in received]
+
+    for task in consumers:
+        task.cancel()
+    expected_deliveries = sum(
+        sum(1 for uid, _ in queues if uid == user_id) for user_id, _ in committed
+    )
+    print(json.dumps({
+        "bus": type(changes.bus).__name__,
+        "streams": args.streams,
+        "writes": args.writes,
+        "deliveries": len(latencies),
+        "expected_deliveries": expected_deliveries,
+        "wall_seconds": round(elapsed, 2),
+        "write_p50_ms": _env.percentile(writes, 50),
+        "delivery_p50_ms": _env.percentile(latencies, 50),
+        "delivery_p99_ms": _env.percentile(latencies, 99),
+        "delivery_max_ms": _env.percentile(latencies, 100),
+    }, indent=2))
+    await changes.bus.stop()
+    return 0 if len(latencies) == expected_deliveries else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--streams", type=int, default=600, help="open streams, spread over the users")
+    parser.add_argument("--writes", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,36 @@
+"""
+Compare two load.py JSON reports endpoint by endpoint.
+
+    python benchmarks/compare.py before.json after.json
+"""
+import argparse
+import json
+
+
+def delta(before, after):
+    if before in (None, 0) or after is None:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main(args):
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    rows = sorted(set(before["endpoints"]) | set(after["endpoints"])) + ["total"]
+    print(f"{'endpoint':<20}{'rps':>30}{'p50 ms':>30}{'p99 ms':>30}")
+    for name in rows:
+        b = before["total"] if name == "total" else before["endpoints"].get(name, {})
+        a = after["total"] if name == "total" else after["endpoints"].get(name, {})
+        cells = []
+        for key in ("throughput_rps", "p50_ms", "p99_ms"):
+            cells.append(f"{b.get(key)} -> {a.get(key)} ({delta(b.get(key), a.get(key))})")
+        print(f"{name:<20}" + "".join(f"{cell:>30}" for cell in cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    main(parser.parse_args())
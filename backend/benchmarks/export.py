@@ -0,0 +1,91 @@
+"""
+Throughput and peak memory of the streaming student export at several sizes.
+
+For each --users size, seeds that many students (with selections), runs
+crud_export.export_chunks into a byte counter, and records rows/s and the
+tracemalloc peak. With a server-side cursor the peak should be flat across
+sizes. The ORM-load baseline (all rows in one list, as before the export
+existed) shows what it replaces. Exits non-zero if the streaming peak at the
+largest size exceeds --max-growth times the smallest.
+
+    python benchmarks/export.py --users 10000,100000
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+import _env
+
+_env.configure("export.db")
+
+from sqlalchemy import func  # noqa: E402
+from app.crud import crud_export  # noqa: E402
+from app.db.session import AsyncSessionLocal, engine  # noqa: E402
+from seed import seed  # noqa: E402
+
+
+async def streamed(fmt, batch_size):
+    characters = 0
+    async with AsyncSessionLocal() as db:
+        async for chunk in crud_export.export_chunks(db, fmt, batch_size):
+            characters += len(chunk)
+    return characters
+
+
+async def loaded_at_once():
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(crud_export.export_query())).all()
+    return len(rows)
+
+
+async def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = await fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return value, elapsed, peak
+
+
+async def main(args):
+    results = []
+    for users in [int(n) for n in args.users.split(",")]:
+        seed(engine, users)
+        with engine.connect() as conn:
+            rows = conn.execute(crud_export.export_query().with_only_columns(func.count())).scalar()
+        characters, elapsed, peak = await measure(streamed, args.format, args.batch_size)
+        entry = {
+            "users": users,
+            "rows": rows,
+            "stream_seconds": round(elapsed, 2),
+            "stream_rows_per_second": round(rows / elapsed),
+            "stream_peak_mb": round(peak / 2**20, 2),
+            "output_mb": round(characters / 2**20, 1),
+        }
+        if not args.skip_baseline:
+            _, baseline_elapsed, baseline_peak = await measure(loaded_at_once)
+            entry["load_all_seconds"] = round(baseline_elapsed, 2)
+            entry["load_all_peak_mb"] = round(baseline_peak / 2**20, 2)
+        results.append(entry)
+    growth = results[-1]["stream_peak_mb"] / max(results[0]["stream_peak_mb"], 0.01)
+    print(json.dumps({
+        "format": args.format,
+        "batch_size": args.batch_size,
+        "sizes": results,
+        "stream_peak_growth": round(growth, 2),
+    }, indent=2))
+    return 0 if growth <= args.max_growth else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", default="5000,50000", help="comma-separated student counts")
+    parser.add_argument("--format", choices=sorted(crud_export.FORMATS), default="csv")
+    parser.add_argument("--batch-size", type=int, default=crud_export.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-growth", type=float, default=1.5)
+    parser.add_argument("--skip-baseline", action="store_true", help="don't run the load-everything comparison")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,244 @@
+"""
+Load test for the FastAPI backend.
+
+Boots app.main:app (uvicorn subprocess by default, or in-process with
+--in-process, or an already running server with --url), seeds N synthetic
+students, then has --concurrency virtual users log in and drive a weighted mix
+of signup/login/me/onboarding/universities/voice-token requests for
+--duration seconds. Prints per-endpoint throughput and p50/p95/p99 as JSON
+(also written to --output) so runs can be compared with compare.py.
+
+    python benchmarks/load.py --users 2000 --concurrency 50 --duration 30 --output run.json
+    BENCH_DATABASE_URL=postgresql://localhost/globalgrad_bench python benchmarks/load.py
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import _env
+
+DATABASE_URL = _env.configure("load.db")
+
+import httpx  # noqa: E402
+from seed import SEED_PASSWORD, UNIVERSITY_IDS, seed, seed_email  # noqa: E402
+
+API = "/api/v1"
+
+# name -> (weight, method, path)
+ENDPOINTS = {
+    "me": (30, "GET", f"{API}/auth/me"),
+    "onboarding_get": (20, "GET", f"{API}/onboarding"),
+    "universities_get": (20, "GET", f"{API}/universities/"),
+    "universities_post": (10, "POST", f"{API}/universities/"),
+    "onboarding_put": (5, "PUT", f"{API}/onboarding"),
+    "voice_token": (5, "GET", f"{API}/voice/token"),
+    "login": (5, "POST", f"{API}/auth/login"),
+    "signup": (1, "POST", f"{API}/auth/signup"),
+}
+
+
+def parse_mix(value):
+    """--mix me=50,login=10 overrides the default weights."""
+    weights = {name: spec[0] for name, spec in ENDPOINTS.items()}
+    if value:
+        for part in value.split(","):
+            name, _, weight = part.partition("=")
+            if name not in ENDPOINTS:
+                raise SystemExit(f"unknown endpoint {name!r}; choose from {', '.join(ENDPOINTS)}")
+            weights[name] = float(weight)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, name, elapsed, status):
+        self.samples[name].append(elapsed)
+        self.statuses[name][str(status)] += 1
+        if status >= 400:
+            self.errors[name] += 1
+
+    def report(self, duration):
+        endpoints = {}
+        for name in sorted(self.samples):
+            samples = self.samples[name]
+            endpoints[name] = {
+                "requests": len(samples),
+                "errors": self.errors[name],
+                "throughput_rps": round(len(samples) / duration, 2),
+                "p50_ms": _env.percentile(samples, 50),
+                "p95_ms": _env.percentile(samples, 95),
+                "p99_ms": _env.percentile(samples, 99),
+                "statuses": dict(self.statuses[name]),
+            }
+        everything = [s for samples in self.samples.values() for s in samples]
+        return {
+            "endpoints": endpoints,
+            "total": {
+                "requests": len(everything),
+                "errors": sum(self.errors.values()),
+                "throughput_rps": round(len(everything) / duration, 2),
+                "p50_ms": _env.percentile(everything, 50),
+                "p95_ms": _env.percentile(everything, 95),
+                "p99_ms": _env.percentile(everything, 99),
+            },
+        }
+
+
+def request_body(name, rng, worker_id, counter):
+    if name == "login":
+        return None  # filled in by the worker (needs its own credentials)
+    if name == "signup":
+        return {
+            "email": f"load-{os.getpid()}-{worker_id}-{counter}@example.com",
+            "password": SEED_PASSWORD,
+            "full_name": "Load Test",
+        }
+    if name == "universities_post":
+        return {"university_id": rng.choice(UNIVERSITY_IDS), "status": rng.choice(["shortlisted", "locked"])}
+    if name == "onboarding_put":
+        return {"gpa_or_percentage": f"{rng.uniform(6.0, 9.8):.1f}", "sop_status": rng.choice(["Draft", "Ready"])}
+    return None
+
+
+async def virtual_user(make_client, worker_id, users, weights, until, recorder, rng_seed):
+    rng = random.Random(rng_seed + worker_id)
+    names, cumulative = list(weights), list(weights.values())
+    email = seed_email(rng.randint(1, users))
+    async with make_client() as client:
+        r = await client.post(f"{API}/auth/login", json={"email": email, "password": SEED_PASSWORD})
+        r.raise_for_status()
+        counter = 0
+        while time.perf_counter() < until:
+            counter += 1
+            name = rng.choices(names, weights=cumulative)[0]
+            _, method, path = ENDPOINTS[name]
+            body = request_body(name, rng, worker_id, counter)
+            if name == "login":
+                body = {"email": email, "password": SEED_PASSWORD}
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 599
+            recorder.record(name, time.perf_counter() - start, status)
+            if name == "signup" and status < 400:
+                # signup switches the cookie to the new account; log back in
+                await client.post(f"{API}/auth/login", json={"email": email, "password": SEED_PASSWORD})
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(base_url, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not come up")
+
+
+async def run(args):
+    weights = parse_mix(args.mix)
+    server = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        from app.db.session import engine
+
+        seeded = seed(engine, args.users)
+        print(json.dumps({"seeded": seeded}), file=sys.stderr)
+
+    if args.url:
+        def make_client():
+            return httpx.AsyncClient(base_url=base_url, timeout=args.timeout)
+    elif args.in_process:
+        from app.main import app
+
+        base_url = "http://bench"
+
+        def make_client():
+            return httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url=base_url, timeout=args.timeout
+            )
+    else:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--port", str(port), "--workers", str(args.workers), "--log-level", "warning",
+            ],
+            cwd=_env.BACKEND_DIR,
+            env=os.environ.copy(),
+        )
+        await wait_until_up(base_url)
+
+        def make_client():
+            limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+            return httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits)
+
+    recorder = Recorder()
+    try:
+        start = time.perf_counter()
+        until = start + args.duration
+        await asyncio.gather(*(
+            virtual_user(make_client, i, args.users, weights, until, recorder, args.seed)
+            for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    result = {
+        "config": {
+            "target": args.url or ("in-process" if args.in_process else f"uvicorn x{args.workers}"),
+            "database": DATABASE_URL.split("://", 1)[0] if not args.url else "external",
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "duration_s": round(elapsed, 2),
+            "mix": weights,
+        },
+        **recorder.report(elapsed),
+    }
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000, help="synthetic students to seed")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds of traffic")
+    parser.add_argument("--mix", default="", help="endpoint weights, e.g. me=50,login=0")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--in-process", action="store_true", help="drive the ASGI app directly")
+    parser.add_argument("--url", help="benchmark an already running server (no seeding)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=7, help="RNG seed for the traffic mix")
+    parser.add_argument("--output", help="also write the JSON report here")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,132 @@
+"""
+Check that selection lookups on user_universities use the
+(user_id, university_id) index, and that eligibility / budget / country
+filters on the normalized onboarding columns use theirs, instead of a
+sequential scan.
+
+Seeds synthetic rows into BENCH_DATABASE_URL (a throwaway SQLite file by
+default), prints the plans as JSON and exits non-zero if any query falls back
+to a scan.
+
+    python benchmarks/query_plans.py --users 2000
+    BENCH_DATABASE_URL=postgresql://localhost/globalgrad_bench python benchmarks/query_plans.py
+"""
+import argparse
+import json
+import sys
+
+import _env
+
+# The check wipes and reseeds its tables, so it only ever runs on the bench DB
+_env.configure("plans.db")
+
+from sqlalchemy import text  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+
+QUERIES = {
+    "selection_lookup": (
+        "SELECT id, status FROM user_universities "
+        "WHERE user_id = :user_id AND university_id = :university_id",
+        {"user_id": 7, "university_id": "usa-3"},
+    ),
+    "user_selections": (
+        "SELECT university_id, status FROM user_universities WHERE user_id = :user_id",
+        {"user_id": 7},
+    ),
+    "gpa_eligibility": (
+        "SELECT user_id FROM user_onboarding WHERE gpa_normalized >= :gpa",
+        {"gpa": 3.95},
+    ),
+    "english_eligibility": (
+        "SELECT user_id FROM user_onboarding WHERE english_exam = :exam AND english_score >= :score",
+        {"exam": "ielts", "score": 8.5},
+    ),
+    "budget_filter": (
+        "SELECT user_id FROM user_onboarding WHERE budget_max_usd >= :fee",
+        {"fee": 95000},
+    ),
+    "country_filter": (
+        "SELECT user_id FROM user_preferred_countries WHERE country = :country",
+        {"country": "Australia"},
+    ),
+}
+
+UNIVERSITY_IDS = [f"{country}-{n}" for country in ("usa", "uk", "can", "aus") for n in range(1, 6)]
+
+
+def seed(conn, users):
+    for table in ("user_preferred_countries", "user_onboarding", "user_universities", "users"):
+        conn.execute(text(f"DELETE FROM {table}"))
+    conn.execute(
+        text("INSERT INTO users (id, email, hashed_password) VALUES (:id, :email, 'x')"),
+        [{"id": i, "email": f"plan{i}@example.com"} for i in range(1, users + 1)],
+    )
+    conn.execute(
+        text(
+            "INSERT INTO user_universities (user_id, university_id, status) "
+            "VALUES (:user_id, :university_id, 'shortlisted')"
+        ),
+        [
+            {"user_id": i, "university_id": uni}
+            for i in range(1, users + 1)
+            for uni in UNIVERSITY_IDS[i % 4::4]
+        ],
+    )
+    conn.execute(
+        text(
+            "INSERT INTO user_onboarding (user_id, version, gpa_normalized, english_exam, english_score, "
+            "budget_min_usd, budget_max_usd) VALUES (:user_id, 1, :gpa, :exam, :score, :low, :high)"
+        ),
+        [
+            {
+                "user_id": i,
+                "gpa": 2.0 + (i % 200) / 100,
+                "exam": ("ielts", "toefl")[i % 2],
+                "score": 5.0 + (i % 40) / 10 if i % 2 == 0 else 60 + i % 60,
+                "low": 10000 * (i % 10),
+                "high": 10000 * (i % 10 + 1),
+            }
+            for i in range(1, users + 1)
+        ],
+    )
+    conn.execute(
+        text("INSERT INTO user_preferred_countries (user_id, country) VALUES (:user_id, :country)"),
+        [
+            {"user_id": i, "country": country}
+            for i in range(1, users + 1)
+            for country in (["USA", "UK", "Canada"][i % 3:] if i % 20 else ["Australia"])
+        ],
+    )
+    conn.execute(text("ANALYZE"))
+
+
+def explain(conn, sql, params):
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params).all()
+        plan = [row[-1] for row in rows]
+        uses_index = all("USING" in line and "INDEX" in line for line in plan)
+    else:
+        rows = conn.execute(text(f"EXPLAIN {sql}"), params).all()
+        plan = [row[0] for row in rows]
+        uses_index = not any("Seq Scan" in line for line in plan)
+    return plan, uses_index
+
+
+def main(args):
+    Base.metadata.create_all(bind=engine)
+    results, ok = {}, True
+    with engine.begin() as conn:
+        seed(conn, args.users)
+        for name, (sql, params) in QUERIES.items():
+            plan, uses_index = explain(conn, sql, params)
+            results[name] = {"uses_index": uses_index, "plan": plan}
+            ok = ok and uses_index
+    print(json.dumps({"dialect": engine.dialect.name, "users": args.users, "queries": results}, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000, help="synthetic users to seed")
+    sys.exit(main(parser.parse_args()))
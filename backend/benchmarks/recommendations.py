@@ -0,0 +1,68 @@
+"""
+Time the recommendation batch recompute: seeds N students, then runs
+crud_recommendation.recompute_all (everyone, as after a catalog update) and a
+second --stale-only pass, and reports users/second plus the pure NumPy scoring
+time without the database.
+
+    python benchmarks/recommendations.py --users 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import _env
+
+
+async def run(users: int, batch_size: int) -> dict:
+    from app.crud import crud_recommendation
+    from app.data.profile import profile_from_onboarding
+    from app.data.recommend import engine as recommendation_engine
+    from app.db.session import AsyncSessionLocal, async_engine, engine
+    from seed import seed
+
+    seeded = seed(engine, users)
+
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        recomputed = await crud_recommendation.recompute_all(db, batch_size=batch_size)
+        full_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stale = await crud_recommendation.recompute_all(db, batch_size=batch_size, stale_only=True)
+        stale_seconds = time.perf_counter() - start
+
+    from sqlalchemy import select
+    from app.models.onboarding import UserOnboarding
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(select(UserOnboarding).limit(batch_size))).scalars().all()
+    profiles = [profile_from_onboarding(row) for row in rows]
+    start = time.perf_counter()
+    recommendation_engine.recommend_many(profiles)
+    scoring_seconds = time.perf_counter() - start
+    await async_engine.dispose()
+
+    return {
+        "seeded": seeded,
+        "catalog_size": len(recommendation_engine.ids),
+        "recompute_all": {
+            "users": recomputed,
+            "seconds": round(full_seconds, 3),
+            "users_per_second": round(recomputed / full_seconds) if full_seconds else None,
+        },
+        "recompute_stale_only": {"users": stale, "seconds": round(stale_seconds, 3)},
+        "scoring_only": {
+            "profiles": len(profiles),
+            "ms": round(scoring_seconds * 1000, 2),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    _env.configure("recommendations.db")
+    print(json.dumps(asyncio.run(run(args.users, args.batch_size)), indent=2))
@@ -0,0 +1,105 @@
+"""
+Check read-replica routing locally with two SQLite files.
+
+The replica is a snapshot of the primary that only changes when this script
+"replicates" it (SQLite backup API), so each read shows which database served
+it. The script runs the app in-process and checks:
+- a fresh signup is visible at once, because its write pins the client to
+  the primary
+- without the pin cookie, the same reads go to the (stale) replica
+- selection writes are always on the primary, and the writer reads them back
+- when the pin expires, reads return to the replica
+
+Prints the checks as JSON and exits non-zero if any fails. The stale-replica
+checks need a replica that only changes when told to, so this runs on SQLite
+files only; BENCH_REPLICA_URL picks the replica file.
+
+    python benchmarks/replica_routing.py
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import _env
+
+_env.configure("replica_primary.db")
+os.environ["DATABASE_REPLICA_URL"] = os.environ.get(
+    "BENCH_REPLICA_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'replica.db')}"
+)
+# Every read must reach a database for the routing to be observable
+os.environ["AUTH_CACHE_TTL_SECONDS"] = "0"
+os.environ["RESPONSE_CACHE"] = "none"
+os.environ["READ_YOUR_WRITES_SECONDS"] = "1"
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import PRIMARY_PIN_COOKIE, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+PRIMARY_PATH = make_url(settings.DATABASE_URL).database
+REPLICA_PATH = make_url(settings.DATABASE_REPLICA_URL).database
+
+
+def replicate():
+    source, target = sqlite3.connect(PRIMARY_PATH), sqlite3.connect(REPLICA_PATH)
+    with target:
+        source.backup(target)
+    source.close()
+    target.close()
+
+
+def drop_pin(client):
+    client.cookies.delete(PRIMARY_PIN_COOKIE)
+
+
+async def main():
+    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=create_engine(settings.DATABASE_REPLICA_URL))
+    replicate()
+    checks = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        r = await client.post("/auth/signup", json={"email": "replica@example.com", "password": "pw-123456"})
+        checks["signup_sets_pin"] = r.status_code == 200 and PRIMARY_PIN_COOKIE in r.cookies
+        checks["pinned_me_on_primary"] = (await client.get("/auth/me")).status_code == 200
+
+        drop_pin(client)
+        checks["unpinned_me_on_stale_replica"] = (await client.get("/auth/me")).status_code == 401
+        replicate()
+        checks["unpinned_me_after_replication"] = (await client.get("/auth/me")).status_code == 200
+
+        r = await client.post("/universities/", json={"university_id": "usa-1", "status": "shortlisted"})
+        checks["write_sets_pin"] = r.status_code == 200 and PRIMARY_PIN_COOKIE in r.cookies
+        listed = (await client.get("/universities/")).json()
+        checks["pinned_read_sees_own_write"] = [u["university_id"] for u in listed] == ["usa-1"]
+
+        drop_pin(client)
+        listed = (await client.get("/universities/")).json()
+        checks["unpinned_read_on_stale_replica"] = listed == []
+
+        await client.post("/universities/", json={"university_id": "uk-1", "status": "locked"})
+        time.sleep(settings.READ_YOUR_WRITES_SECONDS + 0.1)
+        listed = (await client.get("/universities/")).json()
+        checks["expired_pin_back_on_replica"] = listed == []
+        replicate()
+        listed = (await client.get("/universities/")).json()
+        checks["replica_after_replication"] = sorted(u["university_id"] for u in listed) == ["uk-1", "usa-1"]
+
+    print(json.dumps({
+        "primary": settings.DATABASE_URL,
+        "replica": settings.DATABASE_REPLICA_URL,
+        "read_your_writes_seconds": settings.READ_YOUR_WRITES_SECONDS,
+        "checks": checks,
+    }, indent=2))
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,233 @@
+"""
+Per-user response cache (app.core.response_cache) on GET /auth/me,
+/onboarding and /universities/: latency and SQL statements per request with
+the cache off, then with the chosen backend warm.
+
+--backend redis talks to BENCH_REDIS_URL, or to a minimal in-process stand-in
+for the Redis commands the cache uses (GET, SET PX, DEL, INFO) when unset.
+The run also checks that:
+- cached bodies are byte-identical to uncached ones
+- a hit runs no SQL
+- writes through the API (selections, onboarding) are visible on the next GET
+- with redis, a voice agent selection write is visible on the next GET
+Prints JSON and exits non-zero if a check fails.
+
+    python benchmarks/response_cache.py --users 500 --requests 2000
+    python benchmarks/response_cache.py --backend redis
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import _env
+
+_env.configure("response_cache.db")
+
+
+class RespStandIn:
+    """In-memory server for the few Redis commands the cache sends, on its own thread."""
+
+    def __init__(self):
+        # key -> (expires_at, value)
+        self.data = {}
+
+    def start(self) -> str:
+        started = threading.Event()
+        address = {}
+
+        async def serve():
+            server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+            address["port"] = server.sockets[0].getsockname()[1]
+            started.set()
+            await server.serve_forever()
+
+        threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+        started.wait()
+        return f"redis://127.0.0.1:{address['port']}/0"
+
+    async def handle(self, reader, writer):
+        # Protocol version negotiated by HELLO; only the null reply differs between them
+        connection = {"proto": 2}
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                args = []
+                for _ in range(int(header[1:])):
+                    size = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(size + 2))[:-2])
+                writer.write(self.execute(args, connection))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def execute(self, args, connection) -> bytes:
+        command = args[0].upper()
+        if command == b"GET":
+            item = self.data.get(args[1])
+            if item is None or item[0] <= time.monotonic():
+                return b"_\r\n" if connection["proto"] == 3 else b"$-1\r\n"
+            return _bulk(item[1])
+        if command == b"SET":
+            ttl = int(args[4]) / 1000 if len(args) >= 5 and args[3].upper() == b"PX" else float("inf")
+            self.data[args[1]] = (time.monotonic() + ttl, args[2])
+            return b"+OK\r\n"
+        if command == b"DEL":
+            return b":%d\r\n" % sum(self.data.pop(key, None) is not None for key in args[1:])
+        if command == b"INFO":
+            used = sum(len(key) + len(value) for key, (_, value) in self.data.items())
+            return _bulk(f"# Memory\r\nused_memory:{used}\r\n".encode())
+        if command == b"PING":
+            return b"+PONG\r\n"
+        if command == b"HELLO":
+            # Newer clients switch to RESP3 while connecting
+            proto = connection["proto"] = int(args[1]) if len(args) > 1 else connection["proto"]
+            fields = _bulk(b"server") + _bulk(b"redis") + _bulk(b"proto") + b":%d\r\n" % proto
+            return (b"%2\r\n" if proto == 3 else b"*4\r\n") + fields
+        # CLIENT SETINFO, SELECT, ... sent while connecting
+        return b"+OK\r\n"
+
+
+def _bulk(value: bytes) -> bytes:
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def configure_backend(backend: str) -> None:
+    if backend == "redis":
+        os.environ["RESPONSE_CACHE"] = os.environ.get("BENCH_REDIS_URL") or RespStandIn().start()
+    else:
+        os.environ["RESPONSE_CACHE"] = "memory"
+
+
+ENDPOINTS = ["/auth/me", "/onboarding", "/universities/"]
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def client_for(app, user_id):
+    import httpx
+    from app.core.config import settings
+    from app.core.security import create_access_token
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url=f"http://bench{settings.API_V1_STR}",
+        cookies={"access_token": f"Bearer {create_access_token(user_id)}"},
+    )
+
+
+async def measure(clients, path, requests, statements, rng):
+    samples, bodies = [], {}
+    before = statements.count
+    for _ in range(requests):
+        user_id = rng.choice(list(clients))
+        start = time.perf_counter()
+        response = await clients[user_id].get(path)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+        bodies[user_id] = response.content
+    return {
+        "p50_ms": _env.percentile(samples, 50),
+        "p95_ms": _env.percentile(samples, 95),
+        "statements_per_request": round((statements.count - before) / requests, 2),
+    }, bodies
+
+
+async def main(args):
+    from app.core import response_cache
+    from app.db.session import async_engine, engine
+    from app.main import app
+    from seed import UNIVERSITY_IDS, seed
+
+    seed(engine, args.users)
+    statements = StatementCounter(async_engine.sync_engine)
+    rng = random.Random(args.seed)
+    clients = {user_id: client_for(app, user_id) for user_id in range(1, args.users + 1)}
+    backend = response_cache.backend
+    result = {"backend": type(backend).__name__, "users": args.users, "requests": args.requests}
+    checks = {}
+
+    response_cache.backend = None
+    uncached = {}
+    for path in ENDPOINTS:
+        result.setdefault(path, {})["uncached"], uncached[path] = await measure(
+            clients, path, args.requests, statements, random.Random(args.seed)
+        )
+    response_cache.backend = backend
+    for path in ENDPOINTS:
+        # Same user sequence as the timed pass below, so that pass is all hits
+        await measure(clients, path, args.requests, statements, random.Random(args.seed))
+        result[path]["cached"], cached = await measure(
+            clients, path, args.requests, statements, random.Random(args.seed)
+        )
+        checks[f"{path} bodies identical"] = all(cached[u] == uncached[path][u] for u in cached)
+        checks[f"{path} hits run no SQL"] = result[path]["cached"]["statements_per_request"] == 0
+
+    user_id = rng.randint(1, args.users)
+    client = clients[user_id]
+    university_id = rng.choice(UNIVERSITY_IDS)
+    # Every write below has to invalidate an entry that is cached now
+    for path in ENDPOINTS:
+        await client.get(path)
+    await client.post("/universities/", json={"university_id": university_id, "status": "locked"})
+    selections = {s["university_id"]: s["status"] for s in (await client.get("/universities/")).json()}
+    checks["selection write visible"] = selections.get(university_id) == "locked"
+    await client.delete(f"/universities/{university_id}")
+    checks["selection removal visible"] = university_id not in {
+        s["university_id"] for s in (await client.get("/universities/")).json()
+    }
+    await client.put("/onboarding", json={"target_intake_year": 2031})
+    checks["onboarding write visible"] = (await client.get("/onboarding")).json()["target_intake_year"] == 2031
+    checks["is_onboarded visible"] = (await client.get("/auth/me")).json()["is_onboarded"] is True
+
+    if args.backend == "redis":
+        import agent_standalone
+
+        def agent_write():
+            db = agent_standalone.SessionLocal()
+            try:
+                return agent_standalone.update_university_status_in_db(db, user_id, university_id, "shortlisted")
+            finally:
+                db.close()
+
+        await client.get("/universities/")
+        await asyncio.to_thread(agent_write)
+        selections = {s["university_id"]: s["status"] for s in (await client.get("/universities/")).json()}
+        checks["agent write visible"] = selections.get(university_id) == "shortlisted"
+
+    result["hit_ratio"] = round(response_cache.HIT_RATIO.value(), 3)
+    result["bytes"] = response_cache.BYTES.value()
+    result["checks"] = checks
+    for c in clients.values():
+        await c.aclose()
+    await response_cache.close()
+    print(json.dumps(result, indent=2))
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=["memory", "redis"], default="memory")
+    parser.add_argument("--users", type=int, default=500, help="seeded students")
+    parser.add_argument("--requests", type=int, default=2000, help="GETs per endpoint and phase")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    configure_backend(args.backend)
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,127 @@
+"""
+Bulk-seed synthetic students for the benchmarks: users, onboarding profiles
+and university selections, inserted in batches with executemany.
+
+Every seeded user has the password SEED_PASSWORD and the email
+bench-user-<n>@example.com.
+
+    python benchmarks/seed.py --users 10000
+"""
+import argparse
+import json
+import random
+import time
+
+import _env
+
+SEED_PASSWORD = "bench-password"
+UNIVERSITY_IDS = [f"{country}-{n}" for country in ("usa", "uk", "can", "aus") for n in range(1, 6)]
+COUNTRIES = ["USA", "UK", "Canada", "Australia"]
+BUDGETS = ["10-20 Lakhs", "20-30 Lakhs", "30-50 Lakhs", "50+ Lakhs"]
+
+
+def seed_email(n: int) -> str:
+    return f"bench-user-{n}@example.com"
+
+
+def seed(engine, users: int, batch_size: int = 1000, rng_seed: int = 7) -> dict:
+    """Reset the tables and insert `users` students. Returns counts and timing."""
+    from sqlalchemy import delete, insert, text
+    from app.core.security import get_password_hash
+    from app.db.base import Base
+    from app.crud.crud_analytics import source_counts_query
+    from app.data.profile import normalized_columns
+    from app.models.analytics import UniversitySelectionCount
+    from app.models.onboarding import UserOnboarding, UserPreferredCountry
+    from app.models.recommendation import UserRecommendation
+    from app.models.university import UserUniversity
+    from app.models.user import User
+
+    rng = random.Random(rng_seed)
+    Base.metadata.create_all(bind=engine)
+    # One bcrypt hash shared by every seeded user keeps seeding fast
+    hashed_password = get_password_hash(SEED_PASSWORD)
+    start = time.perf_counter()
+    selections = 0
+    with engine.begin() as conn:
+        for table in (
+            UniversitySelectionCount, UserRecommendation, UserPreferredCountry, UserUniversity, UserOnboarding, User
+        ):
+            conn.execute(delete(table))
+        for offset in range(1, users + 1, batch_size):
+            ids = range(offset, min(offset + batch_size, users + 1))
+            conn.execute(insert(User), [
+                {
+                    "id": i,
+                    "email": seed_email(i),
+                    "full_name": f"Bench User {i}",
+                    "hashed_password": hashed_password,
+                    "is_active": True,
+                    "is_onboarded": True,
+                }
+                for i in ids
+            ])
+            onboardings = [
+                {
+                    "user_id": i,
+                    "current_education_level": "Bachelor's",
+                    "degree_major": "Computer Science",
+                    "graduation_year": rng.randint(2018, 2026),
+                    "gpa_or_percentage": f"{rng.uniform(6.0, 9.8):.1f}",
+                    "intended_degree": "Master's",
+                    "field_of_study": "Computer Science",
+                    "target_intake_year": rng.randint(2026, 2028),
+                    "preferred_countries": ", ".join(rng.sample(COUNTRIES, rng.randint(1, 3))),
+                    "budget_range_per_year": rng.choice(BUDGETS),
+                    "funding_plan": rng.choice(["Self-funded", "Scholarship-dependent", "Loan-dependent"]),
+                    "ielts_toefl_status": "taken",
+                    "ielts_toefl_score": f"{rng.choice([6.0, 6.5, 7.0, 7.5, 8.0])}",
+                    "gre_gmat_status": rng.choice(["taken", "not_taken", "scheduled"]),
+                    "gre_gmat_score": str(rng.randint(300, 335)),
+                    "sop_status": rng.choice(["Not started", "Draft", "Ready"]),
+                }
+                for i in ids
+            ]
+            countries = []
+            for row in onboardings:
+                # Same normalized columns crud_onboarding writes
+                normalized = normalized_columns(row)
+                countries.extend({"user_id": row["user_id"], "country": c} for c in normalized.pop("countries"))
+                row.update(normalized)
+            conn.execute(insert(UserOnboarding), onboardings)
+            conn.execute(insert(UserPreferredCountry), countries)
+            rows = [
+                {"user_id": i, "university_id": uni, "status": rng.choice(["shortlisted", "locked"])}
+                for i in ids
+                for uni in rng.sample(UNIVERSITY_IDS, rng.randint(0, 6))
+            ]
+            if rows:
+                conn.execute(insert(UserUniversity), rows)
+            selections += len(rows)
+        # Selections were inserted directly, so build their rollup the way the migration does
+        conn.execute(
+            insert(UniversitySelectionCount).from_select(
+                ["university_id", "status", "intake_year", "count"], source_counts_query()
+            )
+        )
+        if conn.dialect.name == "postgresql":
+            # Explicit ids leave the serial behind; signups would collide otherwise
+            conn.execute(text(
+                "SELECT setval(pg_get_serial_sequence('users', 'id'), (SELECT MAX(id) FROM users))"
+            ))
+    return {
+        "users": users,
+        "selections": selections,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    _env.configure("seed.db")
+    from app.db.session import engine
+
+    print(json.dumps({"database": engine.url.render_as_string(), **seed(engine, args.users, args.batch_size)}))
@@ -0,0 +1,44 @@
+"""
+Export every onboarding profile joined with its university selections as CSV
+or NDJSON (the nightly counselling export). Streams from a server-side cursor,
+so memory stays flat however many students there are. Reads from
+DATABASE_REPLICA_URL when set.
+
+    python export_students.py --format csv --output students.csv
+    python export_students.py --format ndjson | gzip > students.ndjson.gz
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from app.crud import crud_export
+from app.db import base  # noqa: F401  (registers every model with the mapper)
+from app.db.session import AsyncSessionLocal, ReplicaSessionLocal, async_engine, replica_async_engine
+
+
+async def main(fmt: str, output: str, batch_size: int) -> None:
+    start = time.perf_counter()
+    written = 0
+    out = open(output, "w", encoding="utf-8", newline="") if output != "-" else sys.stdout
+    try:
+        async with (ReplicaSessionLocal or AsyncSessionLocal)() as db:
+            async for chunk in crud_export.export_chunks(db, fmt, batch_size):
+                out.write(chunk)
+                written += len(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    await async_engine.dispose()
+    if replica_async_engine is not None:
+        await replica_async_engine.dispose()
+    print(f"Exported {written:,} characters of {fmt} in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--format", choices=sorted(crud_export.FORMATS), default="csv")
+    parser.add_argument("--output", default="-", help="file to write, - for stdout")
+    parser.add_argument("--batch-size", type=int, default=crud_export.DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.format, args.output, args.batch_size))
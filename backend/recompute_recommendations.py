@@ -0,0 +1,31 @@
+"""
+Recompute stored Dream/Target/Safe recommendations for every user, e.g. after
+app/data/universities.json changes. GET /recommendations also recomputes lazily
+per user, so running this is optional; it just avoids the first-request cost.
+
+    python recompute_recommendations.py [--batch-size 1000] [--stale-only]
+"""
+import argparse
+import asyncio
+import time
+
+from app.crud import crud_recommendation
+from app.db import base  # noqa: F401  (registers every model with the mapper)
+from app.data.recommend import engine
+from app.db.session import AsyncSessionLocal, async_engine
+
+
+async def main(batch_size: int, stale_only: bool) -> None:
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        count = await crud_recommendation.recompute_all(db, batch_size=batch_size, stale_only=stale_only)
+    await async_engine.dispose()
+    print(f"Recomputed {count} users against catalog {engine.version} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--stale-only", action="store_true", help="skip users whose stored result is current")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.stale_only))
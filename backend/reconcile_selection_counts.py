@@ -0,0 +1,28 @@
+"""
+Rebuild university_selection_counts from user_universities and report how
+many (university, status, intake year) buckets had drifted. Writes keep the
+rollup current incrementally; run this after manual data fixes or restores,
+or to verify the counts (0 buckets means they were right).
+
+    python reconcile_selection_counts.py
+"""
+import argparse
+import asyncio
+import time
+
+from app.crud import crud_analytics
+from app.db import base  # noqa: F401  (registers every model with the mapper)
+from app.db.session import AsyncSessionLocal, async_engine
+
+
+async def main() -> None:
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        fixed = await crud_analytics.rebuild(db)
+    await async_engine.dispose()
+    print(f"Reconciled selection counts in {time.perf_counter() - start:.2f}s; {fixed} buckets corrected")
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__.strip().splitlines()[0]).parse_args()
+    asyncio.run(main())
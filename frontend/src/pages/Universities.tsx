@@ -68,7 +68,24 @@ const Universities: React.FC = () => {
             fetchData();
         };
         window.addEventListener('university-update', handleUpdate);
-        return () => window.removeEventListener('university-update', handleUpdate);
+
+        // Live changes from other tabs, the API and the voice agent
+        const stream = new EventSource(`${API_URL}/universities/stream`, { withCredentials: true });
+        stream.addEventListener('selection', (event) => {
+            const { changes } = JSON.parse((event as MessageEvent).data) as {
+                changes: Record<string, 'shortlisted' | 'locked' | null>;
+            };
+            const ids = Object.keys(changes);
+            const withStatus = (status: string) => ids.filter(id => changes[id] === status);
+            setShortlistedIds(prev => [...prev.filter(id => !ids.includes(id)), ...withStatus('shortlisted')]);
+            setLockedIds(prev => [...prev.filter(id => !ids.includes(id)), ...withStatus('locked')]);
+        });
+        stream.addEventListener('resync', handleUpdate);
+
+        return () => {
+            window.removeEventListener('university-update', handleUpdate);
+            stream.close();
+        };
     }, [fetchData]);
 
     // Actions